@@ -2,25 +2,601 @@ import os
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, RedirectResponse, JSONResponse, StreamingResponse, PlainTextResponse
 from starlette.middleware.sessions import SessionMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.staticfiles import NotModifiedResponse
 from authlib.integrations.starlette_client import OAuth
 from pydantic import BaseModel
 from typing import List, Optional, Any
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 import pandas as pd
+import numpy as np
 import re
 import json
 import csv
 import io
+import gzip
+import heapq
+import asyncio
+import threading
+import time
+import uuid
+import random
+import pickle
+import sqlite3
+import grpc
+import importlib
+import sys
+import mimetypes
+import base64
+import gc
+import hmac
+import ctypes
+import tracemalloc
+import multiprocessing
+from bisect import bisect_left, insort
+from collections import OrderedDict, deque
+from functools import lru_cache
+from types import SimpleNamespace
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from urllib import request as urlrequest
 from urllib import parse as urlparse
 from urllib.error import HTTPError, URLError
 
+from charts import ChartColumns, Interner, cvr_by_day_from_arrays, pool_ready, stacked_100_from_arrays
+
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+try:
+    import redis
+except ImportError:  # only needed for CACHE_BACKEND=redis
+    redis = None
+
 load_dotenv()
 
-app = FastAPI(title="Google Ads YouTube Assets Report")
+
+# ==================== RESPONSE LAYER ====================
+
+def _json_default(obj):
+    """Serialize NumPy/pandas values that the JSON encoder does not handle natively"""
+    if hasattr(obj, "tolist"):  # ndarray, Series, NumPy scalars
+        return obj.tolist()
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (NumPy arrays and scalars are serialized natively)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def parse_accept_encoding(value: str) -> dict:
+    """Accept-Encoding as encoding -> q-value; a malformed q counts as 0"""
+    accepted = {}
+    for part in value.lower().split(","):
+        token, *params = (p.strip() for p in part.split(";"))
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available) -> Optional[str]:
+    """The acceptable encoding in available with the highest q (earlier wins ties); q=0 means not acceptable"""
+    accepted = parse_accept_encoding(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Compress single-body responses with brotli or gzip, depending on Accept-Encoding.
+
+    Streaming responses (more than one body message) are passed through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose_encoding(self, scope) -> Optional[str]:
+        available = ("br", "gzip") if brotli is not None else ("gzip",)
+        return choose_encoding(Headers(scope=scope).get("accept-encoding", ""), available)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        encoding = self._choose_encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start_message)
+            content_type = headers.get("content-type", "")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                await send(start_message)
+                start_message = None
+                await send(message)
+                return
+            compressed = self._compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            start_message = None
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# ==================== METRICS ====================
+# Minimal Prometheus text-format metrics, kept per worker process.
+
+METRICS = []
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape_label(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        METRICS.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    le = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{le} {bucket_count}")
+                le = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{le} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+HTTP_REQUEST_SECONDS = Histogram("ganalytics_http_request_duration_seconds", "Endpoint latency", ("method", "route", "status"))
+HTTP_IN_FLIGHT = Gauge("ganalytics_http_requests_in_flight", "Requests being served", ("method",))
+ADS_CALL_SECONDS = Histogram("ganalytics_ads_call_duration_seconds", "Google Ads call latency per attempt, reading rows included", ("customer_id", "method", "outcome"))
+ADS_ROWS = Counter("ganalytics_ads_rows_total", "Rows returned by GAQL searches", ("customer_id",))
+ADS_IN_FLIGHT = Gauge("ganalytics_ads_calls_in_flight", "Google Ads calls in progress")
+ADS_RETRIES = Counter("ganalytics_ads_retries_total", "Google Ads calls retried by the limiter", ("code",))
+ADS_SWALLOWED_ERRORS = Counter("ganalytics_ads_swallowed_errors_total", "Google Ads failures reported in responses instead of raised", ("code",))
+ADJUST_REQUEST_SECONDS = Histogram("ganalytics_adjust_request_duration_seconds", "Adjust HTTP request latency per attempt", ("method", "outcome"))
+ADJUST_RESPONSE_BYTES = Histogram("ganalytics_adjust_response_bytes", "Adjust response body size", ("method",),
+                                  buckets=(1e3, 1e4, 1e5, 1e6, 1e7, 5e7, 1e8))
+ADJUST_RETRIES = Counter("ganalytics_adjust_retries_total", "Adjust requests repeated with another auth header or payload variant", ("kind",))
+ADJUST_IN_FLIGHT = Gauge("ganalytics_adjust_requests_in_flight", "Adjust requests in progress")
+CACHE_REQUESTS = Counter("ganalytics_cache_requests_total", "Cache lookups", ("cache", "result"))
+
+
+class MetricsMiddleware:
+    """Records latency and in-flight count per route template (pure ASGI, streaming-safe)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = 500
+        
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc(method=method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(method=method)
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=method,
+                                         route=getattr(route, "path", "unmatched"), status=status)
+
+
+# ==================== REQUEST TIMING ====================
+
+class RequestTimings:
+    """Time per phase and per account for one request; phases running in parallel threads are summed"""
+
+    def __init__(self):
+        self.phases = {}
+        self.accounts = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float, account_id: Optional[str] = None):
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+            if account_id is not None:
+                account = self.accounts.setdefault(str(account_id), {})
+                account[phase] = account.get(phase, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        with self._lock:
+            parts = [f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in self.phases.items()]
+        return ", ".join(parts + [f"total;dur={total * 1000:.1f}"])
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "phases_ms": {k: round(v * 1000, 1) for k, v in self.phases.items()},
+                "accounts_ms": {a: {k: round(v * 1000, 1) for k, v in p.items()} for a, p in self.accounts.items()},
+            }
+
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record_timing(phase: str, seconds: float, account_id: Optional[str] = None):
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(phase, seconds, account_id)
+
+
+@contextmanager
+def timed(phase: str, account_id: Optional[str] = None):
+    """Attribute the block's wall time to phase of the current request (no-op outside timed requests)"""
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started, account_id)
+
+
+TIMED_PATHS = {"/api/report", "/api/dashboard", "/api/dashboard/stream", "/api/upload"}
+# Their headers go out before any phase has run, so they only get the slow-request log
+STREAMED_PATHS = {"/api/dashboard/stream"}
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "5000"))
+
+
+def _log_slow(kind: str, total: float, timings: RequestTimings, **fields):
+    if total * 1000 >= SLOW_REQUEST_MS:
+        print(json.dumps({"event": "slow_request", "kind": kind, "total_ms": round(total * 1000, 1),
+                          **fields, **timings.summary()}))
+
+
+class ServerTimingMiddleware:
+    """Adds a Server-Timing header with the phase breakdown (except to streamed responses) and logs slow requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in TIMED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        status = 500
+        streamed = scope["path"] in STREAMED_PATHS
+        
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if streamed:
+                    await send(message)
+                    return
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing(time.perf_counter() - started))
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+            _log_slow("request", time.perf_counter() - started, timings,
+                      method=scope["method"], path=scope["path"], status=status)
+
+
+# ==================== MEMORY ====================
+
+# RSS above which caches stop growing and heavy requests are rejected with 503 (0 disables)
+MEMORY_BUDGET_MB = float(os.getenv("MEMORY_BUDGET_MB", "0"))
+MEMORY_SAMPLE_INTERVAL = float(os.getenv("MEMORY_SAMPLE_INTERVAL", "0.1"))
+# RSS falls slowly after eviction, so caches are evicted at most this often
+MEMORY_RELIEVE_INTERVAL = float(os.getenv("MEMORY_RELIEVE_INTERVAL", "30"))
+ADMIN_EMAILS = {e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()}
+MEMORY_GUARDED_PATHS = TIMED_PATHS | {"/api/jobs/report", "/api/jobs/upload"}
+# Caches that may be emptied under memory pressure; jobs and batch uploads hold state and are never evicted
+EVICTABLE_CACHES = ("report", "adjust", "day_rows", "catalog", "video_assets")
+
+# Tracing slows allocation-heavy code, so it is opt-in (MEMORY_TRACE=1 or the admin endpoint)
+if os.getenv("MEMORY_TRACE", "") == "1":
+    tracemalloc.start(int(os.getenv("MEMORY_TRACE_FRAMES", "1")))
+
+
+try:
+    # Returns heap pages freed by gc to the OS, so RSS can actually fall (glibc only)
+    malloc_trim = ctypes.CDLL("libc.so.6").malloc_trim
+except (OSError, AttributeError):
+    malloc_trim = None
+
+
+def current_rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError):  # not Linux: no budget enforcement
+        return None
+
+
+class MemoryMonitor:
+    """Samples RSS in a background thread and tracks the peak seen by each in-flight request"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.rss_mb = current_rss_mb()
+        self.rejected = 0
+        self.recent = deque(maxlen=100)
+        self._active = {}  # id -> request record
+        self._lock = threading.Lock()
+        self._thread = None
+        self._relieved_at = float("-inf")
+
+    def start(self):
+        if self._thread is None and self.rss_mb is not None:
+            self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self.sample()
+            time.sleep(self.interval)
+
+    def sample(self) -> Optional[float]:
+        rss = current_rss_mb()
+        with self._lock:
+            self.rss_mb = rss
+            for record in self._active.values():
+                record["peak_mb"] = max(record["peak_mb"], rss)
+        return rss
+
+    def begin(self, method: str, path: str) -> dict:
+        record = {"method": method, "path": path, "started_at": time.time(), "rss_start_mb": self.rss_mb, "peak_mb": self.rss_mb}
+        with self._lock:
+            self._active[id(record)] = record
+        return record
+
+    def end(self, record: dict, status: int):
+        with self._lock:
+            self._active.pop(id(record), None)
+        record.update(status=status, duration_ms=round((time.time() - record["started_at"]) * 1000, 1))
+        self.recent.append(record)
+
+    def over_budget(self) -> bool:
+        return bool(MEMORY_BUDGET_MB) and self.rss_mb is not None and self.rss_mb > MEMORY_BUDGET_MB
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._active)
+
+    def relieve(self) -> bool:
+        """Evict caches, collect garbage and trim the heap (at most once per MEMORY_RELIEVE_INTERVAL);
+        True if RSS is back under budget"""
+        now = time.monotonic()
+        with self._lock:
+            due = now - self._relieved_at >= MEMORY_RELIEVE_INTERVAL
+            if due:
+                self._relieved_at = now
+        if due:
+            for namespace in EVICTABLE_CACHES:
+                store = _cache_stores.get(namespace)
+                if isinstance(store, TTLCache):
+                    store.evict(0.5)
+            gc.collect()
+            if malloc_trim is not None:
+                malloc_trim(0)
+        self.sample()
+        return not self.over_budget()
+
+    def admit(self, own: int = 0) -> bool:
+        """False while over budget and other requests (beyond own) are running; freed memory may stay
+        in RSS, so with nothing else in flight waiting would not help and the request goes ahead"""
+        if not self.over_budget() or self.relieve():
+            return True
+        return self.in_flight() <= own
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def check(self):
+        """Raise 503 if the process is over budget while other requests are running.
+
+        Called explicitly before the read phases of reports and dashboards; never between
+        upload mutates, where aborting could leave an upload half-created.
+        """
+        if not self.admit(own=1):
+            self.reject()
+            raise HTTPException(status_code=503, detail=memory_budget_message(), headers={"Retry-After": "5"})
+
+
+memory_monitor = MemoryMonitor(MEMORY_SAMPLE_INTERVAL)
+
+
+def memory_budget_message() -> str:
+    return f"Server is low on memory ({memory_monitor.rss_mb:.0f} MB used, budget {MEMORY_BUDGET_MB:.0f} MB); retry shortly"
+
+
+class MemoryMiddleware:
+    """Records per-request peak RSS and rejects heavy requests while over the memory budget"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in MEMORY_GUARDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        if not memory_monitor.admit():
+            memory_monitor.reject()
+            response = JSONResponse({"detail": memory_budget_message()}, status_code=503, headers={"Retry-After": "5"})
+            await response(scope, receive, send)
+            return
+        record = memory_monitor.begin(scope["method"], scope["path"])
+        status = 500
+        
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            memory_monitor.end(record, status)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_prewarm_scheduler()
+    memory_monitor.start()
+    start_cpu_pool()
+    yield
+    stop_cpu_pool()
+
+
+app = FastAPI(title="Google Ads YouTube Assets Report", default_response_class=FastJSONResponse, lifespan=lifespan)
+
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("COMPRESS_MIN_SIZE", "1024")))
 
 # Добавляем middleware для сессий (хранение в Cookie)
 app.add_middleware(
@@ -28,6 +604,13 @@ app.add_middleware(
     secret_key=os.getenv("OAUTH_SECRET_KEY", "replace-with-secure-key")
 )
 
+app.add_middleware(ServerTimingMiddleware)
+
+app.add_middleware(MemoryMiddleware)
+
+# Outermost, so latency covers session handling and compression
+app.add_middleware(MetricsMiddleware)
+
 # Настройка OAuth
 oauth = OAuth()
 oauth.register(
@@ -38,20 +621,286 @@ oauth.register(
     client_kwargs={'scope': 'openid email profile'}
 )
 
+class TTLCache:
+    """Small thread-safe in-process cache with per-entry expiry and LRU eviction"""
+
+    def __init__(self, ttl: float, max_entries: int = 64):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def add(self, key, value, ttl: Optional[float] = None) -> bool:
+        """Set key only if it is absent or expired; True if it was set"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] >= time.monotonic():
+                return False
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            return True
+
+    def evict(self, fraction: float):
+        """Drop the least recently used fraction of entries"""
+        with self._lock:
+            for _ in range(int(len(self._data) * fraction + 0.5)):
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SqliteCache:
+    """TTLCache-compatible store in a SQLite file shared by all worker processes on a host.
+
+    Keys are repr()'d, values pickled; expiry uses wall-clock time.
+    """
+
+    _PRUNE_EVERY = 64
+
+    def __init__(self, path: str, namespace: str, ttl: float, max_entries: int = 64):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._sets = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "ns TEXT NOT NULL, key TEXT NOT NULL, expires_at REAL NOT NULL, value BLOB NOT NULL, "
+            "PRIMARY KEY (ns, key))"
+        )
+
+    def get(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE ns = ? AND key = ? AND expires_at >= ?",
+                (self.namespace, repr(key), time.time()),
+            ).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (ns, key, expires_at, value) VALUES (?, ?, ?, ?)",
+                (self.namespace, repr(key), expires_at, data),
+            )
+            self._sets += 1
+            if self._sets % self._PRUNE_EVERY == 0:
+                self._prune()
+
+    def add(self, key, value, ttl: Optional[float] = None) -> bool:
+        """Set key only if it is absent or expired, atomically across processes; True if it was set"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM cache WHERE ns = ? AND key = ? AND expires_at < ?",
+                                   (self.namespace, repr(key), now))
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO cache (ns, key, expires_at, value) VALUES (?, ?, ?, ?)",
+                    (self.namespace, repr(key), now + (self.ttl if ttl is None else ttl), data),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount == 1
+
+    def _prune(self):
+        self._conn.execute("DELETE FROM cache WHERE ns = ? AND expires_at < ?", (self.namespace, time.time()))
+        # Evict the entries closest to expiry beyond max_entries
+        self._conn.execute(
+            "DELETE FROM cache WHERE ns = ? AND key NOT IN "
+            "(SELECT key FROM cache WHERE ns = ? ORDER BY expires_at DESC LIMIT ?)",
+            (self.namespace, self.namespace, self.max_entries),
+        )
+
+
+class RedisCache:
+    """TTLCache-compatible store in Redis (or any server speaking its protocol); eviction is left to Redis"""
+
+    def __init__(self, url: str, namespace: str, ttl: float, max_entries: int = 64):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis needs the redis package (pip install redis)")
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._redis = redis.Redis.from_url(url)
+
+    def _key(self, key) -> str:
+        return f"ganalytics:{self.namespace}:{key!r}"
+
+    def get(self, key, default=None):
+        data = self._redis.get(self._key(key))
+        return default if data is None else pickle.loads(data)
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        ttl_ms = max(1, int((self.ttl if ttl is None else ttl) * 1000))
+        self._redis.set(self._key(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=ttl_ms)
+
+    def add(self, key, value, ttl: Optional[float] = None) -> bool:
+        """Set key only if it is absent (SET NX); True if it was set"""
+        ttl_ms = max(1, int((self.ttl if ttl is None else ttl) * 1000))
+        return bool(self._redis.set(self._key(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=ttl_ms, nx=True))
+
+
+# With several uvicorn workers the in-process cache would be per worker, so default to the shared file
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+CACHE_BACKEND = os.getenv("CACHE_BACKEND") or ("sqlite" if WEB_CONCURRENCY > 1 else "memory")
+CACHE_PATH = os.getenv("CACHE_PATH", "/tmp/ganalytics-cache.sqlite3")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+if CACHE_BACKEND not in ("memory", "sqlite", "redis"):
+    raise RuntimeError(f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}; use memory, sqlite or redis")
+
+
+class MeteredCache:
+    """Counts hits and misses of a cache store"""
+
+    _MISSING = object()
+
+    def __init__(self, store, namespace: str):
+        self.store = store
+        self.namespace = namespace
+
+    def get(self, key, default=None):
+        value = self.store.get(key, self._MISSING)
+        CACHE_REQUESTS.inc(cache=self.namespace, result="miss" if value is self._MISSING else "hit")
+        return default if value is self._MISSING else value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        # Over the memory budget, in-process caches stop taking new entries
+        if isinstance(self.store, TTLCache) and self.namespace in EVICTABLE_CACHES and memory_monitor.over_budget():
+            return
+        self.store.set(key, value, ttl)
+
+    def add(self, key, value, ttl: Optional[float] = None) -> bool:
+        """Atomic set-if-absent; never skipped under memory pressure, since callers use it to claim work"""
+        return self.store.add(key, value, ttl)
+
+
+# namespace -> store, for memory-pressure eviction and the admin memory view
+_cache_stores = {}
+
+
+def shared_cache(namespace: str, ttl: float, max_entries: int = 64):
+    """Cache for namespace in the configured backend; values must be picklable unless it is memory"""
+    if CACHE_BACKEND == "sqlite":
+        store = SqliteCache(CACHE_PATH, namespace, ttl, max_entries)
+    elif CACHE_BACKEND == "redis":
+        store = RedisCache(REDIS_URL, namespace, ttl, max_entries)
+    else:
+        store = TTLCache(ttl, max_entries)
+    _cache_stores[namespace] = store
+    return MeteredCache(store, namespace)
+
+
+# Aggregated report rows, reused when the UI pages or re-sorts the same report
+_report_cache = shared_cache("report", ttl=float(os.getenv("REPORT_CACHE_TTL", "300")))
+
+# Accounts and campaign lists change rarely; Adjust reports are cached per app/channel/period
+_catalog_cache = shared_cache("catalog", ttl=float(os.getenv("CATALOG_CACHE_TTL", "600")), max_entries=1024)
+_adjust_cache = shared_cache("adjust", ttl=float(os.getenv("ADJUST_CACHE_TTL", "900")), max_entries=128)
+
+
+# Load testing: a client factory "module:function" replaces the real Google Ads client,
+# and only then may AUTH_BYPASS_EMAIL let unauthenticated requests through as that user
+GOOGLE_ADS_CLIENT_FACTORY = os.getenv("GOOGLE_ADS_CLIENT_FACTORY", "")
+
+# Record Google Ads query results and Adjust responses into a directory, or serve them back from one
+API_RECORD_DIR = os.getenv("API_RECORD_DIR", "")
+API_REPLAY_DIR = os.getenv("API_REPLAY_DIR", "")
+
+AUTH_BYPASS_EMAIL = os.getenv("AUTH_BYPASS_EMAIL", "") if GOOGLE_ADS_CLIENT_FACTORY or API_REPLAY_DIR else ""
+if AUTH_BYPASS_EMAIL:
+    print(f"WARNING: authentication is bypassed, every request runs as {AUTH_BYPASS_EMAIL}")
+
+
 def get_current_user(request: Request) -> Any:
     user = request.session.get('user')
+    if not user and AUTH_BYPASS_EMAIL:
+        return {"email": AUTH_BYPASS_EMAIL, "name": "Load test"}
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     return user
 
+
+def require_admin(user: dict[str, Any] = Depends(get_current_user)) -> Any:
+    if (user.get("email") or "").lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="Admin only")
+    return user
+
+# build_static.py writes fingerprinted copies with .br/.gz siblings here; their names change with
+# their content, so they are cached forever, while index.html and unbuilt files are revalidated
+STATIC_DIST = os.path.join("static", "dist")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PRECOMPRESSED_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+
+class AssetStaticFiles(StaticFiles):
+    """StaticFiles that serves precompressed variants and caches fingerprinted assets immutably"""
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+        fingerprinted = os.path.dirname(full_path) == os.path.realpath(STATIC_DIST) and not full_path.endswith(".html")
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL if fingerprinted else "no-cache", "Vary": "Accept-Encoding"}
+        suffixes = {encoding: suffix for encoding, suffix in PRECOMPRESSED_SUFFIXES if os.path.isfile(full_path + suffix)}
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""), suffixes)
+        if encoding is not None:
+            full_path += suffixes[encoding]
+            stat_result = os.stat(full_path)
+            headers["Content-Encoding"] = encoding
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, media_type=media_type, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+static_files = AssetStaticFiles(directory="static")
+app.mount("/static", static_files, name="static")
 
 # Global client
 _client = None
 
 def get_client():
     global _client
+    if _client is None and API_REPLAY_DIR:
+        _client = ReplayAdsClient(_replay)
+    if _client is None and GOOGLE_ADS_CLIENT_FACTORY:
+        module_name, _, factory = GOOGLE_ADS_CLIENT_FACTORY.partition(":")
+        _client = getattr(importlib.import_module(module_name), factory)()
+        if _recorder is not None:
+            _client = RecordingAdsClient(_client, _recorder)
     if _client is None:
         # Load configuration exclusively from environment variables
         config = {
@@ -65,9 +914,426 @@ def get_client():
         # Filter out None values
         config = {k: v for k, v in config.items() if v is not None}
         _client = GoogleAdsClient.load_from_dict(config)
+        if _recorder is not None:
+            _client = RecordingAdsClient(_client, _recorder)
     return _client
 
 
+# ==================== RECORD / REPLAY ====================
+
+# Values of these variables never reach a recording
+SECRET_ENV_VARS = ("ADJUST_API_TOKEN", "ADS_DEVELOPER_TOKEN", "ADS_REFRESH_TOKEN", "ADS_CLIENT_ID", "ADS_CLIENT_SECRET",
+                   "OAUTH_SECRET_KEY", "OAUTH_GOOGLE_CLIENT_ID", "OAUTH_GOOGLE_CLIENT_SECRET", "METRICS_TOKEN")
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.split())
+
+
+def _selected_fields(query: str) -> List[str]:
+    match = re.search(r"SELECT\s+(.*?)\s+FROM\s", query, flags=re.IGNORECASE | re.DOTALL)
+    return [f.strip() for f in match.group(1).split(",")] if match else []
+
+
+def _field_value(row, path: str):
+    value = row
+    for part in path.split("."):
+        value = getattr(value, part, None)
+    # Enums are IntEnum and compare equal to their int; messages are not expected in GAQL selects
+    return value if value is None or isinstance(value, (str, int, float, bool)) else str(value)
+
+
+def _row_from_fields(fields: List[str], values: list):
+    """Attribute-access row shaped like a GoogleAdsRow for the selected fields"""
+    row = SimpleNamespace()
+    for path, value in zip(fields, values):
+        node = row
+        *parents, leaf = path.split(".")
+        for part in parents:
+            if not hasattr(node, part):
+                setattr(node, part, SimpleNamespace())
+            node = getattr(node, part)
+        setattr(node, leaf, value)
+    return row
+
+
+class ApiRecorder:
+    """Appends gzip-compressed JSON lines, one gzip member per record, with secrets scrubbed"""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _write(self, name: str, record: dict, secrets: tuple = ()):
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        for secret in {os.getenv(v, "") for v in SECRET_ENV_VARS} | set(secrets):
+            if secret:
+                line = line.replace(secret, "***")
+        with self._lock, gzip.open(os.path.join(self.directory, name), "at", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def record_search(self, customer_id: str, query: str, rows: list):
+        fields = _selected_fields(query)
+        self._write("google_ads.jsonl.gz", {
+            "customer_id": str(customer_id),
+            "query": _normalize_query(query),
+            "fields": fields,
+            "rows": [[_field_value(row, f) for f in fields] for row in rows],
+        })
+
+    def record_adjust(self, url: str, method: str, json_body: Optional[dict], response: dict, api_token: str):
+        body = response["body"]
+        try:
+            encoded = {"body": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            encoded = {"body_b64": base64.b64encode(body).decode("ascii")}
+        self._write("adjust.jsonl.gz", {
+            "method": method,
+            "url": url,
+            "json_body": json_body,
+            "status": response["status"],
+            "content_type": response["content_type"],
+            **encoded,
+        }, secrets=(api_token,))
+
+
+class ApiReplay:
+    """Serves recorded responses by request; repeated recordings of one request are served in turn"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._searches = None
+        self._adjust = None
+        self._served = {}
+        self._lock = threading.Lock()
+
+    def _load(self, name: str, key) -> dict:
+        recorded = {}
+        path = os.path.join(self.directory, name)
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    recorded.setdefault(key(record), []).append(record)
+        return recorded
+
+    def _next(self, recorded: dict, key):
+        records = recorded.get(key)
+        if not records:
+            return None
+        with self._lock:
+            n = self._served.get(key, 0)
+            self._served[key] = n + 1
+        return records[n % len(records)]
+
+    def _load_searches(self) -> dict:
+        if self._searches is None:
+            self._searches = self._load("google_ads.jsonl.gz", lambda r: (r["customer_id"], r["query"]))
+        return self._searches
+
+    def login_customer_id(self) -> str:
+        """The customer the account list was recorded for"""
+        for customer_id, query in self._load_searches():
+            if "FROM customer_client" in query:
+                return customer_id
+        return ""
+
+    def search(self, customer_id: str, query: str) -> list:
+        self._load_searches()
+        record = self._next(self._searches, (str(customer_id), _normalize_query(query)))
+        if record is None:
+            raise LookupError(f"No recorded Google Ads response for customer {customer_id}: {_normalize_query(query)[:120]}")
+        return [_row_from_fields(record["fields"], values) for values in record["rows"]]
+
+    def adjust_response(self, url: str, method: str, json_body: Optional[dict]) -> dict:
+        if self._adjust is None:
+            self._adjust = self._load("adjust.jsonl.gz", lambda r: (r["method"], r["url"], json.dumps(r["json_body"], sort_keys=True)))
+        record = self._next(self._adjust, (method, url, json.dumps(json_body, sort_keys=True)))
+        if record is None:
+            raise RuntimeError(f"No recorded Adjust response for {method} {url}")
+        body = base64.b64decode(record["body_b64"]) if "body_b64" in record else record["body"].encode("utf-8")
+        return {"status": record["status"], "content_type": record["content_type"], "body": body, "method": method}
+
+
+class RecordingGoogleAdsService:
+    def __init__(self, service, recorder: ApiRecorder):
+        self._service = service
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._service, name)
+
+    def search(self, customer_id, query, **kwargs):
+        rows = list(self._service.search(customer_id=customer_id, query=query, **kwargs))
+        self._recorder.record_search(customer_id, query, rows)
+        return rows
+
+    def search_stream(self, customer_id, query, **kwargs):
+        rows = []
+        for batch in self._service.search_stream(customer_id=customer_id, query=query, **kwargs):
+            rows.extend(batch.results)
+            yield batch
+        self._recorder.record_search(customer_id, query, rows)
+
+
+class RecordingAdsClient:
+    """Real client whose GoogleAdsService searches are recorded; everything else passes through"""
+
+    def __init__(self, client, recorder: ApiRecorder):
+        self._client = client
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def get_service(self, name, *args, **kwargs):
+        service = self._client.get_service(name, *args, **kwargs)
+        return RecordingGoogleAdsService(service, self._recorder) if name == "GoogleAdsService" else service
+
+
+class ReplayGoogleAdsService:
+    def __init__(self, replay: ApiReplay):
+        self._replay = replay
+
+    def search(self, customer_id, query, **kwargs):
+        return self._replay.search(customer_id, query)
+
+    def search_stream(self, customer_id, query, **kwargs):
+        yield SimpleNamespace(results=self._replay.search(customer_id, query))
+
+    def mutate(self, **kwargs):
+        raise RuntimeError("Mutates are not available when replaying recorded responses")
+
+
+class ReplayAdsClient:
+    """Read-only client answering searches from a recording; needs no credentials"""
+
+    def __init__(self, replay: ApiReplay):
+        self._replay = replay
+        self.login_customer_id = os.getenv("ADS_LOGIN_CUSTOMER_ID") or replay.login_customer_id()
+
+    def get_service(self, name, *args, **kwargs):
+        if name != "GoogleAdsService":
+            raise RuntimeError(f"{name} is not available when replaying recorded responses")
+        return ReplayGoogleAdsService(self._replay)
+
+
+_recorder = ApiRecorder(API_RECORD_DIR) if API_RECORD_DIR and not API_REPLAY_DIR else None
+_replay = ApiReplay(API_REPLAY_DIR) if API_REPLAY_DIR else None
+
+
+# ==================== GOOGLE ADS RATE LIMITING ====================
+
+class TokenBucket:
+    """Blocking token bucket whose refill rate adapts to throttling (AIMD)"""
+
+    def __init__(self, rate: float, burst: float, min_rate: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.02)
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0)
+
+
+# Transient failures worth retrying for reads; mutates are only retried when throttled or UNAVAILABLE
+RETRYABLE_GRPC_CODES = {"RESOURCE_EXHAUSTED", "UNAVAILABLE", "ABORTED", "INTERNAL"}
+RETRYABLE_ADS_ERRORS = {"quota_error", "internal_error"}
+
+
+def ads_error_codes(ex: Exception) -> List[str]:
+    """Error codes of a Google Ads failure, e.g. ['quota_error:RESOURCE_EXHAUSTED']"""
+    if isinstance(ex, GoogleAdsException):
+        codes = []
+        for error in ex.failure.errors:
+            pb = type(error.error_code).pb(error.error_code)
+            kind = pb.WhichOneof("error_code")
+            if kind:
+                codes.append(f"{kind}:{type(error.error_code).to_dict(error.error_code).get(kind)}")
+        return codes or [ex.error.code().name]
+    if isinstance(ex, grpc.RpcError):
+        return [ex.code().name]
+    return [type(ex).__name__]
+
+
+def ads_error_message(ex: Exception) -> str:
+    if isinstance(ex, GoogleAdsException):
+        return "; ".join(e.message for e in ex.failure.errors) or ex.error.code().name
+    if isinstance(ex, grpc.RpcError):
+        return f"{ex.code().name}: {ex.details()}"
+    return str(ex)
+
+
+def swallow_ads_error(ex: Exception) -> str:
+    """Count a Google Ads failure that is reported to the caller instead of raised; returns its message"""
+    for code in ads_error_codes(ex):
+        ADS_SWALLOWED_ERRORS.inc(code=code)
+    return ads_error_message(ex)
+
+
+class AdsRateLimiter:
+    """Central limiter for Google Ads calls.
+
+    Every call takes a token from the developer-token bucket and from the
+    customer's bucket. Throttling halves the bucket rates, successes slowly
+    restore them. Transient failures are retried with full-jitter backoff
+    while the shared retry budget allows it. A server-suggested delay above
+    max_retry_delay (e.g. a daily quota) fails fast instead of blocking the thread.
+    """
+
+    def __init__(self, rate: float, customer_rate: float, max_retries: int, retry_budget: float, max_retry_delay: float = 30.0):
+        self.customer_rate = customer_rate
+        self.max_retries = max_retries
+        self.max_retry_delay = max_retry_delay
+        self.retry_budget_max = retry_budget
+        self.retry_budget = retry_budget
+        self.developer_bucket = TokenBucket(rate, burst=max(rate, 1), min_rate=0.5)
+        self._customer_buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, customer_id: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._customer_buckets.get(customer_id)
+            if bucket is None:
+                bucket = self._customer_buckets[customer_id] = TokenBucket(self.customer_rate, burst=max(self.customer_rate, 1), min_rate=0.2)
+            return bucket
+
+    def _retry_decision(self, ex: Exception, idempotent: bool):
+        """(retryable, throttled, server-suggested delay)"""
+        if isinstance(ex, GoogleAdsException):
+            code = ex.error.code().name
+            kinds = {c.split(":", 1)[0] for c in ads_error_codes(ex)}
+            delay = None
+            for error in ex.failure.errors:
+                retry_delay = error.details.quota_error_details.retry_delay
+                if retry_delay and retry_delay.seconds:
+                    delay = float(retry_delay.seconds)
+            throttled = code == "RESOURCE_EXHAUSTED" or "quota_error" in kinds
+            transient = bool(kinds & RETRYABLE_ADS_ERRORS)
+        elif isinstance(ex, grpc.RpcError):
+            code = ex.code().name
+            delay = None
+            throttled = code == "RESOURCE_EXHAUSTED"
+            transient = code in RETRYABLE_GRPC_CODES or code == "DEADLINE_EXCEEDED"
+        else:
+            return False, False, None
+        if not idempotent:
+            # A mutate may have been applied unless it was rejected up front
+            return throttled or code == "UNAVAILABLE", throttled, delay
+        return throttled or transient, throttled, delay
+
+    def _take_retry(self) -> bool:
+        with self._lock:
+            if self.retry_budget < 1:
+                return False
+            self.retry_budget -= 1
+            return True
+
+    def _refund(self):
+        with self._lock:
+            self.retry_budget = min(self.retry_budget_max, self.retry_budget + 0.1)
+
+    def call(self, customer_id: str, fn, idempotent: bool = True):
+        customer_bucket = self._bucket(customer_id)
+        for attempt in range(self.max_retries + 1):
+            with timed("ratelimit", customer_id):
+                self.developer_bucket.acquire()
+                customer_bucket.acquire()
+            try:
+                result = fn()
+            except (GoogleAdsException, grpc.RpcError) as ex:
+                retryable, throttled, delay = self._retry_decision(ex, idempotent)
+                if throttled:
+                    self.developer_bucket.on_throttle()
+                    customer_bucket.on_throttle()
+                if (not retryable or attempt == self.max_retries or (delay or 0) > self.max_retry_delay
+                        or not self._take_retry()):
+                    raise
+                ADS_RETRIES.inc(code=ads_error_codes(ex)[0])
+                backoff = random.uniform(0, min(self.max_retry_delay, 0.5 * 2 ** attempt))
+                with timed("ratelimit", customer_id):
+                    time.sleep(max(backoff, delay or 0))
+                continue
+            self.developer_bucket.on_success()
+            customer_bucket.on_success()
+            self._refund()
+            return result
+
+
+ads_limiter = AdsRateLimiter(
+    rate=float(os.getenv("ADS_RATE_LIMIT", "10")),
+    customer_rate=float(os.getenv("ADS_CUSTOMER_RATE_LIMIT", "4")),
+    max_retries=int(os.getenv("ADS_MAX_RETRIES", "4")),
+    retry_budget=float(os.getenv("ADS_RETRY_BUDGET", "20")),
+    max_retry_delay=float(os.getenv("ADS_MAX_RETRY_DELAY", "30")),
+)
+
+
+ADS_READ_METHODS = ("search", "list_batch_job_results")
+
+
+def _timed_ads_call(customer_id: str, method: str, fn):
+    started = time.perf_counter()
+    outcome = "error"
+    ADS_IN_FLIGHT.inc()
+    try:
+        result = fn()
+        outcome = "ok"
+        return result
+    finally:
+        elapsed = time.perf_counter() - started
+        ADS_IN_FLIGHT.dec()
+        ADS_CALL_SECONDS.observe(elapsed, customer_id=customer_id, method=method, outcome=outcome)
+        record_timing("gaql" if method in ADS_READ_METHODS else "mutate", elapsed, customer_id)
+
+
+def ads_search(client, customer_id: str, query: str) -> list:
+    """GoogleAdsService.search through the shared limiter; rows are fully read"""
+    ga_service = client.get_service("GoogleAdsService")
+    rows = ads_limiter.call(customer_id, lambda: _timed_ads_call(
+        customer_id, "search", lambda: list(ga_service.search(customer_id=customer_id, query=query))
+    ))
+    ADS_ROWS.inc(len(rows), customer_id=customer_id)
+    return rows
+
+
+def ads_batch_job_results(client, customer_id: str, batch_job: str) -> list:
+    """BatchJobService.list_batch_job_results through the shared limiter; results are fully read"""
+    batch_job_service = client.get_service("BatchJobService")
+    return ads_limiter.call(customer_id, lambda: _timed_ads_call(
+        customer_id, "list_batch_job_results", lambda: list(batch_job_service.list_batch_job_results(resource_name=batch_job))
+    ))
+
+
+def ads_mutate(customer_id: str, fn, /, **kwargs):
+    """Rate-limited mutate; only retried when the request was never applied"""
+    method = getattr(fn, "__name__", "mutate")
+    return ads_limiter.call(customer_id, lambda: _timed_ads_call(customer_id, method, lambda: fn(**kwargs)), idempotent=False)
+
+
 def normalize_asset_name(name: str) -> str:
     """Remove format suffixes like 9x16, 1x1, 16x9 from asset name"""
     # Remove common format patterns
@@ -89,6 +1355,12 @@ class ReportRequest(BaseModel):
     end_date: str
     group_by_account: bool = False
     group_by_campaign: bool = True
+    response_format: str = "rows"  # "rows" or "columnar"
+    sort_by: str = "cost"
+    sort_dir: str = "desc"  # "asc" or "desc"
+    offset: int = 0
+    limit: Optional[int] = None  # None returns all rows from offset
+    shard_days: Optional[int] = None  # split the range into shards of N days (None uses REPORT_SHARD_DAYS, 0 disables)
 
 
 class DashboardRequest(BaseModel):
@@ -100,6 +1372,8 @@ class DashboardRequest(BaseModel):
     adjust_app_token: str
     account_ids: List[str]  # Selected Google Ads account IDs
     top_n: int = 10
+    response_format: str = "rows"  # "rows" or "columnar"
+    granularity: str = "auto"  # "day", "week", "month" or "auto" (by range length)
 
 
 def normalize_applovin_creative(name: str) -> str:
@@ -110,6 +1384,12 @@ def normalize_applovin_creative(name: str) -> str:
     return normalized
 
 
+# Creative names repeat across rows, days and requests, so each distinct name is normalized once
+NAME_CACHE_SIZE = int(os.getenv("NAME_CACHE_SIZE", "65536"))
+cached_normalize_asset_name = lru_cache(maxsize=NAME_CACHE_SIZE)(normalize_asset_name)
+cached_normalize_applovin_creative = lru_cache(maxsize=NAME_CACHE_SIZE)(normalize_applovin_creative)
+
+
 def _platform_substr(platform: str) -> str:
     p = (platform or "").strip().lower()
     if p == "ios":
@@ -133,63 +1413,175 @@ def _make_date_range(start_date: str, end_date: str) -> List[str]:
     return [d.strftime("%Y-%m-%d") for d in dr]
 
 
-def _build_stacked_100(dates: List[str], rows: List[dict], key_field: str, date_field: str, value_field: str, top_n: int, include_cvr: bool = False):
-    if not rows:
-        return {"dates": dates, "series": []}
-    df = pd.DataFrame(rows)
-    if df.empty:
-        return {"dates": dates, "series": []}
-
-    df[value_field] = pd.to_numeric(df[value_field], errors="coerce").fillna(0.0)
-    df[date_field] = df[date_field].astype(str)
-    df[key_field] = df[key_field].fillna("").astype(str)
-    # Convert impressions/installs early for CVR calculation
-    if "impressions" in df.columns:
-        df["impressions"] = pd.to_numeric(df["impressions"], errors="coerce").fillna(0)
-    if "installs" in df.columns:
-        df["installs"] = pd.to_numeric(df["installs"], errors="coerce").fillna(0)
-    df = df[(df[key_field] != "") & (df[value_field] > 0)]
-    if df.empty:
-        return {"dates": dates, "series": []}
-
-    totals = df.groupby(key_field)[value_field].sum().sort_values(ascending=False).head(top_n)
-    top_keys = list(totals.index)
-    df_filtered = df[df[key_field].isin(top_keys)]
-
-    pivot = df_filtered.pivot_table(index=date_field, columns=key_field, values=value_field, aggfunc="sum", fill_value=0.0)
-    pivot = pivot.reindex(dates, fill_value=0.0)
-
-    daily_total = pivot.sum(axis=1)
-    pct = pivot.div(daily_total.replace({0: pd.NA}), axis=0).fillna(0.0) * 100.0
-
-    # Calculate CVR per creative if requested
-    cvr_by_key = {}
-    if include_cvr and "impressions" in df.columns and "installs" in df.columns:
-        agg = df_filtered.groupby(key_field).agg({"impressions": "sum", "installs": "sum"})
-        for k in top_keys:
-            if k in agg.index:
-                imp = agg.loc[k, "impressions"]
-                inst = agg.loc[k, "installs"]
-                cvr_by_key[k] = round((inst / imp * 100) if imp > 0 else 0.0, 3)
-            else:
-                cvr_by_key[k] = 0.0
+DASHBOARD_GRANULARITIES = ("day", "week", "month")
+
+
+def _resolve_granularity(granularity: str, start_date: str, end_date: str) -> str:
+    g = (granularity or "auto").strip().lower()
+    if g in DASHBOARD_GRANULARITIES:
+        return g
+    if g != "auto":
+        raise HTTPException(status_code=400, detail=f"Unknown granularity: {granularity}")
+    days = (pd.Timestamp(end_date) - pd.Timestamp(start_date)).days + 1
+    if days <= 62:
+        return "day"
+    if days <= 183:
+        return "week"
+    return "month"
+
 
+def _make_date_buckets(start_date: str, end_date: str, granularity: str):
+    """Return bucket labels and a day -> bucket label mapping.
+
+    Weeks are labelled by their Monday (YYYY-MM-DD), months as YYYY-MM.
+    """
+    days = _make_date_range(start_date, end_date)
+    if granularity == "day":
+        return days, dict(zip(days, days))
+    dr = pd.to_datetime(days)
+    if granularity == "week":
+        labels = [(d - pd.Timedelta(days=d.weekday())).strftime("%Y-%m-%d") for d in dr]
+    else:
+        labels = [d.strftime("%Y-%m") for d in dr]
+    return list(dict.fromkeys(labels)), dict(zip(days, labels))
+
+
+def _stacked_100_chart(dates: List[str], keys: List[str], result, include_cvr: bool) -> dict:
+    top, pct, cost, top_impressions, top_installs = result
     series = []
-    for k in top_keys:
-        if k not in pct.columns:
-            continue
-        item = {
-            "name": k,
-            "dataPct": [float(x) for x in pct[k].values],
-            "dataCost": [float(x) for x in pivot[k].values],
-        }
+    for i, code in enumerate(top):
+        item = {"name": keys[code], "dataPct": pct[i], "dataCost": cost[i]}
         if include_cvr:
-            item["cvr"] = cvr_by_key.get(k, 0.0)
+            imp, inst = float(top_impressions[i]), float(top_installs[i])
+            item["cvr"] = round(inst / imp * 100, 3) if imp > 0 else 0.0
         series.append(item)
     return {"dates": dates, "series": series}
 
 
+def _build_stacked_100(dates: List[str], rows: List[dict], key_field: str, date_field: str, value_field: str, top_n: int, include_cvr: bool = False):
+    columns = ChartColumns.from_rows(dates, rows, key_field, date_field, value_field)
+    result = stacked_100_from_arrays(len(dates), *columns.stacked_arrays(), top_n)
+    return _stacked_100_chart(dates, columns.creatives.names, result, include_cvr)
+
+
+async def stacked_100_on_pool(columns: ChartColumns, top_n: int, include_cvr: bool = False) -> dict:
+    """_build_stacked_100 for prepared columns, with the numeric part in the CPU pool (inline when there is none)"""
+    result = await run_cpu(stacked_100_from_arrays, len(columns.dates), *columns.stacked_arrays(), top_n)
+    return _stacked_100_chart(columns.dates, columns.creatives.names, result, include_cvr)
+
+
+def _cvr_by_day(cvr_data: List[dict], dates: List[str]) -> np.ndarray:
+    """Aggregate impressions and installs by day, calculate CVR"""
+    columns = ChartColumns.from_rows(dates, cvr_data, "creative", "day", "cost")
+    return cvr_by_day_from_arrays(len(dates), *columns.cvr_arrays())
+
+
+async def cvr_by_day_on_pool(columns: ChartColumns) -> np.ndarray:
+    return await run_cpu(cvr_by_day_from_arrays, len(columns.dates), *columns.cvr_arrays())
+
+
+# CPU-bound chart math runs in worker processes when CPU_POOL_WORKERS > 0, so concurrent
+# dashboards don't serialize on this worker's GIL. Pool functions live in charts.py, so each
+# process imports only that module and numpy, not the app (when served by uvicorn app:app).
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", "0"))
+_cpu_pool = None
+
+
+def start_cpu_pool():
+    """Create the pool and import charts.py in every worker ahead of the first dashboard"""
+    global _cpu_pool
+    if CPU_POOL_WORKERS > 0 and _cpu_pool is None:
+        # spawn: forking a process with gRPC and monitor threads is unsafe
+        _cpu_pool = ProcessPoolExecutor(max_workers=CPU_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        for _ in range(CPU_POOL_WORKERS):
+            _cpu_pool.submit(pool_ready)
+
+
+def stop_cpu_pool():
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
+
+
+async def run_cpu(fn, *args):
+    """fn(*args) in the CPU pool if configured, else inline; args should be compact numpy arrays"""
+    if CPU_POOL_WORKERS <= 0:
+        return fn(*args)
+    start_cpu_pool()
+    try:
+        return await asyncio.wrap_future(_cpu_pool.submit(fn, *args))
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed): replace the pool and compute this one inline
+        print("[cpu_pool] worker pool broken, restarting")
+        stop_cpu_pool()
+        return fn(*args)
+
+
+def _encode_columnar(rows: List[dict], columns: List[str], string_columns: tuple = ()) -> dict:
+    """Encode a list of dicts as column arrays, dictionary-encoding string columns"""
+    out_columns = {}
+    dicts = {}
+    for col in columns:
+        values = [r.get(col) for r in rows]
+        if col in string_columns:
+            index = {}
+            codes = []
+            for v in values:
+                v = v or ""
+                code = index.get(v)
+                if code is None:
+                    code = index[v] = len(index)
+                codes.append(code)
+            out_columns[col] = codes
+            dicts[col] = list(index)
+        else:
+            out_columns[col] = values
+    return {"format": "columnar", "length": len(rows), "columns": out_columns, "dicts": dicts}
+
+
+def _columnar_chart(chart: dict) -> dict:
+    """Encode a stacked chart as parallel per-series arrays rounded to display precision"""
+    series = chart.get("series", [])
+    out = {
+        "format": "columnar",
+        "dates": chart.get("dates", []),
+        "names": [s["name"] for s in series],
+        "dataPct": [np.round(s["dataPct"], 2) for s in series],
+        "dataCost": [np.round(s["dataCost"], 2) for s in series],
+    }
+    if series and "cvr" in series[0]:
+        out["cvr"] = [s.get("cvr", 0.0) for s in series]
+    return out
+
+
+REPORT_TEXT_COLUMNS = ('asset_name', 'account', 'campaign')
+REPORT_NUMERIC_COLUMNS = ('cost', 'impressions', 'installs')
+
+
+def _select_report_page(rows: List[dict], sort_by: str, sort_dir: str, offset: int, limit: Optional[int]) -> List[dict]:
+    """Return rows[offset:offset + limit] in sorted order.
+
+    With a limit only the top offset + limit rows are selected with a heap,
+    so large reports are never fully sorted just to show the first page.
+    """
+    if sort_by in REPORT_TEXT_COLUMNS:
+        key = lambda r: (r.get(sort_by) or '').lower()
+    elif sort_by in REPORT_NUMERIC_COLUMNS:
+        key = lambda r: r.get(sort_by) or 0
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown sort column: {sort_by}")
+    reverse = sort_dir != "asc"
+    offset = max(offset, 0)
+    if limit is None or offset + limit >= len(rows):
+        return sorted(rows, key=key, reverse=reverse)[offset:]
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    return select(offset + max(limit, 0), rows, key=key)[offset:]
+
+
 def _adjust_request(url: str, api_token: str, method: str = "GET", json_body: Optional[dict] = None):
+    if _replay is not None:
+        return _replay.adjust_response(url, method, json_body)
     headers_variants = [
         {"Authorization": f"Bearer {api_token}", "Accept": "*/*"},
         {"Authorization": f"Token token={api_token}", "Accept": "*/*"},
@@ -198,7 +1590,12 @@ def _adjust_request(url: str, api_token: str, method: str = "GET", json_body: Op
     if json_body is not None:
         data = json.dumps(json_body).encode("utf-8")
     last_err = None
-    for headers in headers_variants:
+    for attempt, headers in enumerate(headers_variants):
+        if attempt:
+            ADJUST_RETRIES.inc(kind="auth_header")
+        started = time.perf_counter()
+        outcome = "error"
+        ADJUST_IN_FLIGHT.inc()
         try:
             h = dict(headers)
             if data is not None:
@@ -207,7 +1604,12 @@ def _adjust_request(url: str, api_token: str, method: str = "GET", json_body: Op
             with urlrequest.urlopen(req, timeout=60) as resp:
                 content_type = resp.headers.get("Content-Type", "")
                 body = resp.read()
-                return {"status": getattr(resp, "status", 200), "content_type": content_type, "body": body, "method": method}
+                outcome = "ok"
+                ADJUST_RESPONSE_BYTES.observe(len(body), method=method)
+                response = {"status": getattr(resp, "status", 200), "content_type": content_type, "body": body, "method": method}
+                if _recorder is not None:
+                    _recorder.record_adjust(url, method, json_body, response, api_token)
+                return response
         except HTTPError as e:
             try:
                 body = e.read()
@@ -219,6 +1621,9 @@ def _adjust_request(url: str, api_token: str, method: str = "GET", json_body: Op
         except Exception as e:
             last_err = e
             continue
+        finally:
+            ADJUST_IN_FLIGHT.dec()
+            ADJUST_REQUEST_SECONDS.observe(time.perf_counter() - started, method=method, outcome=outcome)
     raise last_err or RuntimeError("Adjust request failed")
 
 
@@ -291,8 +1696,40 @@ def _store_type_for_platform(platform: str) -> str:
     return "app_store" if p == "ios" else "google_play"
 
 
+def _cached_adjust_creative_daily_cost(api_token: str, app_token: str, channel_id: str, start_date: str, end_date: str, platform: str):
+    """_fetch_adjust_creative_daily_cost through the shared caches; callers must not mutate the rows.
+
+    Settled days (older than ADJUST_MATURE_DAYS) come from the day cache when all are there,
+    and only the recent days are fetched; otherwise the whole range is fetched once and its
+    settled days are stored in the day cache. Recent days only live in the short-lived Adjust cache.
+    """
+    days = _make_date_range(start_date, end_date)
+    mature_before = adjust_mature_before()
+    mature = [d for d in days if d < mature_before]
+    cached_days = _cached_days(("adjust", app_token, channel_id, platform), mature)
+    if cached_days is not None:
+        rows = [r for d in mature for r in cached_days[d]]
+        recent = [d for d in days if d >= mature_before]
+        if recent:
+            recent_rows, _ = _cached_adjust_creative_daily_cost(api_token, app_token, channel_id, recent[0], recent[-1], platform)
+            rows += recent_rows
+        return rows, {"source": "day_cache", "cached_days": len(mature)}
+    
+    cache_key = (app_token, channel_id, start_date, end_date, platform)
+    cached = _adjust_cache.get(cache_key)
+    if cached is None:
+        cached = _fetch_adjust_creative_daily_cost(api_token, app_token, channel_id, start_date, end_date, platform)
+        _adjust_cache.set(cache_key, cached)
+        _store_days(("adjust", app_token, channel_id, platform), mature, cached[0])
+    return cached
+
+
+# Overridable so load tests can point at a local stand-in
+ADJUST_BASE_URL = os.getenv("ADJUST_BASE_URL", "https://automate.adjust.com").rstrip("/")
+
+
 def _fetch_adjust_creative_daily_cost(api_token: str, app_token: str, channel_id: str, start_date: str, end_date: str, platform: str):
-    base = "https://automate.adjust.com/reports-service/pivot_report"
+    base = f"{ADJUST_BASE_URL}/reports-service/pivot_report"
     date_period = f"{start_date}:{end_date}"
     store_type = _store_type_for_platform(platform)
     params = {
@@ -347,6 +1784,7 @@ def _fetch_adjust_creative_daily_cost(api_token: str, app_token: str, channel_id
             ]
             last = None
             for payload in payload_variants:
+                ADJUST_RETRIES.inc(kind="payload_variant")
                 try:
                     resp = _adjust_request(base, api_token=api_token, method="POST", json_body=payload)
                     raw_body = resp.get("body", b"") or b""
@@ -415,7 +1853,12 @@ async def root(request: Request):
     user = request.session.get('user')
     if not user:
         return RedirectResponse(url='/api/auth/login')
-    return FileResponse("static/index.html")
+    # The built index references fingerprinted assets; revalidated (ETag) so repeat loads get a 304
+    index = os.path.join(STATIC_DIST, "index.html")
+    if not os.path.exists(index):
+        index = os.path.join("static", "index.html")
+    index = os.path.realpath(index)
+    return static_files.file_response(index, os.stat(index), request.scope)
 
 
 @app.get("/api/auth/login")
@@ -448,16 +1891,72 @@ async def logout(request: Request):
     return RedirectResponse(url='/')
 
 
+@app.get("/metrics")
+async def metrics(request: Request):
+    """Prometheus text format, for `Authorization: Bearer <METRICS_TOKEN>` or a signed-in admin.
+
+    Labels include customer ids, so the endpoint is never public.
+    """
+    token = os.getenv("METRICS_TOKEN", "")
+    authorization = request.headers.get("authorization", "")
+    if not (token and hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode())):
+        require_admin(get_current_user(request))
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/admin/memory")
+async def admin_memory(top: int = 25, user: dict[str, Any] = Depends(require_admin)):
+    """Process memory, tracemalloc top allocators, cache sizes and per-request peak RSS"""
+    memory_monitor.sample()
+    traced = {"tracing": tracemalloc.is_tracing()}
+    if traced["tracing"]:
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:max(top, 0)]
+        traced.update(current_mb=round(current / 1e6, 2), peak_mb=round(peak / 1e6, 2), top=[
+            {"location": str(stat.traceback), "size_mb": round(stat.size / 1e6, 3), "count": stat.count} for stat in stats
+        ])
+    with memory_monitor._lock:
+        in_flight = [dict(r) for r in memory_monitor._active.values()]
+    recent = sorted(memory_monitor.recent, key=lambda r: (r["peak_mb"] or 0) - (r["rss_start_mb"] or 0), reverse=True)
+    return {
+        "rss_mb": memory_monitor.rss_mb,
+        "budget_mb": MEMORY_BUDGET_MB or None,
+        "rejected_requests": memory_monitor.rejected,
+        "tracemalloc": traced,
+        "caches": {ns: len(store) if isinstance(store, TTLCache) else None for ns, store in _cache_stores.items()},
+        "requests_in_flight": in_flight,
+        "recent_requests_by_growth": recent[:top],
+    }
+
+
+@app.post("/api/admin/memory/tracemalloc")
+async def admin_tracemalloc(enable: bool, frames: int = 1, user: dict[str, Any] = Depends(require_admin)):
+    """Start or stop tracemalloc at runtime"""
+    if enable and not tracemalloc.is_tracing():
+        tracemalloc.start(max(frames, 1))
+    elif not enable and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return {"tracing": tracemalloc.is_tracing()}
+
+
 @app.get("/api/accounts")
 async def get_accounts(user: dict[str, Any] = Depends(get_current_user)):
     """Get all available accounts"""
+    return {"accounts": await asyncio.to_thread(fetch_accounts)}
+
+
+def fetch_accounts() -> List[dict]:
+    """Enabled non-manager accounts under the login customer, sorted by name"""
     client = get_client()
     login_customer_id = client.login_customer_id.replace('-', '') if client.login_customer_id else None
     
     if not login_customer_id:
         raise HTTPException(status_code=500, detail="No login_customer_id configured")
     
-    ga_service = client.get_service("GoogleAdsService")
+    cached = _catalog_cache.get(("accounts", login_customer_id))
+    if cached is not None:
+        return cached
+    
     query = """
         SELECT
             customer_client.id,
@@ -468,74 +1967,315 @@ async def get_accounts(user: dict[str, Any] = Depends(get_current_user)):
     """
     
     try:
-        response = ga_service.search(customer_id=login_customer_id, query=query)
+        response = ads_search(client, login_customer_id, query)
         accounts = []
         for row in response:
             accounts.append({
                 'id': str(row.customer_client.id),
                 'name': row.customer_client.descriptive_name
             })
-        return {"accounts": sorted(accounts, key=lambda x: x['name'])}
-    except GoogleAdsException as ex:
-        raise HTTPException(status_code=500, detail=str(ex.failure.errors[0].message))
-
-
-@app.get("/api/campaigns")
-async def get_campaigns(account_ids: str, start_date: str, end_date: str, user: dict[str, Any] = Depends(get_current_user)):
-    """Get campaigns for selected accounts that have spend in the date range"""
-    client = get_client()
-    ga_service = client.get_service("GoogleAdsService")
-    
-    account_list = account_ids.split(',')
-    all_campaigns = []
-    
-    # Query campaigns with spend in the date range
+        accounts = sorted(accounts, key=lambda x: x['name'])
+        _catalog_cache.set(("accounts", login_customer_id), accounts)
+        return accounts
+    except (GoogleAdsException, grpc.RpcError) as ex:
+        raise HTTPException(status_code=500, detail=ads_error_message(ex))
+
+
+# ==================== CAMPAIGN ACTIVITY ====================
+
+# Google Ads may still restate a day for a few days, so a day fetched before it was
+# CAMPAIGN_ACTIVITY_LIVE_DAYS old is refetched once that fetch is older than
+# CAMPAIGN_ACTIVITY_REFRESH seconds; a fetch made after that is final and kept by the worker
+CAMPAIGN_ACTIVITY_LIVE_DAYS = int(os.getenv("CAMPAIGN_ACTIVITY_LIVE_DAYS", "3"))
+CAMPAIGN_ACTIVITY_REFRESH = float(os.getenv("CAMPAIGN_ACTIVITY_REFRESH", "600"))
+
+
+def _days_between(start_date: str, end_date: str) -> List[str]:
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+class CampaignActivity:
+    """One account's campaigns with the sorted days on which each had spend, filled in per day as ranges are asked for"""
+
+    def __init__(self):
+        self.names = {}  # campaign id -> name
+        self.days = {}  # campaign id -> sorted days with spend
+        self.by_day = {}  # day -> campaign ids with spend
+        self.loaded = {}  # day -> (monotonic time of the fetch it came from, whether that fetch is final)
+        self.lock = threading.Lock()
+
+    def stale_days(self, days: List[str], now: float) -> List[str]:
+        """Days never fetched, and days fetched while still live whose fetch is older than the refresh interval"""
+        with self.lock:
+            return [d for d in days if d not in self.loaded
+                    or (not self.loaded[d][1] and now - self.loaded[d][0] > CAMPAIGN_ACTIVITY_REFRESH)]
+
+    def update(self, days: List[str], rows: List[tuple], fetched_at: float, today: Optional[date] = None):
+        """Replace what is known about days with rows of (day, campaign id, name); days without rows had no spend"""
+        fresh = {day: set() for day in days}
+        final_until = ((today or date.today()) - timedelta(days=CAMPAIGN_ACTIVITY_LIVE_DAYS)).isoformat()
+        with self.lock:
+            for day, campaign_id, name in rows:
+                if day in fresh:
+                    fresh[day].add(campaign_id)
+                    self.names[campaign_id] = name
+            for day, campaign_ids in fresh.items():
+                previous = self.by_day.get(day, set())
+                for campaign_id in previous - campaign_ids:
+                    campaign_days = self.days[campaign_id]
+                    del campaign_days[bisect_left(campaign_days, day)]
+                for campaign_id in campaign_ids - previous:
+                    insort(self.days.setdefault(campaign_id, []), day)
+                self.by_day[day] = campaign_ids
+                self.loaded[day] = (fetched_at, day < final_until)
+
+    def active(self, start_date: str, end_date: str) -> List[tuple]:
+        """(campaign id, name) of campaigns with spend on any day of the range"""
+        active = []
+        with self.lock:
+            for campaign_id, campaign_days in self.days.items():
+                i = bisect_left(campaign_days, start_date)
+                if i < len(campaign_days) and campaign_days[i] <= end_date:
+                    active.append((campaign_id, self.names[campaign_id]))
+        return active
+
+
+_campaign_activity = {}  # account id -> CampaignActivity
+_campaign_activity_lock = threading.Lock()
+
+
+def campaign_activity(account_id: str) -> CampaignActivity:
+    with _campaign_activity_lock:
+        if account_id not in _campaign_activity:
+            _campaign_activity[account_id] = CampaignActivity()
+        return _campaign_activity[account_id]
+
+
+def fetch_campaign_activity(client, account_id: str, start_date: str, end_date: str) -> List[tuple]:
+    """(day, campaign id, name) for every campaign and day with spend in the range"""
     query = f"""
         SELECT
+            segments.date,
             campaign.id,
-            campaign.name,
-            metrics.cost_micros
+            campaign.name
         FROM campaign
         WHERE campaign.status != 'REMOVED'
           AND segments.date BETWEEN '{start_date}' AND '{end_date}'
           AND metrics.cost_micros > 0
     """
-    
-    for account_id in account_list:
-        try:
-            response = ga_service.search(customer_id=account_id.strip(), query=query)
-            seen_campaigns = set()
-            for row in response:
-                campaign_key = f"{account_id}_{row.campaign.id}"
-                if campaign_key not in seen_campaigns:
-                    seen_campaigns.add(campaign_key)
-                    all_campaigns.append({
-                        'id': campaign_key,
-                        'campaign_id': str(row.campaign.id),
-                        'account_id': account_id,
-                        'name': row.campaign.name
-                    })
-        except:
-            continue
-    
-    # Remove duplicates by name and sort
-    unique_campaigns = {}
-    for c in all_campaigns:
-        if c['name'] not in unique_campaigns:
-            unique_campaigns[c['name']] = c
-    
-    return {"campaigns": sorted(list(unique_campaigns.values()), key=lambda x: x['name'])}
+    return [(sys.intern(str(row.segments.date)), str(row.campaign.id), row.campaign.name)
+            for row in ads_search(client, account_id, query)]
 
 
-@app.post("/api/report")
+def active_campaigns(client, account_id: str, start_date: str, end_date: str) -> List[tuple]:
+    """(campaign id, name) of the account's campaigns with spend in the range.
+
+    Answered from the account's activity index; only the span of days it is missing
+    (or holds stale recent data for) is fetched, usually just the newest days.
+    """
+    index = campaign_activity(account_id)
+    fetched_at = time.monotonic()
+    stale = index.stale_days(_days_between(start_date, end_date), fetched_at)
+    CACHE_REQUESTS.inc(cache="campaign_activity", result="miss" if stale else "hit")
+    if stale:
+        rows = fetch_campaign_activity(client, account_id, stale[0], stale[-1])
+        index.update(_days_between(stale[0], stale[-1]), rows, fetched_at)
+    return index.active(start_date, end_date)
+
+
+@app.get("/api/campaigns")
+async def get_campaigns(account_ids: str, start_date: str, end_date: str, user: dict[str, Any] = Depends(get_current_user)):
+    """Get campaigns for selected accounts that have spend in the date range"""
+    try:
+        if date.fromisoformat(start_date) > date.fromisoformat(end_date):
+            raise ValueError
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    all_campaigns, errors = await asyncio.to_thread(fetch_active_campaigns, account_ids.split(','), start_date, end_date)
+    
+    # Remove duplicates by name and sort
+    unique_campaigns = {}
+    for c in all_campaigns:
+        if c['name'] not in unique_campaigns:
+            unique_campaigns[c['name']] = c
+    
+    return {"campaigns": sorted(list(unique_campaigns.values()), key=lambda x: x['name']), "errors": errors}
+
+
+def fetch_active_campaigns(account_list: List[str], start_date: str, end_date: str):
+    """Campaigns of the accounts with spend in the range, and per-account errors"""
+    client = get_client()
+    all_campaigns = []
+    errors = []
+    
+    for account_id in account_list:
+        account_id = account_id.strip()
+        try:
+            active = active_campaigns(client, account_id, start_date, end_date)
+        except (GoogleAdsException, grpc.RpcError) as ex:
+            errors.append({"account_id": account_id, "error": swallow_ads_error(ex)})
+            continue
+        all_campaigns.extend({
+            'id': f"{account_id}_{campaign_id}",
+            'campaign_id': campaign_id,
+            'account_id': account_id,
+            'name': name
+        } for campaign_id, name in active)
+    
+    return all_campaigns, errors
+
+
+@app.post("/api/report")
 async def generate_report(request: ReportRequest, user: dict[str, Any] = Depends(get_current_user)):
     """Generate report with filters"""
+    return FastJSONResponse(await asyncio.to_thread(build_report, request))
+
+
+def build_report(request: ReportRequest, progress: Optional["JobProgress"] = None) -> dict:
+    """Aggregated report page; aggregation is cached so paging doesn't refetch"""
+    cache_key = (
+        tuple(request.account_ids), tuple(request.campaign_ids), request.adgroup_type, request.test_date,
+        request.start_date, request.end_date, request.group_by_account, request.group_by_campaign,
+    )
+    cached = _report_cache.get(cache_key)
+    if cached is None:
+        cached = _aggregate_report(request, progress)
+        # Don't pin a partial result for the whole TTL
+        if not cached[2]:
+            _report_cache.set(cache_key, cached)
+    result_list, totals, errors = cached
+
+    with timed("page"):
+        page = _select_report_page(result_list, request.sort_by, request.sort_dir, request.offset, request.limit)
+
+    data = page
+    if request.response_format == "columnar":
+        columns = ['asset_name']
+        if request.group_by_account:
+            columns.append('account')
+        if request.group_by_campaign:
+            columns.append('campaign')
+        columns += ['cost', 'impressions', 'installs']
+        data = _encode_columnar(page, columns, string_columns=REPORT_TEXT_COLUMNS)
+    
+    return {
+        "data": data,
+        "totals": totals,
+        "count": len(result_list),
+        "offset": request.offset,
+        "limit": request.limit,
+        "errors": errors,
+    }
+
+
+def _report_shards(start_date: str, end_date: str, shard_days: int) -> List[tuple]:
+    """Split the report range into (start, end) shards of at most shard_days; 0 disables sharding"""
+    days = _make_date_range(start_date, end_date)
+    if shard_days <= 0 or len(days) <= shard_days:
+        return [(start_date, end_date)]
+    return [(days[i], days[min(i + shard_days, len(days)) - 1]) for i in range(0, len(days), shard_days)]
+
+
+def _fetch_report_rows(client, request: ReportRequest, account_id: str, account_name: str,
+                       start_date: str, end_date: str, adgroup_filter: str) -> List[dict]:
+    """Asset rows of one account for one date shard"""
+    day_rows = google_rows_from_day_cache(client, account_id, start_date, end_date)
+    if day_rows is not None:
+        with timed("rows", account_id):
+            rows = [{
+                'asset_name': r['asset_name'],
+                'asset_name_original': r['asset_name'],
+                'account': account_name,
+                'account_id': account_id,
+                'campaign': r['campaign'],
+                'ad_group': r['ad_group'],
+                'cost': r['cost_micros'] / 1_000_000 if r['cost_micros'] else 0,
+                'impressions': r['impressions'] or 0,
+                'installs': r['conversions'] or 0
+            } for r in day_rows
+                if r['impressions'] > 0 and adgroup_filter in r['ad_group']
+                and (not request.campaign_ids or f"{account_id}_{r['campaign_id']}" in request.campaign_ids)]
+        return _normalize_report_names(rows, account_id)
+    
+    query = f"""
+        SELECT
+            asset.id,
+            asset.name,
+            asset.youtube_video_asset.youtube_video_id,
+            asset.youtube_video_asset.youtube_video_title,
+            campaign.id,
+            campaign.name,
+            ad_group.name,
+            metrics.cost_micros,
+            metrics.impressions,
+            metrics.conversions
+        FROM ad_group_ad_asset_view
+        WHERE 
+            asset.type = 'YOUTUBE_VIDEO'
+            AND segments.date BETWEEN '{start_date}' AND '{end_date}'
+            AND metrics.impressions > 0
+            AND ad_group.name LIKE '%{adgroup_filter}%'
+    """
+    
+    response = ads_search(client, account_id, query)
+    rows = []
+    with timed("rows", account_id):
+        for row in response:
+            # Filter by campaign if specified
+            if request.campaign_ids:
+                campaign_key = f"{account_id}_{row.campaign.id}"
+                if campaign_key not in request.campaign_ids:
+                    continue
+            
+            # Get asset name
+            asset_name = row.asset.name
+            if not asset_name and hasattr(row.asset, 'youtube_video_asset'):
+                yt_asset = row.asset.youtube_video_asset
+                if hasattr(yt_asset, 'youtube_video_title') and yt_asset.youtube_video_title:
+                    asset_name = yt_asset.youtube_video_title
+            if not asset_name:
+                asset_name = f"Asset_{row.asset.id}"
+            
+            # Interned, so the rows of one name share a single string object
+            asset_name = sys.intern(asset_name)
+            rows.append({
+                'asset_name': asset_name,
+                'asset_name_original': asset_name,
+                'account': account_name,
+                'account_id': account_id,
+                'campaign': sys.intern(row.campaign.name),
+                'ad_group': sys.intern(row.ad_group.name),
+                'cost': row.metrics.cost_micros / 1_000_000 if row.metrics.cost_micros else 0,
+                'impressions': row.metrics.impressions or 0,
+                'installs': row.metrics.conversions or 0
+            })
+    return _normalize_report_names(rows, account_id)
+
+
+def _normalize_report_names(rows: List[dict], account_id: str) -> List[dict]:
+    """Normalize asset names (remove format suffixes) in a separate pass so it is timed on its own"""
+    with timed("normalize", account_id):
+        for r in rows:
+            r['asset_name'] = cached_normalize_asset_name(r['asset_name_original'])
+    return rows
+
+
+# Long report ranges are split into date shards fetched concurrently; metrics are additive
+REPORT_SHARD_DAYS = int(os.getenv("REPORT_SHARD_DAYS", "0"))
+REPORT_FETCH_CONCURRENCY = max(1, int(os.getenv("REPORT_FETCH_CONCURRENCY", "4")))
+
+
+def _aggregate_report(request: ReportRequest, progress: Optional["JobProgress"] = None):
+    """Fetch asset rows for the report and aggregate them; returns (rows, totals, errors)"""
     client = get_client()
-    ga_service = client.get_service("GoogleAdsService")
     
     # Fetch account names first
-    accounts_resp = await get_accounts(user)
-    state_accounts = accounts_resp.get('accounts', [])
+    memory_monitor.check()
+    with timed("accounts"):
+        account_names = {acc['id']: acc['name'] for acc in fetch_accounts()}
+    if progress:
+        progress.set(accounts_total=len(request.account_ids))
     
     # Build adgroup filter
     if request.adgroup_type == "main":
@@ -543,96 +2283,56 @@ async def generate_report(request: ReportRequest, user: dict[str, Any] = Depends
     else:
         adgroup_filter = request.test_date or ""
     
-    # Build campaign names filter from campaign_ids
-    campaign_names = []
-    for cid in request.campaign_ids:
-        parts = cid.split('_', 1)
-        if len(parts) > 1:
-            # Extract campaign name from the ID (we stored account_campaignId)
-            pass
-    
-    all_results = []
+    shard_days = REPORT_SHARD_DAYS if request.shard_days is None else request.shard_days
+    shards = _report_shards(request.start_date, request.end_date, shard_days)
     
+    # One unit of work per (account, shard)
+    units = []
     for account_id in request.account_ids:
-        # Get campaign names for this account from selected campaign_ids
-        account_campaigns = [c.split('_', 1)[1] if '_' in c else c 
-                           for c in request.campaign_ids 
-                           if c.startswith(account_id)]
-        
-        if not account_campaigns and request.campaign_ids:
-            # Check if any campaign_ids match this account
-            continue
-        
-        query = f"""
-            SELECT
-                asset.id,
-                asset.name,
-                asset.youtube_video_asset.youtube_video_id,
-                asset.youtube_video_asset.youtube_video_title,
-                campaign.id,
-                campaign.name,
-                ad_group.name,
-                metrics.cost_micros,
-                metrics.impressions,
-                metrics.conversions
-            FROM ad_group_ad_asset_view
-            WHERE 
-                asset.type = 'YOUTUBE_VIDEO'
-                AND segments.date BETWEEN '{request.start_date}' AND '{request.end_date}'
-                AND metrics.impressions > 0
-                AND ad_group.name LIKE '%{adgroup_filter}%'
-        """
-        
-        try:
-            response = ga_service.search(customer_id=account_id, query=query)
-            
-            for row in response:
-                # Filter by campaign if specified
-                if request.campaign_ids:
-                    campaign_key = f"{account_id}_{row.campaign.id}"
-                    if campaign_key not in request.campaign_ids:
-                        continue
-                
-                # Get asset name
-                asset_name = row.asset.name
-                if not asset_name and hasattr(row.asset, 'youtube_video_asset'):
-                    yt_asset = row.asset.youtube_video_asset
-                    if hasattr(yt_asset, 'youtube_video_title') and yt_asset.youtube_video_title:
-                        asset_name = yt_asset.youtube_video_title
-                if not asset_name:
-                    asset_name = f"Asset_{row.asset.id}"
-                
-                # Normalize asset name (remove format suffixes)
-                normalized_name = normalize_asset_name(asset_name)
-                
-                # Get account name from state.accounts
-                account_name = account_id
-                for acc in state_accounts:
-                    if acc['id'] == account_id:
-                        account_name = acc['name']
-                        break
-                
-                all_results.append({
-                    'asset_name': normalized_name,
-                    'asset_name_original': asset_name,
-                    'account': account_name,
-                    'account_id': account_id,
-                    'campaign': row.campaign.name,
-                    'ad_group': row.ad_group.name,
-                    'cost': row.metrics.cost_micros / 1_000_000 if row.metrics.cost_micros else 0,
-                    'impressions': row.metrics.impressions or 0,
-                    'installs': row.metrics.conversions or 0
-                })
-        except GoogleAdsException as ex:
+        # Skip accounts none of the selected campaigns belong to
+        if request.campaign_ids and not any(c.startswith(account_id) for c in request.campaign_ids):
+            if progress:
+                progress.add(accounts_done=1)
             continue
+        units.extend((account_id, shard) for shard in shards)
+    
+    all_results = []
+    errors = []
+    shards_left = {account_id: len(shards) for account_id, _ in units}
+    
+    def fetch(unit):
+        account_id, (shard_start, shard_end) = unit
+        memory_monitor.check()
+        return _fetch_report_rows(client, request, account_id, account_names.get(account_id, account_id),
+                                  shard_start, shard_end, adgroup_filter)
+    
+    with ThreadPoolExecutor(max_workers=REPORT_FETCH_CONCURRENCY) as pool:
+        # copy_context() keeps the request timings visible in the pool threads
+        futures = {pool.submit(copy_context().run, fetch, unit): unit for unit in units}
+        for future in as_completed(futures):
+            account_id, (shard_start, shard_end) = futures[future]
+            rows = []
+            try:
+                rows = future.result()
+            except (GoogleAdsException, grpc.RpcError) as ex:
+                error = swallow_ads_error(ex)
+                if len(shards) > 1:
+                    error = f"{shard_start}..{shard_end}: {error}"
+                errors.append({"account_id": account_id, "error": error})
+            all_results.extend(rows)
+            shards_left[account_id] -= 1
+            if progress:
+                progress.add(accounts_done=1 if not shards_left[account_id] else 0, rows_fetched=len(rows))
     
     if not all_results:
-        return {
-            "data": [],
-            "totals": {"cost": 0, "impressions": 0, "installs": 0},
-            "count": 0
-        }
+        return [], {"cost": 0, "impressions": 0, "installs": 0}, errors
     
+    memory_monitor.check()
+    with timed("aggregate"):
+        return _aggregate_report_rows(request, all_results, errors)
+
+
+def _aggregate_report_rows(request: ReportRequest, all_results: List[dict], errors: List[dict]):
     # Aggregate by Asset Name (and optionally Account/Campaign)
     aggregated = {}
     for item in all_results:
@@ -659,55 +2359,28 @@ async def generate_report(request: ReportRequest, user: dict[str, Any] = Depends
         aggregated[key]['impressions'] += item['impressions']
         aggregated[key]['installs'] += item['installs']
     
-    # Convert to list
+    # Convert to list (sorting happens per page)
     result_list = list(aggregated.values())
     
-    # Sort by cost descending
-    result_list.sort(key=lambda x: x['cost'], reverse=True)
-    
     # Round and cast values
     for item in result_list:
         item['cost'] = round(item['cost'], 2)
         item['installs'] = int(round(item['installs'], 0))
         item['impressions'] = int(item['impressions'])
     
-    # Calculate totals
+    # Calculate totals over the whole set, not just the returned page
     totals = {
         "cost": round(sum(item['cost'] for item in result_list), 2),
         "impressions": int(sum(item['impressions'] for item in result_list)),
         "installs": int(sum(item['installs'] for item in result_list))
     }
     
-    return {
-        "data": result_list,
-        "totals": totals,
-        "count": len(result_list)
-    }
-
+    return result_list, totals, errors
 
-@app.post("/api/dashboard")
-async def dashboard(req: Request, body: DashboardRequest, user: dict[str, Any] = Depends(get_current_user)):
-    """
-    Dashboard: 3 charts (Google/AppLovin/Mintegral) - top N creatives by spend over period,
-    shown as % of daily spend (100% stacked).
-    Adjust token is read from ADJUST_API_TOKEN env variable.
-    """
-    adjust_token = os.environ.get("ADJUST_API_TOKEN", "").strip()
-    if not adjust_token:
-        raise HTTPException(status_code=500, detail="ADJUST_API_TOKEN not configured on server")
-    if not body.adjust_app_token:
-        raise HTTPException(status_code=400, detail="Missing adjust_app_token")
 
-    dates = _make_date_range(body.start_date, body.end_date)
-    platform = body.platform or "Android"
-    platform_sub = _platform_substr(platform)
-    platform_kw = _platform_keyword(platform)
-
-    # -------- Google (daily cost by asset_name) --------
+def _dashboard_google_columns(body: DashboardRequest, dates: List[str], bucket_of, platform_kw: str):
+    """Google daily cost, impressions and conversions by normalized asset name; also the CVR chart input"""
     client = get_client()
-    ga_service = client.get_service("GoogleAdsService")
-    
-    # Use selected account IDs from request
     google_account_ids = body.account_ids
 
     if body.adgroup_type == "main":
@@ -715,9 +2388,23 @@ async def dashboard(req: Request, body: DashboardRequest, user: dict[str, Any] =
     else:
         adgroup_filter = body.test_date or ""
 
-    google_rows = []
-    google_cvr_data = []  # For CVR chart: impressions and conversions by day
+    google = ChartColumns(dates, Interner(cached_normalize_asset_name), bucket_of)
+    google_errors = []
     for account_id in google_account_ids:
+        memory_monitor.check()
+        try:
+            day_rows = google_rows_from_day_cache(client, account_id, body.start_date, body.end_date)
+        except (GoogleAdsException, grpc.RpcError) as ex:
+            google_errors.append({"account_id": account_id, "error": swallow_ads_error(ex)})
+            continue
+        if day_rows is not None:
+            with timed("rows", account_id):
+                for r in day_rows:
+                    if not (r["cost_micros"] > 0 and adgroup_filter in r["ad_group"] and platform_kw in r["campaign"]):
+                        continue
+                    google.add(r["day"], r["asset_name"], r["cost_micros"] / 1_000_000, r["impressions"] or 0, r["conversions"] or 0)
+            continue
+
         query = f"""
             SELECT
                 segments.date,
@@ -739,7 +2426,11 @@ async def dashboard(req: Request, body: DashboardRequest, user: dict[str, Any] =
                 AND campaign.name LIKE '%{platform_kw}%'
         """
         try:
-            response = ga_service.search(customer_id=account_id, query=query)
+            response = ads_search(client, account_id, query)
+        except (GoogleAdsException, grpc.RpcError) as ex:
+            google_errors.append({"account_id": account_id, "error": swallow_ads_error(ex)})
+            continue
+        with timed("rows", account_id):
             for row in response:
                 asset_name = row.asset.name
                 if not asset_name and hasattr(row.asset, 'youtube_video_asset'):
@@ -748,120 +2439,353 @@ async def dashboard(req: Request, body: DashboardRequest, user: dict[str, Any] =
                         asset_name = yt_asset.youtube_video_title
                 if not asset_name:
                     asset_name = f"Asset_{row.asset.id}"
-                normalized_name = normalize_asset_name(asset_name)
-
-                google_rows.append({
-                    "day": str(row.segments.date),
-                    "creative": normalized_name,
-                    "cost": (row.metrics.cost_micros / 1_000_000) if row.metrics.cost_micros else 0.0,
-                    "impressions": row.metrics.impressions or 0,
-                    "installs": row.metrics.conversions or 0
-                })
-                google_cvr_data.append({
-                    "day": str(row.segments.date),
-                    "impressions": row.metrics.impressions or 0,
-                    "installs": row.metrics.conversions or 0
-                })
-        except GoogleAdsException:
-            continue
 
-    google_chart = _build_stacked_100(
-        dates=dates,
-        rows=google_rows,
-        key_field="creative",
-        date_field="day",
-        value_field="cost",
-        top_n=body.top_n,
-        include_cvr=True
-    )
+                # Asset names are normalized (format suffixes removed) as they are interned
+                google.add(str(row.segments.date), asset_name,
+                           (row.metrics.cost_micros / 1_000_000) if row.metrics.cost_micros else 0.0,
+                           row.metrics.impressions or 0, row.metrics.conversions or 0)
+
+    return google, google_errors
+
+
+def dashboard_parts(body: DashboardRequest):
+    """Validate the request and return (granularity, parts): an async generator of (name, payload)
+    for the google, applovin and mintegral charts as each one is ready, then the combined cvr"""
+    adjust_token = os.environ.get("ADJUST_API_TOKEN", "").strip()
+    if not adjust_token:
+        raise HTTPException(status_code=500, detail="ADJUST_API_TOKEN not configured on server")
+    if not body.adjust_app_token:
+        raise HTTPException(status_code=400, detail="Missing adjust_app_token")
+
+    # Rows are bucketed before aggregation, so percentages are computed per bucket
+    granularity = _resolve_granularity(body.granularity, body.start_date, body.end_date)
+    dates, bucket_of = _make_date_buckets(body.start_date, body.end_date, granularity)
+    platform = body.platform or "Android"
+    platform_sub = _platform_substr(platform)
+    platform_kw = _platform_keyword(platform)
 
-    # -------- Build CVR data for Google --------
-    def build_cvr_by_day(cvr_data: list, dates: list) -> list:
-        """Aggregate impressions and installs by day, calculate CVR"""
-        df = pd.DataFrame(cvr_data) if cvr_data else pd.DataFrame(columns=["day", "impressions", "installs"])
-        if df.empty:
-            return [0.0] * len(dates)
-        df["day"] = df["day"].astype(str)
-        df["impressions"] = pd.to_numeric(df["impressions"], errors="coerce").fillna(0)
-        df["installs"] = pd.to_numeric(df["installs"], errors="coerce").fillna(0)
-        agg = df.groupby("day").agg({"impressions": "sum", "installs": "sum"}).reindex(dates, fill_value=0)
-        cvr = (agg["installs"] / agg["impressions"].replace({0: pd.NA})).fillna(0) * 100
-        return [round(float(x), 4) for x in cvr.values]
-
-    google_cvr = build_cvr_by_day(google_cvr_data, dates)
+    def finish(chart: dict) -> dict:
+        return _columnar_chart(chart) if body.response_format == "columnar" else chart
+
+    async def build_google():
+        # The Google Ads calls block, so they run off the event loop while Adjust is fetched
+        google, google_errors = await asyncio.to_thread(_dashboard_google_columns, body, dates, bucket_of, platform_kw)
+        memory_monitor.check()
+        with timed("pandas"):
+            google_chart = await stacked_100_on_pool(google, body.top_n, include_cvr=True)
+        # -------- Build CVR data for Google --------
+        with timed("pandas"):
+            google_cvr = await cvr_by_day_on_pool(google)
+        return google_cvr, {"chart": finish(google_chart), "errors": google_errors}
 
     # -------- Adjust (AppLovin + Mintegral) --------
-    def build_adjust_channel(channel_id: str):
-        raw, debug = _fetch_adjust_creative_daily_cost(
-            api_token=adjust_token,
-            app_token=body.adjust_app_token,
-            channel_id=channel_id,
-            start_date=body.start_date,
-            end_date=body.end_date,
-            platform=platform
-        )
-        filtered = [r for r in raw if _safe_contains_platform(r.get("campaign", ""), platform_sub)]
-        rows = [{
-            "day": r["day"], 
-            "creative_network": normalize_applovin_creative(r["creative_network"]), 
-            "cost": r["cost"],
-            "impressions": r.get("impressions", 0),
-            "installs": r.get("installs", 0)
-        } for r in filtered]
-        chart = _build_stacked_100(
-            dates=dates,
-            rows=rows,
-            key_field="creative_network",
-            date_field="day",
-            value_field="cost",
-            top_n=body.top_n,
-            include_cvr=True
-        )
-        # CVR data for this channel
-        cvr_rows = [{"day": r["day"], "impressions": r.get("impressions", 0), "installs": r.get("installs", 0)} for r in filtered]
-        cvr = build_cvr_by_day(cvr_rows, dates)
-        meta = {
-            "raw_rows": len(raw),
-            "filtered_rows": len(filtered),
-            "platform_sub": platform_sub,
-            "channel_id": channel_id,
-            "debug": debug,
-        }
-        return chart, cvr, meta
+    async def build_adjust_channel(channel_id: str, label: str):
+        try:
+            memory_monitor.check()
+            with timed("adjust", channel_id):
+                raw, debug = await asyncio.to_thread(
+                    _cached_adjust_creative_daily_cost,
+                    api_token=adjust_token,
+                    app_token=body.adjust_app_token,
+                    channel_id=channel_id,
+                    start_date=body.start_date,
+                    end_date=body.end_date,
+                    platform=platform
+                )
+            filtered = [r for r in raw if _safe_contains_platform(r.get("campaign", ""), platform_sub)]
+            columns = ChartColumns(dates, Interner(cached_normalize_applovin_creative), bucket_of)
+            for r in filtered:
+                columns.add(r["day"], r["creative_network"], r["cost"], r.get("impressions", 0), r.get("installs", 0))
+            memory_monitor.check()
+            with timed("pandas"):
+                chart = await stacked_100_on_pool(columns, body.top_n, include_cvr=True)
+                # CVR data for this channel
+                cvr = await cvr_by_day_on_pool(columns)
+            meta = {
+                "raw_rows": len(raw),
+                "filtered_rows": len(filtered),
+                "platform_sub": platform_sub,
+                "channel_id": channel_id,
+                "debug": debug,
+            }
+            error = None
+        except HTTPException:
+            # A 503 from the memory guard fails the request, it is not an Adjust error
+            raise
+        except Exception as e:
+            chart, cvr, meta = {"dates": dates, "series": []}, [0.0] * len(dates), {"raw_rows": 0, "filtered_rows": 0, "channel_id": channel_id, "platform_sub": platform_sub}
+            error = str(e)
+            print(f"[dashboard] Adjust {label} error: {error}")
+        return cvr, {"chart": finish(chart), "meta": meta, "error": error}
+
+    async def parts():
+        async def named(name: str, coro):
+            return name, await coro
+
+        tasks = [
+            asyncio.ensure_future(named("google", build_google())),
+            asyncio.ensure_future(named("applovin", build_adjust_channel("partner_7", "AppLovin"))),
+            asyncio.ensure_future(named("mintegral", build_adjust_channel("partner_369", "Mintegral"))),
+        ]
+        cvr = {"dates": dates}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                name, (channel_cvr, payload) = await next_done
+                cvr[name] = channel_cvr
+                yield name, payload
+        finally:
+            for task in tasks:
+                task.cancel()
+        yield "cvr", {key: cvr[key] for key in ("dates", "google", "applovin", "mintegral")}
 
-    try:
-        applovin_chart, applovin_cvr, applovin_meta = build_adjust_channel("partner_7")
-        applovin_error = None
-    except Exception as e:
-        applovin_chart, applovin_cvr, applovin_meta = {"dates": dates, "series": []}, [0.0] * len(dates), {"raw_rows": 0, "filtered_rows": 0, "channel_id": "partner_7", "platform_sub": platform_sub}
-        applovin_error = str(e)
-        print(f"[dashboard] Adjust AppLovin error: {applovin_error}")
+    return granularity, parts()
 
-    try:
-        mintegral_chart, mintegral_cvr, mintegral_meta = build_adjust_channel("partner_369")
-        mintegral_error = None
-    except Exception as e:
-        mintegral_chart, mintegral_cvr, mintegral_meta = {"dates": dates, "series": []}, [0.0] * len(dates), {"raw_rows": 0, "filtered_rows": 0, "channel_id": "partner_369", "platform_sub": platform_sub}
-        mintegral_error = str(e)
-        print(f"[dashboard] Adjust Mintegral error: {mintegral_error}")
 
-    return {
-        "google": google_chart,
-        "applovin": applovin_chart,
-        "mintegral": mintegral_chart,
-        "cvr": {
-            "dates": dates,
-            "google": google_cvr,
-            "applovin": applovin_cvr,
-            "mintegral": mintegral_cvr
-        },
+@app.post("/api/dashboard")
+async def dashboard(req: Request, body: DashboardRequest, user: dict[str, Any] = Depends(get_current_user)):
+    """
+    Dashboard: 3 charts (Google/AppLovin/Mintegral) - top N creatives by spend over period,
+    shown as % of daily spend (100% stacked).
+    Adjust token is read from ADJUST_API_TOKEN env variable.
+    """
+    granularity, parts = dashboard_parts(body)
+    result = {}
+    async for name, payload in parts:
+        result[name] = payload
+
+    return FastJSONResponse({
+        "granularity": granularity,
+        "google": result["google"]["chart"],
+        "applovin": result["applovin"]["chart"],
+        "mintegral": result["mintegral"]["chart"],
+        "cvr": result["cvr"],
         "meta": {
-            "applovin": applovin_meta,
-            "mintegral": mintegral_meta,
-            "applovin_error": applovin_error,
-            "mintegral_error": mintegral_error,
+            "applovin": result["applovin"]["meta"],
+            "mintegral": result["mintegral"]["meta"],
+            "applovin_error": result["applovin"]["error"],
+            "mintegral_error": result["mintegral"]["error"],
+            "google_errors": result["google"]["errors"],
         }
-    }
+    })
+
+
+@app.post("/api/dashboard/stream")
+async def dashboard_stream(req: Request, body: DashboardRequest, user: dict[str, Any] = Depends(get_current_user)):
+    """
+    /api/dashboard as NDJSON, one {"event", "data"} object per line: 'start' (granularity),
+    then 'google', 'applovin' and 'mintegral' in the order they finish, then 'cvr'.
+    A failure after the first line is sent as an 'error' event.
+    """
+    granularity, parts = dashboard_parts(body)
+
+    async def events():
+        yield dumps_json({"event": "start", "data": {"granularity": granularity}}) + b"\n"
+        try:
+            async for name, payload in parts:
+                yield dumps_json({"event": name, "data": payload}) + b"\n"
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            print(f"[dashboard] stream error: {detail}")
+            yield dumps_json({"event": "error", "data": {"detail": detail}}) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson", headers={"Cache-Control": "no-cache"})
+
+
+# ==================== DAY CACHE / PREWARM ====================
+
+# Full past days of raw rows, keyed per source and day, so any range made of warm days
+# is answered without a full fetch. Entries outlive the gap between two prewarm runs.
+DAY_CACHE_TTL = float(os.getenv("DAY_CACHE_TTL", str(26 * 3600)))
+_day_rows_cache = shared_cache("day_rows", ttl=DAY_CACHE_TTL, max_entries=50000)
+
+PREWARM_AT = os.getenv("PREWARM_AT", "").strip()  # "HH:MM" server local time; empty disables the scheduler
+PREWARM_DAYS = max(1, int(os.getenv("PREWARM_DAYS", "35")))
+# Comma-separated Adjust app tokens, optionally with platform: "yypucqxkbu9s:Android,fh5kbuwv8f7k:iOS"
+PREWARM_ADJUST_APPS = os.getenv("PREWARM_ADJUST_APPS", "")
+PREWARM_ADJUST_CHANNELS = ("partner_7", "partner_369")  # AppLovin, Mintegral as on the dashboard
+# Adjust keeps restating cost for a few days; only days older than this go into the day cache
+ADJUST_MATURE_DAYS = int(os.getenv("ADJUST_MATURE_DAYS", "3"))
+
+
+# Google Ads restates cost and conversions of recent days too; those days are fetched live
+GOOGLE_MATURE_DAYS = int(os.getenv("GOOGLE_MATURE_DAYS", "3"))
+
+
+def adjust_mature_before() -> str:
+    """The first day whose Adjust data may still change"""
+    return (date.today() - timedelta(days=ADJUST_MATURE_DAYS)).isoformat()
+
+
+def google_mature_before() -> str:
+    """The first day whose Google Ads data may still change"""
+    return (date.today() - timedelta(days=GOOGLE_MATURE_DAYS)).isoformat()
+
+
+def _cached_days(source: tuple, days: List[str]) -> Optional[dict]:
+    """day -> rows when every day is cached for source, else None (also for no days)"""
+    if not days:
+        return None
+    found = {}
+    for day in days:
+        rows = _day_rows_cache.get(source + (day,))
+        if rows is None:
+            return None
+        found[day] = rows
+    return found
+
+
+def _store_days(source: tuple, days: List[str], rows: List[dict]):
+    """Cache rows split by their "day"; days without rows are cached as empty"""
+    by_day = {day: [] for day in days}
+    for r in rows:
+        if r.get("day") in by_day:
+            by_day[r["day"]].append(r)
+    for day, day_rows in by_day.items():
+        _day_rows_cache.set(source + (day,), day_rows)
+
+
+def fetch_google_day_rows(client, account_id: str, start_date: str, end_date: str) -> List[dict]:
+    """All YouTube asset rows of an account per day, unfiltered, so both the report and the dashboard can use them"""
+    query = f"""
+        SELECT
+            segments.date,
+            asset.id,
+            asset.name,
+            asset.youtube_video_asset.youtube_video_title,
+            campaign.id,
+            campaign.name,
+            ad_group.name,
+            metrics.cost_micros,
+            metrics.impressions,
+            metrics.conversions
+        FROM ad_group_ad_asset_view
+        WHERE
+            asset.type = 'YOUTUBE_VIDEO'
+            AND segments.date BETWEEN '{start_date}' AND '{end_date}'
+    """
+    rows = []
+    for row in ads_search(client, account_id, query):
+        asset_name = row.asset.name or row.asset.youtube_video_asset.youtube_video_title or f"Asset_{row.asset.id}"
+        # Interned: the rows share name strings in memory and in pickled cache entries
+        rows.append({
+            "day": sys.intern(str(row.segments.date)),
+            "asset_name": sys.intern(asset_name),
+            "campaign_id": sys.intern(str(row.campaign.id)),
+            "campaign": sys.intern(row.campaign.name),
+            "ad_group": sys.intern(row.ad_group.name),
+            "cost_micros": row.metrics.cost_micros or 0,
+            "impressions": row.metrics.impressions or 0,
+            "conversions": row.metrics.conversions or 0,
+        })
+    return rows
+
+
+def google_rows_from_day_cache(client, account_id: str, start_date: str, end_date: str) -> Optional[List[dict]]:
+    """Day rows for the range if every settled day is pre-warmed, else None. Days from
+    google_mature_before() on, today included, are fetched live.
+
+    Callers apply their own filters; ad group/campaign name filters become substring matches.
+    """
+    days = _make_date_range(start_date, end_date)
+    mature_before = google_mature_before()
+    past = [d for d in days if d < mature_before]
+    cached = _cached_days(("google", account_id), past)
+    if cached is None:
+        return None
+    rows = [r for d in past for r in cached[d]]
+    live = [d for d in days if d >= mature_before]
+    if live:
+        rows += fetch_google_day_rows(client, account_id, live[0], live[-1])
+    return rows
+
+
+def prewarm(days: int = PREWARM_DAYS) -> dict:
+    """Load the last `days` full days for every account and configured Adjust app into the day cache"""
+    end = date.today() - timedelta(days=1)
+    start_date, end_date = (end - timedelta(days=days - 1)).isoformat(), end.isoformat()
+    window = _make_date_range(start_date, end_date)
+    started = time.monotonic()
+    client = get_client()
+    accounts = fetch_accounts()
+    summary = {"start_date": start_date, "end_date": end_date, "accounts": len(accounts),
+               "google_rows": 0, "adjust_rows": 0, "errors": []}
+    
+    google_window = [d for d in window if d < google_mature_before()]
+    
+    def warm_account(account_id):
+        fetched_at = time.monotonic()
+        rows = []
+        if google_window:
+            rows = fetch_google_day_rows(client, account_id, google_window[0], google_window[-1])
+            _store_days(("google", account_id), google_window, rows)
+        campaign_activity(account_id).update(window, fetch_campaign_activity(client, account_id, start_date, end_date), fetched_at)
+        return len(rows)
+    
+    with ThreadPoolExecutor(max_workers=REPORT_FETCH_CONCURRENCY) as pool:
+        futures = {pool.submit(warm_account, acc["id"]): acc["id"] for acc in accounts}
+        for future in as_completed(futures):
+            try:
+                summary["google_rows"] += future.result()
+            except (GoogleAdsException, grpc.RpcError) as ex:
+                summary["errors"].append({"account_id": futures[future], "error": swallow_ads_error(ex)})
+    
+    adjust_token = os.environ.get("ADJUST_API_TOKEN", "").strip()
+    adjust_window = [d for d in window if d < adjust_mature_before()]
+    for spec in filter(None, (s.strip() for s in PREWARM_ADJUST_APPS.split(","))):
+        if not adjust_window:
+            break
+        app_token, _, platform = spec.partition(":")
+        platform = platform or "Android"
+        for channel_id in PREWARM_ADJUST_CHANNELS:
+            try:
+                rows, _ = _fetch_adjust_creative_daily_cost(adjust_token, app_token, channel_id, adjust_window[0], adjust_window[-1], platform)
+            except Exception as e:
+                summary["errors"].append({"app_token": app_token, "channel_id": channel_id, "error": str(e)})
+                continue
+            _store_days(("adjust", app_token, channel_id, platform), adjust_window, rows)
+            summary["adjust_rows"] += len(rows)
+    
+    summary["seconds"] = round(time.monotonic() - started, 1)
+    print(f"[prewarm] {json.dumps(summary)}")
+    return summary
+
+
+# Run dates already claimed, so only one worker process prewarms per day
+_prewarm_runs = shared_cache("prewarm_runs", ttl=2 * 86400)
+_prewarm_tasks = set()
+
+
+def _seconds_until(hhmm: str) -> float:
+    hour, minute = (int(x) for x in hhmm.split(":"))
+    now = datetime.now()
+    run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    return (run_at - now).total_seconds()
+
+
+async def _prewarm_scheduler():
+    while True:
+        await asyncio.sleep(_seconds_until(PREWARM_AT))
+        # Spread workers out before claiming the run
+        await asyncio.sleep(random.uniform(0, 30))
+        run_date = date.today().isoformat()
+        # Atomic, so two workers waking up together cannot both claim the run
+        if not await asyncio.to_thread(_prewarm_runs.add, run_date, os.getpid()):
+            continue
+        try:
+            await asyncio.to_thread(prewarm)
+        except Exception as e:
+            print(f"[prewarm] failed: {e}")
+
+
+def start_prewarm_scheduler():
+    """Started from the app lifespan when PREWARM_AT is set"""
+    if PREWARM_AT:
+        _seconds_until(PREWARM_AT)  # fail fast on a malformed value
+        task = asyncio.create_task(_prewarm_scheduler())
+        _prewarm_tasks.add(task)
+        task.add_done_callback(_prewarm_tasks.discard)
 
 
 # ==================== UPLOAD SECTION ====================
@@ -872,6 +2796,7 @@ class UploadRequest(BaseModel):
     youtube_urls: List[str]  # YouTube video URLs
     headlines: List[str]  # Headlines from UI
     descriptions: List[str]  # Descriptions from UI
+    mode: str = "sync"  # "sync" or "batch" (Google Ads batch jobs, polled in background)
 
 def parse_youtube_url(url: str) -> Optional[str]:
     """Extract video ID from various YouTube URL formats"""
@@ -915,11 +2840,15 @@ def parse_youtube_url(url: str) -> Optional[str]:
 @app.get("/api/all_campaigns")
 async def get_all_campaigns(account_ids: str, user: dict[str, Any] = Depends(get_current_user)):
     """Get ALL campaigns for selected accounts (for upload section)"""
+    all_campaigns, errors = await asyncio.to_thread(fetch_all_campaigns, account_ids.split(','))
+    return {"campaigns": sorted(all_campaigns, key=lambda x: x['name']), "errors": errors}
+
+
+def fetch_all_campaigns(account_list: List[str]):
+    """Enabled campaigns of the accounts, and per-account errors"""
     client = get_client()
-    ga_service = client.get_service("GoogleAdsService")
-    
-    account_list = account_ids.split(',')
     all_campaigns = []
+    errors = []
     
     query = """
         SELECT
@@ -931,20 +2860,24 @@ async def get_all_campaigns(account_ids: str, user: dict[str, Any] = Depends(get
     """
     
     for account_id in account_list:
-        try:
-            response = ga_service.search(customer_id=account_id.strip(), query=query)
-            for row in response:
-                campaign_key = f"{account_id}_{row.campaign.id}"
-                all_campaigns.append({
-                    'id': campaign_key,
-                    'campaign_id': str(row.campaign.id),
-                    'account_id': account_id,
-                    'name': row.campaign.name
-                })
-        except:
-            continue
+        cache_key = ("all_campaigns", account_id)
+        account_campaigns = _catalog_cache.get(cache_key)
+        if account_campaigns is None:
+            try:
+                response = ads_search(client, account_id.strip(), query)
+            except (GoogleAdsException, grpc.RpcError) as ex:
+                errors.append({"account_id": account_id, "error": swallow_ads_error(ex)})
+                continue
+            account_campaigns = [{
+                'id': f"{account_id}_{row.campaign.id}",
+                'campaign_id': str(row.campaign.id),
+                'account_id': account_id,
+                'name': row.campaign.name
+            } for row in response]
+            _catalog_cache.set(cache_key, account_campaigns)
+        all_campaigns.extend(account_campaigns)
     
-    return {"campaigns": sorted(all_campaigns, key=lambda x: x['name'])}
+    return all_campaigns, errors
 
 
 
@@ -952,7 +2885,17 @@ async def get_all_campaigns(account_ids: str, user: dict[str, Any] = Depends(get
 async def create_test_adgroup(request: UploadRequest, user: dict[str, Any] = Depends(get_current_user)):
     """Create test ad groups with YouTube videos in selected campaigns"""
     client = get_client()
+    with timed("plan"):
+        plans = _prepare_upload_plans(request)
+    if request.mode == "batch":
+        return await submit_upload_batch(client, plans, user)
+    results = await run_upload_plans(client, plans)
     
+    return {"results": results}
+
+
+def _prepare_upload_plans(request: UploadRequest) -> List[dict]:
+    """Validate the upload request and compile it into per-account plans"""
     # Parse YouTube URLs
     video_ids = []
     for url in request.youtube_urls:
@@ -972,228 +2915,682 @@ async def create_test_adgroup(request: UploadRequest, user: dict[str, Any] = Dep
     if not descriptions:
         raise HTTPException(status_code=400, detail="At least one description is required")
     
-    results = []
+    return compile_upload_plan(request.campaign_ids, request.adgroup_name, video_ids, headlines, descriptions)
+
+
+# Accounts uploaded in parallel; work within an account stays sequential
+UPLOAD_CONCURRENCY = max(1, int(os.getenv("UPLOAD_CONCURRENCY", "4")))
+
+
+async def _run_per_account(fn, client, plans: List[dict], concurrency: int = UPLOAD_CONCURRENCY, on_done=None) -> list:
+    """Run fn(client, plan) for every plan in worker threads (bounded).
+
+    Outputs are returned in plan order; exceptions are returned, not raised.
+    on_done(plan, output) is called in a worker thread as each plan finishes.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
     
-    # Group campaigns by account
-    campaigns_by_account = {}
-    for cid in request.campaign_ids:
-        parts = cid.split('_', 1)
-        if len(parts) == 2:
-            account_id, campaign_id = parts
-            if account_id not in campaigns_by_account:
-                campaigns_by_account[account_id] = []
-            campaigns_by_account[account_id].append(campaign_id)
-    
-    for account_id, campaign_ids in campaigns_by_account.items():
-        for campaign_id in campaign_ids:
+    async def run(plan):
+        async with semaphore:
             try:
-                result = create_adgroup_with_videos(
-                    client=client,
-                    customer_id=account_id,
-                    campaign_id=campaign_id,
-                    adgroup_name=request.adgroup_name,
-                    video_ids=video_ids,
-                    headlines=headlines,
-                    descriptions=descriptions
-                )
-                results.append(result)
+                out = await asyncio.to_thread(fn, client, plan)
             except Exception as e:
-                results.append({
-                    "account_id": account_id,
-                    "campaign_id": campaign_id,
-                    "success": False,
-                    "error": str(e)
-                })
+                out = e
+            if on_done:
+                await asyncio.to_thread(on_done, plan, out)
+            return out
     
-    return {"results": results}
+    return await asyncio.gather(*(run(plan) for plan in plans))
 
 
-def create_adgroup_with_videos(client, customer_id, campaign_id, adgroup_name, video_ids, headlines, descriptions):
-    """Create ad group with YouTube video assets for App Campaign"""
-    
-    logs = []
-    logs.append(f"Starting creation for account {customer_id}, campaign {campaign_id}")
-    
-    # Services
-    ad_group_service = client.get_service("AdGroupService")
-    asset_service = client.get_service("AssetService")
-    ad_group_ad_service = client.get_service("AdGroupAdService")
-    
-    # 1. Create Ad Group (PAUSED)
-    ad_group_operation = client.get_type("AdGroupOperation")
-    ad_group = ad_group_operation.create
-    ad_group.name = adgroup_name
-    ad_group.campaign = f"customers/{customer_id}/campaigns/{campaign_id}"
-    ad_group.status = client.enums.AdGroupStatusEnum.PAUSED
-    
-    logs.append(f"Creating ad group '{adgroup_name}'...")
-    
-    ad_group_resource = None
-    try:
-        ad_group_response = ad_group_service.mutate_ad_groups(
-            customer_id=customer_id,
-            operations=[ad_group_operation]
-        )
-        ad_group_resource = ad_group_response.results[0].resource_name
-        logs.append(f"Ad group created: {ad_group_resource}")
-    except GoogleAdsException as ex:
-        error_details = []
-        for error in ex.failure.errors:
-            error_details.append(f"{error.error_code}: {error.message}")
-        error_msg = "; ".join(error_details)
-        logs.append(f"Failed to create ad group: {error_msg}")
-        return {
-            "account_id": customer_id,
-            "campaign_id": campaign_id,
-            "success": False,
-            "error": f"Failed to create ad group: {error_msg}",
-            "logs": logs
-        }
-    
-    # 2. Create YouTube Video Assets
-    logs.append(f"Creating {len(video_ids)} video assets...")
-    created_video_assets = []
-    
-    for video_id in video_ids:
-        asset_operation = client.get_type("AssetOperation")
-        asset = asset_operation.create
-        asset.youtube_video_asset.youtube_video_id = video_id
-        # Don't set asset.name - Google Ads will auto-fetch title from YouTube
+async def run_upload_plans(client, plans: List[dict], concurrency: int = UPLOAD_CONCURRENCY, progress: Optional["JobProgress"] = None) -> List[dict]:
+    """Execute account plans concurrently, returning per-campaign results in plan order"""
+    on_done = None
+    if progress:
+        await asyncio.to_thread(progress.set, accounts_total=len(plans), campaigns_total=sum(len(p["campaign_ids"]) for p in plans))
         
-        try:
-            asset_response = asset_service.mutate_assets(
-                customer_id=customer_id,
-                operations=[asset_operation]
-            )
-            created_video_assets.append(asset_response.results[0].resource_name)
-            logs.append(f"Created video asset: {video_id}")
-        except GoogleAdsException as ex:
-            # Asset might already exist, try to find it
-            logs.append(f"Video {video_id}: {ex.failure.errors[0].message}")
-            # Try to get existing asset
-            try:
-                ga_service = client.get_service("GoogleAdsService")
-                query = f"""
-                    SELECT asset.resource_name 
-                    FROM asset 
-                    WHERE asset.youtube_video_asset.youtube_video_id = '{video_id}'
-                """
-                response = ga_service.search(customer_id=customer_id, query=query)
-                for row in response:
-                    created_video_assets.append(row.asset.resource_name)
-                    logs.append(f"Found existing asset for {video_id}")
-                    break
-            except:
-                logs.append(f"Could not find existing asset for {video_id}")
+        def on_done(plan, out):
+            created = 0 if isinstance(out, Exception) else sum(1 for r in out if r["success"])
+            progress.add(accounts_done=1, campaigns_created=created)
     
-    logs.append(f"Total video assets: {len(created_video_assets)}")
-    
-    # 3. Create Text Assets (Headlines and Descriptions)
-    logs.append(f"Creating text assets...")
-    headline_assets = []
-    description_assets = []
+    per_plan = await _run_per_account(execute_upload_plan, client, plans, concurrency, on_done)
+    results = []
+    for plan, out in zip(plans, per_plan):
+        results.extend(_failed_plan_results(plan, str(out)) if isinstance(out, Exception) else out)
+    return results
+
+
+# Max operations per GoogleAdsService.mutate call (API limit is 10,000).
+# Must stay even so an ad group and its ad never land in different calls.
+MAX_MUTATE_OPERATIONS = 1000
+
+
+def compile_upload_plan(campaign_ids: List[str], adgroup_name: str, video_ids: List[str], headlines: List[str], descriptions: List[str]) -> List[dict]:
+    """Compile an upload request into one plan per account.
+
+    Campaign IDs ("accountId_campaignId") are grouped by account and video IDs
+    are deduplicated, so every video asset is resolved once per account and all
+    ad groups and ads of an account are created in batched mutate calls.
+    """
+    unique_videos = list(dict.fromkeys(video_ids))
+    plans = {}
+    for cid in campaign_ids:
+        parts = cid.split('_', 1)
+        if len(parts) != 2:
+            continue
+        account_id, campaign_id = parts
+        if account_id not in plans:
+            plans[account_id] = {
+                "customer_id": account_id,
+                "campaign_ids": [],
+                "adgroup_name": adgroup_name,
+                "video_ids": unique_videos,
+                "headlines": headlines,
+                "descriptions": descriptions,
+            }
+        if campaign_id not in plans[account_id]["campaign_ids"]:
+            plans[account_id]["campaign_ids"].append(campaign_id)
+    return list(plans.values())
+
+
+def _failed_plan_results(plan: dict, error: str) -> List[dict]:
+    return [{
+        "account_id": plan["customer_id"],
+        "campaign_id": campaign_id,
+        "success": False,
+        "error": error
+    } for campaign_id in plan["campaign_ids"]]
+
+
+def _partial_failure_errors(client, response) -> dict:
+    """Map operation index -> error messages from a partial-failure response"""
+    errors = {}
+    status = response.partial_failure_error
+    if not status or not status.details:
+        return errors
+    failure_type = type(client.get_type("GoogleAdsFailure"))
+    for detail in status.details:
+        failure = failure_type.deserialize(detail.value)
+        for error in failure.errors:
+            elements = error.location.field_path_elements
+            index = elements[0].index if elements else -1
+            errors.setdefault(index, []).append(error.message)
+    return errors
+
+
+# Per-account index of YouTube video ID -> asset resource name, shared between uploads
+_video_asset_index = shared_cache("video_assets", ttl=float(os.getenv("VIDEO_ASSET_CACHE_TTL", "86400")), max_entries=512)
+
+
+def _lookup_video_assets(client, customer_id: str, video_ids: List[str]) -> dict:
+    """Find existing YouTube video assets with a single IN-list query"""
+    id_list = ", ".join(f"'{v}'" for v in video_ids)
+    query = f"""
+        SELECT asset.resource_name, asset.youtube_video_asset.youtube_video_id
+        FROM asset
+        WHERE asset.type = 'YOUTUBE_VIDEO'
+          AND asset.youtube_video_asset.youtube_video_id IN ({id_list})
+    """
+    found = {}
+    for row in ads_search(client, customer_id, query):
+        found.setdefault(row.asset.youtube_video_asset.youtube_video_id, row.asset.resource_name)
+    return found
+
+
+def _known_video_assets(client, customer_id: str, video_ids: List[str], logs: List[str]) -> dict:
+    """Return the account's video ID -> asset index, with unknown video IDs looked up"""
+    index = dict(_video_asset_index.get(customer_id) or {})
     
-    for headline in headlines:
-        asset_operation = client.get_type("AssetOperation")
-        asset = asset_operation.create
-        asset.text_asset.text = headline
-        asset.name = f"Headline_{headline[:20]}"
-        
+    unknown = [v for v in video_ids if v not in index]
+    if unknown:
         try:
-            asset_response = asset_service.mutate_assets(
-                customer_id=customer_id,
-                operations=[asset_operation]
-            )
-            headline_assets.append(asset_response.results[0].resource_name)
-        except GoogleAdsException as ex:
-            logs.append(f"Headline '{headline[:20]}...': {ex.failure.errors[0].message}")
-    
-    for description in descriptions:
-        asset_operation = client.get_type("AssetOperation")
-        asset = asset_operation.create
-        asset.text_asset.text = description
-        asset.name = f"Desc_{description[:20]}"
+            index.update(_lookup_video_assets(client, customer_id, unknown))
+        except (GoogleAdsException, grpc.RpcError) as ex:
+            logs.append(f"Could not look up existing assets: {swallow_ads_error(ex)}")
+    for video_id in video_ids:
+        if video_id in index and video_id not in unknown:
+            logs.append(f"Found cached asset for {video_id}")
+        elif video_id in index:
+            logs.append(f"Found existing asset for {video_id}")
+    _video_asset_index.set(customer_id, index)
+    return index
+
+
+def _resolve_video_assets(client, customer_id: str, video_ids: List[str], logs: List[str]) -> dict:
+    """Return video_id -> asset resource name for the account.
+
+    Known videos come from the cached per-account index, unknown ones are
+    looked up in one query, and only videos that don't exist yet are created.
+    """
+    index = _known_video_assets(client, customer_id, video_ids, logs)
+    
+    to_create = [v for v in video_ids if v not in index]
+    if to_create:
+        asset_service = client.get_service("AssetService")
+        request = client.get_type("MutateAssetsRequest")
+        request.customer_id = customer_id
+        request.partial_failure = True
+        for video_id in to_create:
+            asset_operation = client.get_type("AssetOperation")
+            # Don't set asset.name - Google Ads will auto-fetch title from YouTube
+            asset_operation.create.youtube_video_asset.youtube_video_id = video_id
+            request.operations.append(asset_operation)
         
-        try:
-            asset_response = asset_service.mutate_assets(
-                customer_id=customer_id,
-                operations=[asset_operation]
-            )
-            description_assets.append(asset_response.results[0].resource_name)
-        except GoogleAdsException as ex:
-            logs.append(f"Description '{description[:20]}...': {ex.failure.errors[0].message}")
+        response = ads_mutate(customer_id, asset_service.mutate_assets, request=request)
+        errors = _partial_failure_errors(client, response)
+        for i, video_id in enumerate(to_create):
+            resource_name = response.results[i].resource_name if i < len(response.results) else ""
+            if resource_name and i not in errors:
+                index[video_id] = resource_name
+                logs.append(f"Created video asset: {video_id}")
+            else:
+                logs.append(f"Video {video_id}: {'; '.join(errors.get(i, ['not created']))}")
     
-    logs.append(f"Created {len(headline_assets)} headlines, {len(description_assets)} descriptions")
+    _video_asset_index.set(customer_id, index)
+    return {v: index[v] for v in video_ids if v in index}
+
+
+def _build_app_ad_operations(client, customer_id: str, campaign_id: str, temp_id: int, plan: dict, video_assets: List[str]) -> list:
+    """Ad group + App Ad create operations linked through a temporary resource name"""
+    ad_group_resource = f"customers/{customer_id}/adGroups/{temp_id}"
     
-    # 4. Create App Ad with text and videos
-    logs.append("Creating App Ad...")
+    # Ad Group (PAUSED)
+    ad_group_operation = client.get_type("MutateOperation")
+    ad_group = ad_group_operation.ad_group_operation.create
+    ad_group.resource_name = ad_group_resource
+    ad_group.name = plan["adgroup_name"]
+    ad_group.campaign = f"customers/{customer_id}/campaigns/{campaign_id}"
+    ad_group.status = client.enums.AdGroupStatusEnum.PAUSED
     
-    ad_group_ad_operation = client.get_type("AdGroupAdOperation")
-    ad_group_ad = ad_group_ad_operation.create
+    ad_group_ad_operation = client.get_type("MutateOperation")
+    ad_group_ad = ad_group_ad_operation.ad_group_ad_operation.create
     ad_group_ad.ad_group = ad_group_resource
     # For App ads, ad cannot be created in PAUSED state. Use ENABLED.
     ad_group_ad.status = client.enums.AdGroupAdStatusEnum.ENABLED
+    app_ad = ad_group_ad.ad.app_ad
     
-    # Set up App Ad
-    ad = ad_group_ad.ad
-    app_ad = ad.app_ad
-    
-    # Add headlines (direct text, not asset references)
-    for headline_text in headlines[:5]:
+    # Headlines and descriptions are inline text, not asset references
+    for headline_text in plan["headlines"][:5]:
         headline_info = client.get_type("AdTextAsset")
         headline_info.text = headline_text
         app_ad.headlines.append(headline_info)
-    
-    # Add descriptions (direct text)
-    for desc_text in descriptions[:5]:
+    for desc_text in plan["descriptions"][:5]:
         desc_info = client.get_type("AdTextAsset")
         desc_info.text = desc_text
         app_ad.descriptions.append(desc_info)
-    
-    # Add videos (using video IDs directly)
-    for vid in video_ids:
+    for v_asset in video_assets:
         video_info = client.get_type("AdVideoAsset")
-        video_info.asset = f"customers/{customer_id}/assets/{vid}"  # Try with video_id
+        video_info.asset = v_asset
         app_ad.youtube_videos.append(video_info)
     
-    # Alternative: Add videos using created asset resources
-    if created_video_assets:
-        app_ad.youtube_videos.clear()  # Clear previous attempt
-        for v_asset in created_video_assets:
-            video_info = client.get_type("AdVideoAsset")
-            video_info.asset = v_asset
-            app_ad.youtube_videos.append(video_info)
+    return [ad_group_operation, ad_group_ad_operation]
+
+
+def execute_upload_plan(client, plan: dict) -> List[dict]:
+    """Run an account plan: resolve video assets, then batched ad group/ad mutates.
+
+    Returns one result per campaign, in plan order.
+    """
+    customer_id = plan["customer_id"]
+    campaign_ids = plan["campaign_ids"]
+    logs = {cid: [f"Starting creation for account {customer_id}, campaign {cid}"] for cid in campaign_ids}
     
-    try:
-        ad_response = ad_group_ad_service.mutate_ad_group_ads(
-            customer_id=customer_id,
-            operations=[ad_group_ad_operation]
-        )
-        logs.append(f"Created App Ad: {ad_response.results[0].resource_name}")
-    except GoogleAdsException as ex:
-        error_details = []
-        for error in ex.failure.errors:
-            error_details.append(f"{error.message}")
-            if hasattr(error, 'details') and error.details:
-                error_details.append(f"  Details: {error.details}")
-        error_msg = "; ".join(error_details)
-        logs.append(f"App Ad error: {error_msg}")
+    # 1. YouTube video assets, shared by every campaign of the account
+    asset_logs = [f"Creating {len(plan['video_ids'])} video assets..."]
+    video_assets = _resolve_video_assets(client, customer_id, plan["video_ids"], asset_logs)
+    asset_resources = [video_assets[v] for v in plan["video_ids"] if v in video_assets]
+    asset_logs.append(f"Total video assets: {len(asset_resources)}")
+    if not asset_resources:
+        # Ad groups without videos would only be left behind empty, so none are created
+        failures = [line for line in asset_logs if line.startswith("Video ")] or ["none found"]
+        error = f"No video assets could be resolved or created: {'; '.join(failures)}"
+        return [{**result, "logs": logs[result["campaign_id"]] + asset_logs}
+                for result in _failed_plan_results(plan, error)]
+    
+    # 2. Ad groups and App Ads, two operations per campaign
+    operations = []
+    for i, campaign_id in enumerate(campaign_ids):
+        logs[campaign_id].extend(asset_logs)
+        logs[campaign_id].append(f"Creating ad group '{plan['adgroup_name']}' and App Ad...")
+        operations.extend(_build_app_ad_operations(client, customer_id, campaign_id, -(i + 1), plan, asset_resources))
+    
+    ga_service = client.get_service("GoogleAdsService")
+    responses = []
+    errors = {}
+    unapplied_error = None
+    for start in range(0, len(operations), MAX_MUTATE_OPERATIONS):
+        request = client.get_type("MutateGoogleAdsRequest")
+        request.customer_id = customer_id
+        request.partial_failure = True
+        request.mutate_operations.extend(operations[start:start + MAX_MUTATE_OPERATIONS])
+        try:
+            response = ads_mutate(customer_id, ga_service.mutate, request=request)
+        except Exception as ex:
+            # Earlier chunks are committed: only this chunk's and later campaigns are failed
+            unapplied_error = swallow_ads_error(ex) if isinstance(ex, (GoogleAdsException, grpc.RpcError)) else str(ex)
+            break
+        for index, messages in _partial_failure_errors(client, response).items():
+            errors[start + index] = messages
+        responses.extend(response.mutate_operation_responses)
+    
+    results = []
+    for i, campaign_id in enumerate(campaign_ids):
+        ad_group_index, ad_index = 2 * i, 2 * i + 1
+        campaign_logs = logs[campaign_id]
+        ad_group_resource = responses[ad_group_index].ad_group_result.resource_name if ad_group_index < len(responses) else ""
+        if ad_group_index in errors or not ad_group_resource:
+            if ad_group_index >= len(responses) and unapplied_error:
+                errors[ad_group_index] = [unapplied_error]
+            error_msg = "; ".join(errors.get(ad_group_index, ["no result returned"]))
+            campaign_logs.append(f"Failed to create ad group: {error_msg}")
+            results.append({
+                "account_id": customer_id,
+                "campaign_id": campaign_id,
+                "success": False,
+                "error": f"Failed to create ad group: {error_msg}",
+                "logs": campaign_logs
+            })
+            continue
+        campaign_logs.append(f"Ad group created: {ad_group_resource}")
+        if ad_index in errors:
+            campaign_logs.append(f"App Ad error: {'; '.join(errors[ad_index])}")
+        else:
+            campaign_logs.append(f"Created App Ad: {responses[ad_index].ad_group_ad_result.resource_name}")
+        campaign_logs.append("Completed!")
+        results.append({
+            "account_id": customer_id,
+            "campaign_id": campaign_id,
+            "adgroup_name": plan["adgroup_name"],
+            "adgroup_resource": ad_group_resource,
+            "videos_count": len(plan["video_ids"]),
+            "assets_created": len(asset_resources),
+            "success": True,
+            "logs": campaign_logs
+        })
+    
+    return results
+
+
+# ==================== BATCH UPLOADS ====================
+
+# Max operations per AddBatchJobOperations call (API limit is 10,000)
+MAX_BATCH_JOB_OPERATIONS = 5000
+BATCH_POLL_INTERVAL = float(os.getenv("BATCH_POLL_INTERVAL", "10"))
+BATCH_MAX_WAIT = float(os.getenv("BATCH_MAX_WAIT", "7200"))
+# A running upload whose poller has not written for this long lost its worker and is failed on read
+BATCH_POLLER_TIMEOUT = float(os.getenv("BATCH_POLLER_TIMEOUT", str(max(300.0, 3 * BATCH_POLL_INTERVAL))))
+
+# upload_id -> batch upload record, kept for a day so results stay retrievable
+_batch_uploads = shared_cache("batch_uploads", ttl=86400, max_entries=256)
+_batch_tasks = set()
+
+
+def submit_upload_batch_job(client, plan: dict) -> dict:
+    """Submit an account plan as a Google Ads batch job.
+
+    Video assets that don't exist yet are created inside the job and referenced
+    through temporary resource names, followed by the ad group/ad pairs.
+    """
+    customer_id = plan["customer_id"]
+    logs = [f"Creating {len(plan['video_ids'])} video assets..."]
+    index = _known_video_assets(client, customer_id, plan["video_ids"], logs)
     
-    logs.append("Completed!")
+    operations = []
+    temp_id = 0
+    new_videos = []
+    video_resources = {}
+    for video_id in plan["video_ids"]:
+        if video_id in index:
+            video_resources[video_id] = index[video_id]
+            continue
+        temp_id -= 1
+        asset_operation = client.get_type("MutateOperation")
+        asset = asset_operation.asset_operation.create
+        asset.resource_name = f"customers/{customer_id}/assets/{temp_id}"
+        asset.youtube_video_asset.youtube_video_id = video_id
+        operations.append(asset_operation)
+        video_resources[video_id] = asset.resource_name
+        new_videos.append(video_id)
+    
+    asset_resources = [video_resources[v] for v in plan["video_ids"]]
+    first_campaign_operation = len(operations)
+    for campaign_id in plan["campaign_ids"]:
+        temp_id -= 1
+        operations.extend(_build_app_ad_operations(client, customer_id, campaign_id, temp_id, plan, asset_resources))
+    
+    batch_job_service = client.get_service("BatchJobService")
+    batch_job_operation = client.get_type("BatchJobOperation")
+    batch_job_operation.create = client.get_type("BatchJob")
+    batch_job = ads_mutate(
+        customer_id, batch_job_service.mutate_batch_job, customer_id=customer_id, operation=batch_job_operation
+    ).result.resource_name
+    
+    sequence_token = None
+    for start in range(0, len(operations), MAX_BATCH_JOB_OPERATIONS):
+        response = ads_mutate(
+            customer_id,
+            batch_job_service.add_batch_job_operations,
+            resource_name=batch_job,
+            sequence_token=sequence_token,
+            mutate_operations=operations[start:start + MAX_BATCH_JOB_OPERATIONS]
+        )
+        sequence_token = response.next_sequence_token
+    ads_mutate(customer_id, batch_job_service.run_batch_job, resource_name=batch_job)
+    logs.append(f"Submitted batch job {batch_job} with {len(operations)} operations")
     
     return {
-        "account_id": customer_id,
-        "campaign_id": campaign_id,
-        "adgroup_name": adgroup_name,
-        "adgroup_resource": ad_group_resource,
-        "videos_count": len(video_ids),
-        "assets_created": len(created_video_assets),
-        "success": True,
-        "logs": logs
+        "plan": plan,
+        "batch_job": batch_job,
+        "new_videos": new_videos,
+        "assets_count": len(asset_resources),
+        "first_campaign_operation": first_campaign_operation,
+        "logs": logs,
+    }
+
+
+def _batch_job_done(client, customer_id: str, batch_job: str) -> bool:
+    query = f"SELECT batch_job.status FROM batch_job WHERE batch_job.resource_name = '{batch_job}'"
+    for row in ads_search(client, customer_id, query):
+        return row.batch_job.status == client.enums.BatchJobStatusEnum.DONE
+    return False
+
+
+def collect_upload_batch_results(client, submission: dict) -> List[dict]:
+    """Map batch job operation results back to per-campaign upload results"""
+    plan = submission["plan"]
+    customer_id = plan["customer_id"]
+    by_index = {}
+    for result in ads_batch_job_results(client, customer_id, submission["batch_job"]):
+        by_index[result.operation_index] = result
+    
+    def error_of(index):
+        result = by_index.get(index)
+        if result is None:
+            return "no result returned"
+        return result.status.message if result.status.code else None
+    
+    # Newly created video assets go into the per-account index
+    logs = list(submission["logs"])
+    index = dict(_video_asset_index.get(customer_id) or {})
+    for i, video_id in enumerate(submission["new_videos"]):
+        error = error_of(i)
+        if error:
+            logs.append(f"Video {video_id}: {error}")
+        else:
+            index[video_id] = by_index[i].mutate_operation_response.asset_result.resource_name
+            logs.append(f"Created video asset: {video_id}")
+    _video_asset_index.set(customer_id, index)
+    logs.append(f"Total video assets: {submission['assets_count']}")
+    
+    results = []
+    for i, campaign_id in enumerate(plan["campaign_ids"]):
+        ad_group_index = submission["first_campaign_operation"] + 2 * i
+        ad_index = ad_group_index + 1
+        campaign_logs = [f"Starting creation for account {customer_id}, campaign {campaign_id}"] + logs
+        error = error_of(ad_group_index)
+        if error:
+            campaign_logs.append(f"Failed to create ad group: {error}")
+            results.append({
+                "account_id": customer_id,
+                "campaign_id": campaign_id,
+                "success": False,
+                "error": f"Failed to create ad group: {error}",
+                "logs": campaign_logs
+            })
+            continue
+        ad_group_resource = by_index[ad_group_index].mutate_operation_response.ad_group_result.resource_name
+        campaign_logs.append(f"Ad group created: {ad_group_resource}")
+        error = error_of(ad_index)
+        if error:
+            campaign_logs.append(f"App Ad error: {error}")
+        else:
+            campaign_logs.append(f"Created App Ad: {by_index[ad_index].mutate_operation_response.ad_group_ad_result.resource_name}")
+        campaign_logs.append("Completed!")
+        results.append({
+            "account_id": customer_id,
+            "campaign_id": campaign_id,
+            "adgroup_name": plan["adgroup_name"],
+            "adgroup_resource": ad_group_resource,
+            "videos_count": len(plan["video_ids"]),
+            "assets_created": submission["assets_count"],
+            "success": True,
+            "logs": campaign_logs
+        })
+    return results
+
+
+async def submit_upload_batch(client, plans: List[dict], user: dict) -> dict:
+    """Submit one batch job per account and poll them in the background"""
+    submissions = await _run_per_account(submit_upload_batch_job, client, plans)
+    upload_id = uuid.uuid4().hex
+    record = {
+        "upload_id": upload_id,
+        "owner": user.get("email"),
+        "status": "running",
+        "submitted_at": time.time(),
+        "polled_at": time.time(),
+        "plans": plans,
+        "results_by_plan": [
+            _failed_plan_results(plan, f"Failed to submit batch job: {sub}") if isinstance(sub, Exception) else None
+            for plan, sub in zip(plans, submissions)
+        ],
     }
+    await asyncio.to_thread(_batch_uploads.set, upload_id, record)
+    task = asyncio.create_task(_poll_upload_batch(client, record, submissions))
+    _batch_tasks.add(task)
+    task.add_done_callback(_batch_tasks.discard)
+    return {"upload_id": upload_id, "status": "running", "results": [], "max_wait": BATCH_MAX_WAIT}
+
+
+async def _poll_upload_batch(client, record: dict, submissions: list):
+    pending = [i for i, sub in enumerate(submissions) if not isinstance(sub, Exception)]
+    deadline = time.monotonic() + BATCH_MAX_WAIT
+    while pending:
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+        for i in list(pending):
+            sub = submissions[i]
+            try:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Batch job {sub['batch_job']} did not finish in {int(BATCH_MAX_WAIT)}s")
+                try:
+                    done = await asyncio.to_thread(_batch_job_done, client, sub["plan"]["customer_id"], sub["batch_job"])
+                except (GoogleAdsException, grpc.RpcError) as ex:
+                    # The job keeps running server-side; a failed status read is retried until the deadline
+                    print(f"Polling batch job {sub['batch_job']} failed, retrying: {swallow_ads_error(ex)}")
+                    continue
+                if not done:
+                    continue
+                record["results_by_plan"][i] = await asyncio.to_thread(collect_upload_batch_results, client, sub)
+            except Exception as e:
+                record["results_by_plan"][i] = _failed_plan_results(sub["plan"], str(e))
+            pending.remove(i)
+        # Also a heartbeat: readers fail the upload once it stops
+        record["polled_at"] = time.time()
+        await asyncio.to_thread(_batch_uploads.set, record["upload_id"], record)
+    record["status"] = "done"
+    await asyncio.to_thread(_batch_uploads.set, record["upload_id"], record)
+
+
+@app.get("/api/upload/batch/{upload_id}")
+async def get_upload_batch(upload_id: str, user: dict[str, Any] = Depends(get_current_user)):
+    """Status and per-campaign results of a batch-mode upload"""
+    record = await asyncio.to_thread(_batch_uploads.get, upload_id)
+    if record is None or record.get("owner") != user.get("email"):
+        raise HTTPException(status_code=404, detail="Unknown upload_id")
+    if record["status"] == "running" and time.time() - record["polled_at"] > BATCH_POLLER_TIMEOUT:
+        # The worker polling it is gone; the batch jobs may still complete in Google Ads
+        message = "Lost track of the batch job (the server polling it stopped); check the ad groups in Google Ads"
+        record["results_by_plan"] = [results or _failed_plan_results(plan, message)
+                                     for plan, results in zip(record["plans"], record["results_by_plan"])]
+        record["status"] = "done"
+        await asyncio.to_thread(_batch_uploads.set, upload_id, record)
+    results = [r for plan_results in record["results_by_plan"] if plan_results for r in plan_results]
+    return {"upload_id": upload_id, "status": record["status"], "results": results}
+
+
+# ==================== BACKGROUND JOBS ====================
+
+JOB_WORKERS = max(1, int(os.getenv("JOB_WORKERS", "2")))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+
+# job_id -> job record; results stay retrievable for JOB_RESULT_TTL seconds.
+# Records live in the shared cache so any worker process can serve status and events.
+_jobs = shared_cache("jobs", ttl=JOB_RESULT_TTL, max_entries=512)
+_job_slots = asyncio.Semaphore(JOB_WORKERS)
+_job_tasks = set()
+
+
+class JobProgress:
+    """Thread-safe progress counters of a job record, published to the job store"""
+
+    # Progress is written to the store at most this often; status changes always are
+    PUBLISH_INTERVAL = 0.5
+
+    def __init__(self, job: dict):
+        self.job = job
+        self._lock = threading.Lock()
+        self._published_at = 0.0
+
+    def _publish(self, force: bool = False):
+        now = time.monotonic()
+        if force or now - self._published_at >= self.PUBLISH_INTERVAL:
+            self._published_at = now
+            _jobs.set(self.job["job_id"], self.job)
+
+    def set(self, **values):
+        with self._lock:
+            self.job["progress"].update(values)
+            self.job["updated_at"] = time.time()
+            self._publish()
+
+    def add(self, **increments):
+        with self._lock:
+            progress = self.job["progress"]
+            for k, v in increments.items():
+                progress[k] = progress.get(k, 0) + v
+            self.job["updated_at"] = time.time()
+            self._publish()
+
+    def update(self, **fields):
+        """Change top-level job fields (status, result, error)"""
+        with self._lock:
+            self.job.update(fields)
+            self.job["updated_at"] = time.time()
+            self._publish(force=True)
+
+
+async def submit_job(kind: str, user: dict, run) -> dict:
+    """Queue run(progress) -> result on the bounded job pool; returns the job record"""
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "kind": kind,
+        "owner": user.get("email"),
+        "status": "queued",
+        "progress": {},
+        "result": None,
+        "error": None,
+        "created_at": time.time(),
+        "updated_at": time.time(),
+    }
+    await asyncio.to_thread(_jobs.set, job["job_id"], job)
+    progress = JobProgress(job)
+    
+    async def worker():
+        async with _job_slots:
+            # Store writes (a pickled, possibly large result with the sqlite backend) stay off the event loop
+            await asyncio.to_thread(progress.update, status="running")
+            # The task runs in its own context copy, so this doesn't touch the submitting request
+            timings = RequestTimings()
+            _request_timings.set(timings)
+            started = time.perf_counter()
+            try:
+                fields = {"result": await run(progress), "status": "done"}
+            except HTTPException as e:
+                fields = {"status": "failed", "error": e.detail}
+            except Exception as e:
+                fields = {"status": "failed", "error": str(e)}
+            # The final update also restarts the TTL from completion
+            await asyncio.to_thread(progress.update, timings=timings.summary(), **fields)
+            _log_slow("job", time.perf_counter() - started, timings, job_id=job["job_id"], job_kind=kind, status=job["status"])
+    
+    task = asyncio.create_task(worker())
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return job
+
+
+async def _get_job(job_id: str, user: dict) -> dict:
+    job = await asyncio.to_thread(_jobs.get, job_id)
+    if job is None or job["owner"] != user.get("email"):
+        raise HTTPException(status_code=404, detail="Unknown job_id")
+    return job
+
+
+def _job_status(job: dict, include_result: bool = True) -> dict:
+    status = {k: v for k, v in job.items() if k not in ("owner", "result")}
+    if include_result and job["status"] == "done":
+        status["result"] = job["result"]
+    return status
+
+
+@app.post("/api/jobs/report")
+async def submit_report_job(request: ReportRequest, user: dict[str, Any] = Depends(get_current_user)):
+    """Run /api/report in the background; poll or stream /api/jobs/{job_id}"""
+    async def run(progress):
+        return await asyncio.to_thread(build_report, request, progress)
+    job = await submit_job("report", user, run)
+    return {"job_id": job["job_id"], "status": job["status"]}
+
+
+@app.post("/api/jobs/upload")
+async def submit_upload_job(request: UploadRequest, user: dict[str, Any] = Depends(get_current_user)):
+    """Run /api/upload in the background; poll or stream /api/jobs/{job_id}"""
+    if request.mode == "batch":
+        raise HTTPException(status_code=400, detail="Batch mode runs through /api/upload")
+    plans = _prepare_upload_plans(request)
+    
+    async def run(progress):
+        return {"results": await run_upload_plans(get_client(), plans, progress=progress)}
+    job = await submit_job("upload", user, run)
+    return {"job_id": job["job_id"], "status": job["status"]}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, user: dict[str, Any] = Depends(get_current_user)):
+    """Job status, progress and (once done) result"""
+    return FastJSONResponse(_job_status(await _get_job(job_id, user)))
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, user: dict[str, Any] = Depends(get_current_user)):
+    """Server-Sent Events: 'progress' on every change, then 'done' or 'failed' with the final status"""
+    job = await _get_job(job_id, user)
+    
+    async def events():
+        nonlocal job
+        last_update = None
+        while True:
+            if job["status"] in ("done", "failed"):
+                yield f"event: {job['status']}\ndata: ".encode() + dumps_json(_job_status(job)) + b"\n\n"
+                return
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                yield b"event: progress\ndata: " + dumps_json(_job_status(job, include_result=False)) + b"\n\n"
+            await asyncio.sleep(0.5)
+            # The job may be running in another worker process
+            job = await asyncio.to_thread(_jobs.get, job_id) or job
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] == ["prewarm"]:
+        # Cron entry point: python app.py prewarm [DAYS]
+        if CACHE_BACKEND == "memory":
+            sys.exit("prewarm from the command line needs a shared CACHE_BACKEND (sqlite or redis)")
+        result = prewarm(int(sys.argv[2]) if len(sys.argv) > 2 else PREWARM_DAYS)
+        sys.exit(1 if result["errors"] else 0)
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
@@ -0,0 +1,326 @@
+"""
+Microbenchmarks for the data-shaping hot paths in app.py.
+
+Synthetic inputs are generated at the chosen scale; for every function the
+median throughput over --repeat runs and the peak traced memory of one extra
+run (tracemalloc) are reported.
+
+Results can be saved per commit and compared against an earlier run:
+
+    python benchmarks/bench_hotpaths.py --scale medium --save
+    python benchmarks/bench_hotpaths.py --scale medium --compare <sha>
+
+Scales:
+    small   10k rows,  1k creatives,  30 days
+    medium  100k rows, 10k creatives, 90 days
+    large   1M rows,   50k creatives, 365 days
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as ganalytics
+
+SCALES = {
+    "small": {"rows": 10_000, "creatives": 1_000, "days": 30},
+    "medium": {"rows": 100_000, "creatives": 10_000, "days": 90},
+    "large": {"rows": 1_000_000, "creatives": 50_000, "days": 365},
+}
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+# -------- synthetic data --------
+
+def make_days(n_days: int):
+    start = date(2024, 1, 1)
+    return [(start + timedelta(days=i)).isoformat() for i in range(n_days)]
+
+
+def make_creative_names(rng, n: int):
+    suffixes = ["9x16", "16x9", "1x1", "4x5", "9:16", ""]
+    names = []
+    for i in range(n):
+        base = f"UA_{rng.choice(['Spider', 'Cars', 'Gangs'])}_{i:05d}_{rng.choice(['gameplay', 'fail', 'ugc', 'cinematic'])}"
+        suffix = rng.choice(suffixes)
+        names.append(f"{base} {suffix}".strip() if rng.random() < 0.5 else f"{base}_{suffix}".strip("_"))
+    return names
+
+
+def make_asset_names(rng, scale):
+    names = make_creative_names(rng, scale["creatives"])
+    return [rng.choice(names) for _ in range(scale["rows"])]
+
+
+def make_applovin_names(rng, scale):
+    names = make_creative_names(rng, scale["creatives"])
+    return [f"{rng.getrandbits(128):032x}_{rng.choice(names)}" if rng.random() < 0.8 else rng.choice(names)
+            for _ in range(scale["rows"])]
+
+
+def make_adjust_rows(rng, scale):
+    """Flat Adjust pivot rows as returned by the reports service (readable names)"""
+    days = make_days(scale["days"])
+    creatives = make_applovin_names(rng, {"rows": scale["creatives"], "creatives": scale["creatives"]})
+    return [{
+        "Day": rng.choice(days),
+        "Creative (Network)": rng.choice(creatives),
+        "Campaign": f"UAC {rng.choice(['Android', 'iOS'])} {rng.randint(1, 50)}",
+        "Cost": f"{rng.random() * 500:.4f}",
+        "Installs": str(rng.randint(0, 200)),
+        "Network Impressions": str(rng.randint(0, 50_000)),
+    } for _ in range(scale["rows"])]
+
+
+def make_nested_adjust_rows(rng, scale):
+    """Date-keyed payload shape handled by _flatten_adjust_rows"""
+    flat = make_adjust_rows(rng, scale)
+    by_day = {}
+    for r in flat:
+        by_day.setdefault(r["Day"], []).append({k: v for k, v in r.items() if k != "Day"})
+    return [{day: {"rows": rows}} for day, rows in by_day.items()]
+
+
+def make_json_payload(rng, scale) -> bytes:
+    return json.dumps({"rows": make_adjust_rows(rng, scale)}).encode("utf-8")
+
+
+def make_csv_payload(rng, scale) -> bytes:
+    rows = make_adjust_rows(rng, scale)
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+
+def make_stacked_rows(rng, scale):
+    days = make_days(scale["days"])
+    creatives = make_creative_names(rng, scale["creatives"])
+    rows = [{
+        "day": rng.choice(days),
+        "creative": rng.choice(creatives),
+        "cost": rng.random() * 100,
+        "impressions": rng.randint(0, 10_000),
+        "installs": rng.randint(0, 100),
+    } for _ in range(scale["rows"])]
+    return days, rows
+
+
+def make_report_rows(rng, scale):
+    """Rows as produced by _fetch_report_rows, ready for aggregation"""
+    creatives = make_creative_names(rng, scale["creatives"])
+    return [{
+        "asset_name": rng.choice(creatives),
+        "asset_name_original": "",
+        "account": f"Account {rng.randint(1, 30)}",
+        "account_id": str(rng.randint(1_000_000, 1_000_030)),
+        "campaign": f"UAC Android {rng.randint(1, 300)}",
+        "ad_group": "Main",
+        "cost": rng.random() * 100,
+        "impressions": rng.randint(0, 10_000),
+        "installs": rng.random() * 20,
+    } for _ in range(scale["rows"])]
+
+
+def make_youtube_urls(rng, scale):
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-"
+    templates = [
+        "https://www.youtube.com/watch?v={}", "https://youtu.be/{}", "https://www.youtube.com/shorts/{}",
+        "https://www.youtube.com/embed/{}", "https://m.youtube.com/watch?feature=share&v={}", "{}",
+    ]
+    n = min(scale["rows"], 100_000)
+    return [rng.choice(templates).format("".join(rng.choice(alphabet) for _ in range(11))) for _ in range(n)]
+
+
+# -------- cases --------
+
+def report_request():
+    return ganalytics.ReportRequest(
+        account_ids=[], campaign_ids=[], adgroup_type="main", start_date="2024-01-01", end_date="2024-01-31",
+        group_by_account=True, group_by_campaign=True,
+    )
+
+
+def dashboard_chart(dates, rows):
+    """The dashboard path: rows interned into columns (names normalized once per request), then the chart"""
+    columns = ganalytics.ChartColumns(dates, ganalytics.Interner(ganalytics.normalize_asset_name))
+    for r in rows:
+        columns.add(r["day"], r["creative"], r["cost"], r["impressions"], r["installs"])
+    result = ganalytics.stacked_100_from_arrays(len(dates), *columns.stacked_arrays(), 10)
+    return ganalytics._stacked_100_chart(dates, columns.creatives.names, result, True)
+
+
+def build_cases(scale, rng):
+    """name -> (setup() -> input, fn(input), items per run)"""
+    adjust_keys = list(make_adjust_rows(rng, {"rows": 1, "creatives": 1, "days": 1})[0]) * 1000
+    return {
+        "normalize_asset_name": (
+            lambda: make_asset_names(rng, scale),
+            lambda names: [ganalytics.normalize_asset_name(n) for n in names],
+            scale["rows"],
+        ),
+        "normalize_applovin_creative": (
+            lambda: make_applovin_names(rng, scale),
+            lambda names: [ganalytics.normalize_applovin_creative(n) for n in names],
+            scale["rows"],
+        ),
+        "_norm_key": (
+            lambda: adjust_keys,
+            lambda keys: [ganalytics._norm_key(k) for k in keys],
+            len(adjust_keys),
+        ),
+        "_flatten_adjust_rows": (
+            lambda: make_nested_adjust_rows(rng, scale),
+            ganalytics._flatten_adjust_rows,
+            scale["rows"],
+        ),
+        "_parse_adjust_payload[json]": (
+            lambda: make_json_payload(rng, scale),
+            lambda body: ganalytics._parse_adjust_payload("application/json", body),
+            scale["rows"],
+        ),
+        "_parse_adjust_payload[csv]": (
+            lambda: make_csv_payload(rng, scale),
+            lambda body: ganalytics._parse_adjust_payload("text/csv", body),
+            scale["rows"],
+        ),
+        "_build_stacked_100": (
+            lambda: make_stacked_rows(rng, scale),
+            lambda data: ganalytics._build_stacked_100(data[0], data[1], "creative", "day", "cost", top_n=10, include_cvr=True),
+            scale["rows"],
+        ),
+        "dashboard_chart_columns": (
+            lambda: make_stacked_rows(rng, scale),
+            lambda data: dashboard_chart(*data),
+            scale["rows"],
+        ),
+        "report_aggregation": (
+            lambda: (report_request(), make_report_rows(rng, scale)),
+            lambda data: ganalytics._aggregate_report_rows(data[0], data[1], []),
+            scale["rows"],
+        ),
+        "parse_youtube_url": (
+            lambda: make_youtube_urls(rng, scale),
+            lambda urls: [ganalytics.parse_youtube_url(u) for u in urls],
+            min(scale["rows"], 100_000),
+        ),
+    }
+
+
+def run_case(setup, fn, items: int, repeat: int) -> dict:
+    data = setup()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(data)
+        samples.append(time.perf_counter() - t0)
+    # Separate run: tracemalloc slows execution down, so it must not affect the timings
+    tracemalloc.start()
+    fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    seconds = statistics.median(samples)
+    return {
+        "items": items,
+        "median_ms": round(seconds * 1000, 3),
+        "items_per_sec": round(items / seconds, 1) if seconds else None,
+        "peak_mb": round(peak / 1e6, 2),
+    }
+
+
+# -------- results --------
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def print_results(results: dict, baseline: dict = None):
+    header = f"{'function':<30} {'items':>10} {'median ms':>11} {'items/s':>14} {'peak MB':>9}"
+    if baseline:
+        header += f" {'vs base':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = f"{name:<30} {r['items']:>10,} {r['median_ms']:>11.2f} {r['items_per_sec']:>14,.0f} {r['peak_mb']:>9.2f}"
+        base = (baseline or {}).get(name)
+        if base:
+            # >1.00x means faster than the baseline
+            line += f" {base['median_ms'] / r['median_ms']:>8.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--rows", type=int, help="Override the row count of the scale")
+    parser.add_argument("--creatives", type=int, help="Override the distinct creative count of the scale")
+    parser.add_argument("--days", type=int, help="Override the day count of the scale")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="Comma-separated function names to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", nargs="?", const="", metavar="PATH",
+                        help="Save results as JSON (default benchmarks/results/<commit>-<scale>.json)")
+    parser.add_argument("--compare", metavar="PATH|SHA",
+                        help="Saved results to compare against, as a file or a commit saved at the same scale")
+    args = parser.parse_args()
+
+    scale = dict(SCALES[args.scale])
+    for key in ("rows", "creatives", "days"):
+        if getattr(args, key):
+            scale[key] = getattr(args, key)
+
+    cases = build_cases(scale, random.Random(args.seed))
+    if args.only:
+        wanted = set(args.only.split(","))
+        cases = {k: v for k, v in cases.items() if k in wanted}
+
+    print(f"scale: {args.scale} {scale}, repeat: {args.repeat}, commit: {git_revision()}\n")
+    results = {}
+    for name, (setup, fn, items) in cases.items():
+        results[name] = run_case(setup, fn, items, args.repeat)
+
+    baseline = None
+    if args.compare:
+        path = args.compare
+        if not os.path.exists(path):
+            path = os.path.join(RESULTS_DIR, f"{args.compare}-{args.scale}.json")
+        with open(path, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+
+    if args.save is not None:
+        path = args.save or os.path.join(RESULTS_DIR, f"{git_revision()}-{args.scale}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": git_revision(),
+                "scale": args.scale,
+                "params": scale,
+                "repeat": args.repeat,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            }, f, indent=2)
+        print(f"\nSaved: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark JSON encoding and compression of representative API responses.
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps) with the
+orjson-based FastJSONResponse, and reports bytes on the wire for identity,
+gzip and brotli encodings.
+
+Usage:
+    python benchmarks/bench_responses.py [--report-rows 20000] [--days 365] [--top-n 10]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+
+import app as ganalytics
+
+
+def make_report_payload(n_rows: int, columnar: bool = False) -> dict:
+    rng = random.Random(42)
+    rows = []
+    for i in range(n_rows):
+        rows.append({
+            'asset_name': f"Creative_{rng.randint(0, n_rows // 4)}_{'x' * rng.randint(5, 25)}",
+            'account': f"Account {rng.randint(0, 30)}",
+            'campaign': f"UAC Android Campaign {rng.randint(0, 300)}",
+            'cost': round(rng.random() * 5000, 2),
+            'impressions': rng.randint(0, 2_000_000),
+            'installs': rng.randint(0, 20_000),
+        })
+    data = rows
+    if columnar:
+        data = ganalytics._encode_columnar(
+            rows,
+            ['asset_name', 'account', 'campaign', 'cost', 'impressions', 'installs'],
+            string_columns=('asset_name', 'account', 'campaign'),
+        )
+    return {"data": data, "totals": {"cost": 0, "impressions": 0, "installs": 0}, "count": n_rows}
+
+
+def make_dashboard_payload(days: int, top_n: int, columnar: bool = False) -> dict:
+    rng = np.random.default_rng(42)
+    dates = [f"2024-{1 + d // 31 % 12:02d}-{1 + d % 28:02d}" for d in range(days)]
+
+    def chart():
+        cost = rng.random((top_n, days)) * 1000
+        pct = cost / cost.sum(axis=0) * 100
+        c = {
+            "dates": dates,
+            "series": [
+                {"name": f"Creative {i}", "dataPct": pct[i], "dataCost": cost[i], "cvr": round(float(rng.random()), 3)}
+                for i in range(top_n)
+            ],
+        }
+        return ganalytics._columnar_chart(c) if columnar else c
+
+    return {
+        "google": chart(),
+        "applovin": chart(),
+        "mintegral": chart(),
+        "cvr": {"dates": dates, "google": rng.random(days), "applovin": rng.random(days), "mintegral": rng.random(days)},
+    }
+
+
+def stdlib_encode(payload: dict) -> bytes:
+    # What FastAPI does for a plain dict return value
+    return json.dumps(jsonable_encoder(_to_lists(payload)), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _to_lists(obj):
+    # jsonable_encoder cannot handle ndarrays, so the old code converted them by hand
+    if isinstance(obj, dict):
+        return {k: _to_lists(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_to_lists(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return [float(x) for x in obj]
+    return obj
+
+
+def timeit(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def bench(name: str, payload: dict, repeat: int):
+    print(f"\n{name}")
+    print("-" * 78)
+    print(f"{'encoder':<22} {'encode ms':>10} {'identity':>12} {'gzip':>12} {'brotli':>12}")
+    for enc_name, enc in (("json (FastAPI default)", stdlib_encode), ("FastJSONResponse", ganalytics.dumps_json)):
+        ms = timeit(lambda: enc(payload), repeat)
+        body = enc(payload)
+        gz = len(gzip.compress(body, compresslevel=6))
+        br = len(ganalytics.brotli.compress(body, quality=4)) if ganalytics.brotli else None
+        print(f"{enc_name:<22} {ms:>10.2f} {len(body):>12,} {gz:>12,} {br if br is not None else 'n/a':>12,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--report-rows", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if ganalytics.orjson else 'no'}, brotli: {'yes' if ganalytics.brotli else 'no'}")
+    bench(f"/api/report rows ({args.report_rows:,} rows)", make_report_payload(args.report_rows), args.repeat)
+    bench(f"/api/report columnar ({args.report_rows:,} rows)", make_report_payload(args.report_rows, columnar=True), args.repeat)
+    bench(f"/api/dashboard rows ({args.days} days, top {args.top_n})", make_dashboard_payload(args.days, args.top_n), args.repeat)
+    bench(f"/api/dashboard columnar ({args.days} days, top {args.top_n})", make_dashboard_payload(args.days, args.top_n, columnar=True), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Build the static asset bundle served from /static/dist.
+
+app.js and style.css are copied under content-hashed names (app.<hash>.js), the
+references in index.html are rewritten to them, and every output gets .br and .gz
+siblings compressed at maximum level, so the server never compresses static files
+per request. Hashed files are served with an immutable Cache-Control; index.html
+is revalidated, so a deploy is picked up on the next page load.
+
+Usage:
+    python build_static.py [--static-dir static]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSETS = ("app.js", "style.css")
+HASH_LENGTH = 12
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def write_compressed(path: str, data: bytes):
+    """Write path with .gz and .br siblings; gzip mtime is fixed so builds are reproducible"""
+    with open(path, "wb") as f:
+        f.write(data)
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+
+
+def build(static_dir: str) -> dict:
+    dist = os.path.join(static_dir, "dist")
+    shutil.rmtree(dist, ignore_errors=True)
+    os.makedirs(dist)
+
+    manifest = {}
+    for name in ASSETS:
+        with open(os.path.join(static_dir, name), "rb") as f:
+            data = f.read()
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{fingerprint(data)}{ext}"
+        write_compressed(os.path.join(dist, hashed), data)
+        manifest[name] = hashed
+
+    with open(os.path.join(static_dir, "index.html"), encoding="utf-8") as f:
+        html = f.read()
+    for name, hashed in manifest.items():
+        reference = f'"/static/{name}"'
+        if reference not in html:
+            raise SystemExit(f"index.html does not reference {reference}")
+        html = html.replace(reference, f'"/static/dist/{hashed}"')
+    write_compressed(os.path.join(dist, "index.html"), html.encode("utf-8"))
+
+    with open(os.path.join(dist, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--static-dir", default="static")
+    args = parser.parse_args()
+
+    manifest = build(args.static_dir)
+    for name, hashed in manifest.items():
+        print(f"{name} -> dist/{hashed}")
+    if brotli is None:
+        print("brotli is not installed; only .gz variants were written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Dashboard chart math on compact columns.
+
+Kept apart from app.py and free of import side effects: the CPU pool's worker
+processes import only this module (and numpy), not the whole app with its
+clients, caches and middleware.
+"""
+
+import os
+import threading
+from array import array
+from typing import List, Optional
+
+import numpy as np
+
+
+class Interner:
+    """Integer codes for strings; with normalize, codes are per normalized name and each raw string is normalized once.
+
+    Codes are only meaningful within one Interner, so they never go into caches or responses.
+    """
+
+    def __init__(self, normalize=None):
+        self.names: List[str] = []
+        self._codes = {}
+        self._raw_codes = {}
+        self._normalize = normalize
+        self._lock = threading.Lock()
+
+    def code(self, raw: str) -> int:
+        code = self._raw_codes.get(raw)
+        if code is None:
+            name = self._normalize(raw) if self._normalize else raw
+            with self._lock:
+                code = self._codes.setdefault(name, len(self.names))
+                if code == len(self.names):
+                    self.names.append(name)
+                self._raw_codes[raw] = code
+        return code
+
+
+def to_number(value) -> float:
+    """Like pd.to_numeric(errors="coerce").fillna(0) for one value"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return number if number == number else 0.0
+
+
+class ChartColumns:
+    """Chart input as typed columns: day index, creative code, cost, impressions and installs.
+
+    Rows are grouped by creative code; names are decoded only when the chart is built.
+    Days outside dates (after bucketing) get index -1: they count towards the top-N ranking and CVR, not the series.
+    """
+
+    def __init__(self, dates: List[str], creatives: Interner, bucket_of: Optional[dict] = None):
+        self.dates = dates
+        self.creatives = creatives
+        date_pos = {d: i for i, d in enumerate(dates)}
+        self._day_pos = {**date_pos, **{day: date_pos.get(bucket, -1) for day, bucket in (bucket_of or {}).items()}}
+        self.date_idx = array("i")
+        self.codes = array("i")
+        self.cost = array("d")
+        self.impressions = array("d")
+        self.installs = array("d")
+
+    @classmethod
+    def from_rows(cls, dates: List[str], rows: List[dict], key_field: str, date_field: str, value_field: str) -> "ChartColumns":
+        columns = cls(dates, Interner())
+        for r in rows:
+            key = r.get(key_field)
+            columns.add(str(r.get(date_field)), "" if key is None else str(key), to_number(r.get(value_field)),
+                        to_number(r.get("impressions")), to_number(r.get("installs")))
+        return columns
+
+    def add(self, day: str, creative: str, cost: float, impressions: float, installs: float):
+        self.date_idx.append(self._day_pos.get(day, -1))
+        self.codes.append(self.creatives.code(creative))
+        self.cost.append(cost)
+        self.impressions.append(impressions)
+        self.installs.append(installs)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def stacked_arrays(self) -> tuple:
+        """Arguments for stacked_100_from_arrays: rows with a positive cost and a non-empty creative name,
+        and each code's rank by name"""
+        names = self.creatives.names
+        codes = np.array(self.codes, dtype=np.int32)
+        cost = np.array(self.cost, dtype=float)
+        named = np.array([bool(name) for name in names], dtype=bool)
+        keep = (cost > 0) & named[codes] if len(codes) else np.zeros(0, dtype=bool)
+        name_rank = np.empty(len(names), dtype=np.int32)
+        name_rank[sorted(range(len(names)), key=names.__getitem__)] = np.arange(len(names), dtype=np.int32)
+        return (np.array(self.date_idx, dtype=np.int32)[keep], codes[keep], cost[keep],
+                np.array(self.impressions, dtype=float)[keep], np.array(self.installs, dtype=float)[keep], name_rank)
+
+    def cvr_arrays(self) -> tuple:
+        """Arguments for cvr_by_day_from_arrays: every row"""
+        return (np.array(self.date_idx, dtype=np.int32), np.array(self.impressions, dtype=float),
+                np.array(self.installs, dtype=float))
+
+
+def stacked_100_from_arrays(n_dates: int, date_idx: np.ndarray, key_codes: np.ndarray, values: np.ndarray,
+                            impressions: np.ndarray, installs: np.ndarray, name_rank: np.ndarray, top_n: int):
+    """Top-N key codes by total value, their daily values and share of each day (%), and their impressions/installs.
+
+    Keys with equal totals are ordered by name (name_rank), so the top-N cut is deterministic.
+    Pure numpy on compact arrays, so it can run in the CPU pool.
+    """
+    totals = np.bincount(key_codes, weights=values)
+    top = np.lexsort((name_rank[:len(totals)], -totals))[:max(top_n, 0)]
+    top = top[totals[top] > 0]
+    rank = np.full(len(totals), -1, dtype=np.int64)
+    rank[top] = np.arange(len(top))
+    row_rank = rank[key_codes]
+    in_top = row_rank >= 0
+    on_day = in_top & (date_idx >= 0)
+    cost = np.bincount(date_idx[on_day] * len(top) + row_rank[on_day], weights=values[on_day],
+                       minlength=n_dates * len(top)).astype(float).reshape(n_dates, len(top))
+    daily_total = cost.sum(axis=1, keepdims=True)
+    pct = np.divide(cost, daily_total, out=np.zeros_like(cost), where=daily_total > 0) * 100.0
+    top_impressions = np.bincount(row_rank[in_top], weights=impressions[in_top], minlength=len(top))
+    top_installs = np.bincount(row_rank[in_top], weights=installs[in_top], minlength=len(top))
+    return top, pct.T, cost.T, top_impressions, top_installs
+
+
+def cvr_by_day_from_arrays(n_dates: int, date_idx: np.ndarray, impressions: np.ndarray, installs: np.ndarray) -> np.ndarray:
+    on_day = date_idx >= 0
+    day_impressions = np.bincount(date_idx[on_day], weights=impressions[on_day], minlength=n_dates)
+    day_installs = np.bincount(date_idx[on_day], weights=installs[on_day], minlength=n_dates)
+    cvr = np.divide(day_installs, day_impressions, out=np.zeros(n_dates), where=day_impressions != 0) * 100
+    return cvr.round(4)
+
+
+def pool_ready() -> int:
+    """Submitted once per CPU pool worker so it imports this module ahead of the first dashboard"""
+    return os.getpid()
@@ -1,5 +1,10 @@
 import os
 import csv
+import json
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 from dotenv import load_dotenv
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
@@ -13,7 +18,14 @@ ACCOUNT_FILTER = ""  # Filter accounts by name
 CAMPAIGN_FILTER = ""  # Filter campaigns by name
 ADGROUP_FILTER = ""   # Filter ad groups by name
 
-def get_all_customers(client, login_customer_id):
+# Bulk export defaults
+BULK_WINDOW_DAYS = 7
+BULK_WORKERS = 4
+BULK_FIELDS = ['account_id', 'account_name', 'window_start', 'window_end', 'asset_id', 'asset_name',
+               'youtube_video_id', 'campaign', 'ad_group', 'cost', 'impressions', 'installs']
+MANIFEST_NAME = "manifest.json"
+
+def get_all_customers(client, login_customer_id, account_filter=ACCOUNT_FILTER):
     """Get list of all customer accounts"""
     if not login_customer_id:
         return []
@@ -34,15 +46,16 @@ def get_all_customers(client, login_customer_id):
         for row in response:
             name = row.customer_client.descriptive_name
             # Filter by account name
-            if ACCOUNT_FILTER and ACCOUNT_FILTER not in name:
+            if account_filter and account_filter not in name:
                 continue
             customers.append({'id': str(row.customer_client.id), 'name': name})
         return customers
     except:
         return [{'id': login_customer_id, 'name': 'Current Account'}]
 
-def get_youtube_assets(client, customer_id, start_date, end_date):
-    """Get YouTube video assets and their performance metrics"""
+def fetch_youtube_assets(client, customer_id, start_date, end_date,
+                         campaign_filter=CAMPAIGN_FILTER, adgroup_filter=ADGROUP_FILTER):
+    """Query YouTube video asset rows for one account and period; API errors are raised"""
     ga_service = client.get_service("GoogleAdsService")
     
     query = f"""
@@ -61,30 +74,227 @@ def get_youtube_assets(client, customer_id, start_date, end_date):
           AND metrics.impressions > 0
     """
     
-    if CAMPAIGN_FILTER:
-        query += f" AND campaign.name LIKE '%{CAMPAIGN_FILTER}%'"
-    if ADGROUP_FILTER:
-        query += f" AND ad_group.name LIKE '%{ADGROUP_FILTER}%'"
+    if campaign_filter:
+        query += f" AND campaign.name LIKE '%{campaign_filter}%'"
+    if adgroup_filter:
+        query += f" AND ad_group.name LIKE '%{adgroup_filter}%'"
+
+    response = ga_service.search(customer_id=customer_id, query=query)
+    results = []
+    for row in response:
+        results.append({
+            'asset_id': row.asset.id,
+            'asset_name': row.asset.name or row.asset.youtube_video_asset.youtube_video_id,
+            'youtube_video_id': row.asset.youtube_video_asset.youtube_video_id,
+            'campaign': row.campaign.name,
+            'ad_group': row.ad_group.name,
+            'cost': row.metrics.cost_micros / 1000000.0,
+            'impressions': row.metrics.impressions,
+            'installs': row.metrics.conversions
+        })
+    return results
 
+
+def get_youtube_assets(client, customer_id, start_date, end_date,
+                       campaign_filter=CAMPAIGN_FILTER, adgroup_filter=ADGROUP_FILTER):
+    """Get YouTube video assets and their performance metrics"""
     try:
-        response = ga_service.search(customer_id=customer_id, query=query)
-        results = []
-        for row in response:
-            results.append({
-                'asset_id': row.asset.id,
-                'asset_name': row.asset.name or row.asset.youtube_video_asset.youtube_video_id,
-                'campaign': row.campaign.name,
-                'cost': row.metrics.cost_micros / 1000000.0,
-                'impressions': row.metrics.impressions,
-                'installs': row.metrics.conversions
-            })
-        return results
+        return fetch_youtube_assets(client, customer_id, start_date, end_date, campaign_filter, adgroup_filter)
     except GoogleAdsException as ex:
         print(f"   Error: {ex.failure.errors[0].message}")
         return []
 
 
-def main():
+# ==================== BULK EXPORT ====================
+
+def date_windows(start_date, end_date, window_days):
+    """Split [start_date, end_date] into consecutive windows of at most window_days"""
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=window_days - 1), end)
+        windows.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def partition_key(account_id, window_start, window_end):
+    return f"{account_id}/{window_start}_{window_end}"
+
+
+def _write_atomic(path, write):
+    """Write through a temp file so an interrupted run never leaves a half-written file"""
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_partition(path, rows, file_format):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if file_format == "parquet":
+        import pandas as pd
+        df = pd.DataFrame(rows, columns=BULK_FIELDS)
+        _write_atomic(path, lambda p: df.to_parquet(p, index=False))
+        return
+
+    def write_csv(p):
+        with open(p, mode='w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=BULK_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    _write_atomic(path, write_csv)
+
+
+class ExportManifest:
+    """Checkpoint of completed partitions, rewritten after every finished partition"""
+
+    def __init__(self, output_dir, params):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.params = params
+        self.partitions = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get("params") != params:
+                raise SystemExit(
+                    f"{self.path} was written with different settings {saved.get('params')}; "
+                    "use a new --output-dir or --restart"
+                )
+            self.partitions = saved.get("partitions", {})
+
+    def is_done(self, key, output_dir):
+        entry = self.partitions.get(key)
+        return bool(entry) and os.path.exists(os.path.join(output_dir, entry["file"]))
+
+    def mark_done(self, key, file, rows):
+        with self._lock:
+            self.partitions[key] = {
+                "file": file,
+                "rows": rows,
+                "completed_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            payload = {"params": self.params, "partitions": self.partitions}
+
+            def write(p):
+                with open(p, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, indent=2, sort_keys=True)
+            _write_atomic(self.path, write)
+
+
+def export_partition(client, customer, window, args):
+    """Fetch one account/window partition and write it; returns the row count"""
+    window_start, window_end = window
+    rows = fetch_youtube_assets(client, customer['id'], window_start, window_end,
+                                args.campaign_filter, args.adgroup_filter)
+    for row in rows:
+        row.update({
+            'account_id': customer['id'],
+            'account_name': customer['name'],
+            'window_start': window_start,
+            'window_end': window_end,
+        })
+    file = os.path.join(f"account={customer['id']}", f"{window_start}_{window_end}.{args.format}")
+    write_partition(os.path.join(args.output_dir, file), rows, args.format)
+    return file, len(rows)
+
+
+def bulk_export(client, customers, args):
+    """Export every account x date window partition in parallel, skipping finished ones"""
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow (or use --format csv)")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest_path = os.path.join(args.output_dir, MANIFEST_NAME)
+    if args.restart and os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    params = {
+        "start_date": args.start_date,
+        "end_date": args.end_date,
+        "window_days": args.window_days,
+        "format": args.format,
+        "campaign_filter": args.campaign_filter,
+        "adgroup_filter": args.adgroup_filter,
+    }
+    manifest = ExportManifest(args.output_dir, params)
+
+    windows = date_windows(args.start_date, args.end_date, args.window_days)
+    pending = []
+    for customer in customers:
+        for window in windows:
+            if not manifest.is_done(partition_key(customer['id'], *window), args.output_dir):
+                pending.append((customer, window))
+    total = len(customers) * len(windows)
+    print(f"Partitions: {total} ({len(windows)} windows x {len(customers)} accounts), "
+          f"already done: {total - len(pending)}, to fetch: {len(pending)}\n")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(export_partition, client, customer, window, args): (customer, window)
+                   for customer, window in pending}
+        for future in as_completed(futures):
+            customer, window = futures[future]
+            key = partition_key(customer['id'], *window)
+            try:
+                file, rows = future.result()
+            except GoogleAdsException as ex:
+                failed += 1
+                print(f"   FAILED {customer['name']} {key}: {ex.failure.errors[0].message}")
+                continue
+            except Exception as ex:
+                failed += 1
+                print(f"   FAILED {customer['name']} {key}: {ex}")
+                continue
+            manifest.mark_done(key, file, rows)
+            print(f"-> {customer['name']} {window[0]}..{window[1]}: {rows} records")
+
+    done_rows = sum(p["rows"] for p in manifest.partitions.values())
+    print(f"\n{'='*60}")
+    print(f"Output: {args.output_dir}")
+    print(f"Partitions done: {total - failed}/{total}, records: {done_rows:,}")
+    if failed:
+        print(f"{failed} partitions failed - rerun the same command to fetch only those")
+    print(f"{'='*60}\n")
+    return failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export YouTube video asset performance from Google Ads")
+    parser.add_argument("--start-date", default=START_DATE, help=f"YYYY-MM-DD (default {START_DATE})")
+    parser.add_argument("--end-date", default=END_DATE, help=f"YYYY-MM-DD (default {END_DATE})")
+    parser.add_argument("--account-filter", default=ACCOUNT_FILTER, help="Only accounts whose name contains this")
+    parser.add_argument("--campaign-filter", default=CAMPAIGN_FILTER, help="Only campaigns whose name contains this")
+    parser.add_argument("--adgroup-filter", default=ADGROUP_FILTER, help="Only ad groups whose name contains this")
+    bulk = parser.add_argument_group("bulk export")
+    bulk.add_argument("--bulk", action="store_true",
+                      help="Write one file per account and date window, resumable via a manifest")
+    bulk.add_argument("--output-dir", help="Bulk output directory (default exports/youtube_assets_START_END)")
+    bulk.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    bulk.add_argument("--window-days", type=int, default=BULK_WINDOW_DAYS, help="Days per date window")
+    bulk.add_argument("--workers", type=int, default=BULK_WORKERS, help="Partitions fetched in parallel")
+    bulk.add_argument("--restart", action="store_true", help="Ignore the existing manifest and fetch everything")
+    args = parser.parse_args(argv)
+    for name in ("start_date", "end_date"):
+        try:
+            date.fromisoformat(getattr(args, name))
+        except ValueError:
+            parser.error(f"--{name.replace('_', '-')} must be YYYY-MM-DD")
+    if args.start_date > args.end_date:
+        parser.error("--start-date is after --end-date")
+    if args.window_days < 1 or args.workers < 1:
+        parser.error("--window-days and --workers must be positive")
+    if not args.output_dir:
+        args.output_dir = os.path.join("exports", f"youtube_assets_{args.start_date}_{args.end_date}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
     # Load configuration exclusively from environment variables
     config = {
         "developer_token": os.getenv("ADS_DEVELOPER_TOKEN"),
@@ -99,22 +309,28 @@ def main():
     client = GoogleAdsClient.load_from_dict(config)
     login_customer_id = client.login_customer_id.replace('-', '') if client.login_customer_id else None
     
-    print(f"Period: {START_DATE} - {END_DATE}")
+    print(f"Period: {args.start_date} - {args.end_date}")
     print(f"Filters:")
-    print(f"  Account contains: '{ACCOUNT_FILTER}'")
-    print(f"  Campaign contains: '{CAMPAIGN_FILTER}'")
-    print(f"  Ad Group contains: '{ADGROUP_FILTER}'")
+    print(f"  Account contains: '{args.account_filter}'")
+    print(f"  Campaign contains: '{args.campaign_filter}'")
+    print(f"  Ad Group contains: '{args.adgroup_filter}'")
     print(f"  Impressions > 0")
     print()
     
     # Get filtered accounts
-    customers = get_all_customers(client, login_customer_id)
+    customers = get_all_customers(client, login_customer_id, args.account_filter)
     print(f"Matching accounts: {len(customers)}\n")
     
+    if args.bulk:
+        if bulk_export(client, customers, args):
+            raise SystemExit(1)
+        return
+    
     all_data = []
     for c in customers:
         print(f"-> {c['name']} ({c['id']})")
-        data = get_youtube_assets(client, c['id'], start_date=START_DATE, end_date=END_DATE)
+        data = get_youtube_assets(client, c['id'], args.start_date, args.end_date,
+                                  args.campaign_filter, args.adgroup_filter)
         if data:
             print(f"   Records: {len(data)}")
             all_data.extend(data)
@@ -149,7 +365,7 @@ def main():
         item['installs'] = int(round(item['installs'], 0))
     
     # Save to file using csv module
-    filename = f"youtube_creatives_{START_DATE}_{END_DATE}.csv"
+    filename = f"youtube_creatives_{args.start_date}_{args.end_date}.csv"
     with open(filename, mode='w', newline='', encoding='utf-8-sig') as f:
         writer = csv.DictWriter(f, fieldnames=['asset_name', 'campaign', 'cost', 'impressions', 'installs'])
         writer.writeheader()
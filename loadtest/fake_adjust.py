@@ -0,0 +1,126 @@
+"""
+Local HTTP stand-in for the Adjust reports-service pivot_report endpoint.
+
+Point the app at it with ADJUST_BASE_URL=http://127.0.0.1:8081. It answers the
+GET query the dashboard sends (and the POST fallbacks) with CSV rows of
+day x creative x campaign, deterministic per app, channel and day.
+
+Usage:
+    python loadtest/fake_adjust.py [--port 8081] [--latency-ms 300] [--creatives 150] [--rows-per-day 300]
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import time
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse as urlparse
+
+COLUMNS = ["Day", "Creative (Network)", "Campaign", "Cost", "Installs", "Network Impressions"]
+
+
+def _days(date_period: str):
+    start, _, end = date_period.partition(":")
+    start, end = date.fromisoformat(start), date.fromisoformat(end or start)
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+def make_rows(app_token: str, channel_id: str, date_period: str, creatives: int, rows_per_day: int):
+    rows = []
+    for day in _days(date_period):
+        rng = random.Random(zlib.crc32(f"{app_token}:{channel_id}:{day}".encode()))
+        for _ in range(rows_per_day):
+            creative = rng.randrange(creatives)
+            rows.append({
+                "Day": day,
+                "Creative (Network)": f"{zlib.crc32(str(creative).encode()):08x}{'0' * 24}_UA_{creative:04d}_gameplay 9x16",
+                "Campaign": f"{channel_id} Android {rng.randrange(10)}",
+                "Cost": f"{rng.random() * 300:.4f}",
+                "Installs": str(rng.randint(0, 150)),
+                "Network Impressions": str(rng.randint(0, 40_000)),
+            })
+    return rows
+
+
+class PivotReportHandler(BaseHTTPRequestHandler):
+    server_version = "FakeAdjust/1.0"
+
+    def _filters(self):
+        if self.command == "GET":
+            params = {k: v[0] for k, v in urlparse.parse_qs(urlparse.urlsplit(self.path).query).items()}
+        else:
+            length = int(self.headers.get("Content-Length") or 0)
+            params = json.loads(self.rfile.read(length) or b"{}")
+            params.update(params.pop("filters", None) or {})
+        app_token = params.get("app_token__in", "")
+        channel_id = params.get("channel_id__in", "")
+        # GET filters are quoted strings, the POST variant sends lists
+        app_token = app_token[0] if isinstance(app_token, list) else app_token.strip('"')
+        channel_id = channel_id[0] if isinstance(channel_id, list) else channel_id.strip('"')
+        return app_token, channel_id, params.get("date_period", "")
+
+    def _handle(self):
+        if urlparse.urlsplit(self.path).path != "/reports-service/pivot_report":
+            self.send_error(404)
+            return
+        if not self.headers.get("Authorization"):
+            self.send_error(401)
+            return
+        try:
+            app_token, channel_id, date_period = self._filters()
+            rows = make_rows(app_token, channel_id, date_period, self.server.creatives, self.server.rows_per_day)
+        except (ValueError, json.JSONDecodeError) as e:
+            self.send_error(400, str(e))
+            return
+        time.sleep(self.server.latency_ms / 1000)
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+        body = buf.getvalue().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _handle
+    do_POST = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8081, latency_ms: float = 300,
+                creatives: int = 150, rows_per_day: int = 300) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), PivotReportHandler)
+    server.daemon_threads = True
+    server.latency_ms = latency_ms
+    server.creatives = creatives
+    server.rows_per_day = rows_per_day
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--creatives", type=int, default=150)
+    parser.add_argument("--rows-per-day", type=int, default=300)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency_ms, args.creatives, args.rows_per_day)
+    print(f"Fake Adjust listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
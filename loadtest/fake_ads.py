@@ -0,0 +1,171 @@
+"""
+In-process stand-in for the Google Ads API, used for load testing.
+
+Enable it with GOOGLE_ADS_CLIENT_FACTORY=loadtest.fake_ads:make_client. Types and
+enums come from the real google-ads library, so request objects are built exactly
+as in production; only the service calls are faked. Data is deterministic per
+account and day, and every call sleeps to simulate API latency.
+
+Configuration (environment):
+    FAKE_ADS_LATENCY_MS        base latency per call (150)
+    FAKE_ADS_MS_PER_1K_ROWS    extra latency per 1000 rows returned (20)
+    FAKE_ADS_ACCOUNTS          accounts under the manager (5)
+    FAKE_ADS_CAMPAIGNS         campaigns per account (20)
+    FAKE_ADS_CREATIVES         distinct creatives per account (100)
+    FAKE_ADS_ROWS_PER_DAY      asset rows per account and day (200)
+"""
+
+import os
+import random
+import re
+import time
+import zlib
+from functools import lru_cache
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from google.ads.googleads.client import GoogleAdsClient
+
+LATENCY_MS = float(os.getenv("FAKE_ADS_LATENCY_MS", "150"))
+MS_PER_1K_ROWS = float(os.getenv("FAKE_ADS_MS_PER_1K_ROWS", "20"))
+ACCOUNTS = int(os.getenv("FAKE_ADS_ACCOUNTS", "5"))
+CAMPAIGNS = int(os.getenv("FAKE_ADS_CAMPAIGNS", "20"))
+CREATIVES = int(os.getenv("FAKE_ADS_CREATIVES", "100"))
+ROWS_PER_DAY = int(os.getenv("FAKE_ADS_ROWS_PER_DAY", "200"))
+STREAM_BATCH_SIZE = 10000
+
+LOGIN_CUSTOMER_ID = "1000000000"
+ACCOUNT_IDS = [str(2000000000 + i) for i in range(ACCOUNTS)]
+
+
+def _simulate_latency(rows: int = 0):
+    time.sleep((LATENCY_MS + MS_PER_1K_ROWS * rows / 1000) / 1000)
+
+
+def _campaign(customer_id: str, i: int):
+    platform = "Android" if i % 2 == 0 else "iOS"
+    return SimpleNamespace(id=int(customer_id) * 100 + i, name=f"UAC {platform} {customer_id[-2:]}-{i:02d}", status="ENABLED")
+
+
+def _date_range(query: str):
+    match = re.search(r"BETWEEN '(\d{4}-\d{2}-\d{2})' AND '(\d{4}-\d{2}-\d{2})'", query)
+    if not match:
+        return []
+    start, end = date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+@lru_cache(maxsize=4096)
+def _asset_rows(customer_id: str, day: str):
+    """The account's asset rows of one day; the same for every call, and built once so
+    generating them does not take CPU time from the server under test"""
+    rng = random.Random(zlib.crc32(f"{customer_id}:{day}".encode()))
+    rows = []
+    for _ in range(ROWS_PER_DAY):
+        creative = rng.randrange(CREATIVES)
+        impressions = rng.randint(0, 50_000)
+        rows.append(SimpleNamespace(
+            segments=SimpleNamespace(date=day),
+            asset=SimpleNamespace(
+                id=int(customer_id) * 1000 + creative,
+                name=f"UA_{creative:04d}_gameplay {rng.choice(['9x16', '16x9', '1x1'])}",
+                youtube_video_asset=SimpleNamespace(youtube_video_id=f"vid{creative:08d}", youtube_video_title=""),
+            ),
+            campaign=_campaign(customer_id, rng.randrange(CAMPAIGNS)),
+            ad_group=SimpleNamespace(name="Main" if rng.random() < 0.8 else f"Test {day[2:4]}{day[5:7]}{day[8:10]}"),
+            metrics=SimpleNamespace(
+                cost_micros=rng.randint(0, 500_000_000),
+                impressions=impressions,
+                conversions=round(impressions * rng.random() * 0.01, 2),
+            ),
+        ))
+    return rows
+
+
+class FakeGoogleAdsService:
+    def __init__(self, client):
+        self.client = client
+
+    def _rows(self, customer_id: str, query: str) -> list:
+        if "FROM customer_client" in query:
+            return [SimpleNamespace(customer_client=SimpleNamespace(id=int(a), descriptive_name=f"Fake account {a[-2:]}"))
+                    for a in ACCOUNT_IDS]
+        if "FROM campaign" in query:
+            days = _date_range(query)
+            if not days:
+                return [SimpleNamespace(campaign=_campaign(customer_id, i), metrics=SimpleNamespace(cost_micros=1_000_000 * (i + 1)))
+                        for i in range(CAMPAIGNS)]
+            # Per day, most campaigns spend; which ones is fixed per account and day
+            return [SimpleNamespace(segments=SimpleNamespace(date=day), campaign=_campaign(customer_id, i),
+                                    metrics=SimpleNamespace(cost_micros=1_000_000 * (i + 1)))
+                    for day in days for i in range(CAMPAIGNS) if zlib.crc32(f"{customer_id}:{day}:{i}".encode()) % 5]
+        if "FROM ad_group_ad_asset_view" in query:
+            rows = [r for day in _date_range(query) for r in _asset_rows(customer_id, day)]
+            if "metrics.impressions > 0" in query:
+                rows = [r for r in rows if r.metrics.impressions > 0]
+            if "metrics.cost_micros > 0" in query:
+                rows = [r for r in rows if r.metrics.cost_micros > 0]
+            like = re.findall(r"(\w+\.name) LIKE '%(.*?)%'", query)
+            for field, value in like:
+                rows = [r for r in rows if value in getattr(r, field.split(".")[0]).name]
+            return rows
+        if "FROM batch_job" in query:
+            return [SimpleNamespace(batch_job=SimpleNamespace(status=self.client.enums.BatchJobStatusEnum.DONE))]
+        # FROM asset: no video asset exists yet, so uploads always create them
+        return []
+
+    def search(self, customer_id, query, **kwargs):
+        rows = self._rows(customer_id, query)
+        _simulate_latency(len(rows))
+        return iter(rows)
+
+    def search_stream(self, customer_id, query, **kwargs):
+        rows = self._rows(customer_id, query)
+        _simulate_latency(len(rows))
+        for start in range(0, max(len(rows), 1), STREAM_BATCH_SIZE):
+            yield SimpleNamespace(results=rows[start:start + STREAM_BATCH_SIZE])
+
+    def mutate(self, request=None, **kwargs):
+        _simulate_latency()
+        response = self.client.get_type("MutateGoogleAdsResponse")
+        for i, operation in enumerate(request.mutate_operations):
+            result = self.client.get_type("MutateOperationResponse")
+            if "ad_group_operation" in operation:
+                result.ad_group_result.resource_name = f"customers/{request.customer_id}/adGroups/{random.randrange(10**9)}"
+            elif "ad_group_ad_operation" in operation:
+                result.ad_group_ad_result.resource_name = f"customers/{request.customer_id}/adGroupAds/{i}~{random.randrange(10**9)}"
+            response.mutate_operation_responses.append(result)
+        return response
+
+
+class FakeAssetService:
+    def __init__(self, client):
+        self.client = client
+
+    def mutate_assets(self, request=None, **kwargs):
+        _simulate_latency()
+        response = self.client.get_type("MutateAssetsResponse")
+        for operation in request.operations:
+            result = self.client.get_type("MutateAssetResult")
+            video_id = operation.create.youtube_video_asset.youtube_video_id
+            result.resource_name = f"customers/{request.customer_id}/assets/{zlib.crc32(video_id.encode())}"
+            response.results.append(result)
+        return response
+
+
+class FakeGoogleAdsClient(GoogleAdsClient):
+    """Real types and enums, fake services"""
+
+    services = {"GoogleAdsService": FakeGoogleAdsService, "AssetService": FakeAssetService}
+
+    def __init__(self):
+        super().__init__(credentials=None, developer_token="fake", login_customer_id=LOGIN_CUSTOMER_ID, use_proto_plus=True)
+
+    def get_service(self, name, version=None, interceptors=None):
+        if name not in self.services:
+            raise NotImplementedError(f"{name} is not faked; use the sync upload mode")
+        return self.services[name](self)
+
+
+def make_client() -> FakeGoogleAdsClient:
+    return FakeGoogleAdsClient()
@@ -0,0 +1,218 @@
+"""
+Concurrent load driver for the report, dashboard and upload endpoints.
+
+Simulated users run a weighted mix of scenarios against a running server for a
+fixed duration; throughput and latency percentiles are reported per scenario.
+With --spawn, the fake Adjust server and uvicorn (with the fake Google Ads
+client and the auth bypass) are started locally, so no live API is touched.
+
+Usage:
+    python loadtest/run.py --spawn --users 20 --duration 60
+    python loadtest/run.py --base-url http://127.0.0.1:8000 --mix report=3,dashboard=2,upload=1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_adjust
+
+VIDEO_ID_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-"
+
+
+# -------- scenarios --------
+
+class Scenarios:
+    """Request bodies built from the accounts and campaigns the server reports"""
+
+    def __init__(self, accounts, campaigns, distinct_ranges: int, max_days: int, seed: int):
+        self.accounts = accounts
+        self.campaigns = campaigns
+        rng = random.Random(seed)
+        end = date.today() - timedelta(days=1)
+        # A fixed pool of date windows, so repeated requests exercise the caches like real users do
+        self.ranges = []
+        for _ in range(distinct_ranges):
+            days = rng.randint(7, max_days)
+            last = end - timedelta(days=rng.randint(0, 30))
+            self.ranges.append(((last - timedelta(days=days - 1)).isoformat(), last.isoformat()))
+
+    async def report(self, http, rng):
+        start, end = rng.choice(self.ranges)
+        return await http.post("/api/report", json={
+            "account_ids": self.accounts, "campaign_ids": [], "adgroup_type": "main",
+            "start_date": start, "end_date": end, "group_by_campaign": True, "limit": 100,
+        })
+
+    async def dashboard(self, http, rng):
+        start, end = rng.choice(self.ranges)
+        return await http.post("/api/dashboard", json={
+            "adgroup_type": "main", "start_date": start, "end_date": end,
+            "platform": rng.choice(["Android", "iOS"]), "adjust_app_token": "loadtest",
+            "account_ids": self.accounts, "top_n": 10,
+        })
+
+    async def upload(self, http, rng):
+        videos = ["".join(rng.choice(VIDEO_ID_CHARS) for _ in range(11)) for _ in range(3)]
+        return await http.post("/api/upload", json={
+            "campaign_ids": rng.sample(self.campaigns, min(3, len(self.campaigns))),
+            "adgroup_name": f"LT{rng.randrange(10**6):06d}",
+            "youtube_urls": [f"https://youtu.be/{v}" for v in videos],
+            "headlines": ["Play now"], "descriptions": ["Load test upload"],
+        })
+
+
+async def discover(http):
+    accounts = (await http.get("/api/accounts")).raise_for_status().json()["accounts"]
+    account_ids = [a["id"] for a in accounts]
+    if not account_ids:
+        raise SystemExit("The server returned no accounts")
+    campaigns = (await http.get("/api/all_campaigns", params={"account_ids": ",".join(account_ids)})).raise_for_status().json()
+    return account_ids, [c["id"] for c in campaigns["campaigns"]]
+
+
+# -------- driver --------
+
+def percentile(sorted_values, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+async def user_loop(scenarios, mix, http, deadline: float, results: dict, seed: int):
+    rng = random.Random(seed)
+    names, weights = zip(*mix.items())
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await getattr(scenarios, name)(http, rng)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        results[name].append((time.perf_counter() - started, ok))
+
+
+async def run(args, mix) -> dict:
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as http:
+        accounts, campaigns = await discover(http)
+        scenarios = Scenarios(accounts, campaigns, args.distinct_ranges, args.max_days, args.seed)
+        print(f"{len(accounts)} accounts, {len(campaigns)} campaigns, {args.users} users, {args.duration}s, mix {mix}")
+        results = {name: [] for name in mix}
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(*(user_loop(scenarios, mix, http, deadline, results, args.seed + i) for i in range(args.users)))
+        elapsed = time.monotonic() - started
+
+    summary = {}
+    for name, samples in results.items():
+        latencies = sorted(s for s, _ in samples)
+        summary[name] = {
+            "requests": len(samples),
+            "errors": sum(1 for _, ok in samples if not ok),
+            "rps": round(len(samples) / elapsed, 2),
+            **{f"p{p}_ms": round(percentile(latencies, p) * 1000, 1) for p in (50, 90, 95, 99)},
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        }
+    return summary
+
+
+def print_summary(summary: dict):
+    header = f"{'scenario':<12} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p90 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, s in summary.items():
+        print(f"{name:<12} {s['requests']:>9} {s['errors']:>7} {s['rps']:>8.2f} {s['p50_ms']:>9.1f} "
+              f"{s['p90_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['max_ms']:>9.1f}")
+
+
+# -------- local stack --------
+
+def spawn_stack(args):
+    """Fake Adjust in a thread and uvicorn in a subprocess; returns the uvicorn process"""
+    adjust = fake_adjust.make_server(port=args.adjust_port, latency_ms=args.adjust_latency_ms)
+    threading.Thread(target=adjust.serve_forever, daemon=True).start()
+
+    port = args.base_url.rsplit(":", 1)[-1].strip("/")
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        GOOGLE_ADS_CLIENT_FACTORY="loadtest.fake_ads:make_client",
+        AUTH_BYPASS_EMAIL="loadtest@example.com",
+        ADJUST_BASE_URL=f"http://127.0.0.1:{args.adjust_port}",
+        ADJUST_API_TOKEN="loadtest",
+        PREWARM_AT="",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", port, "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    for _ in range(300):
+        try:
+            if httpx.get(f"{args.base_url}/metrics", timeout=1).status_code < 500:
+                return server
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            raise SystemExit("uvicorn exited during startup")
+        time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("uvicorn did not start within 30s")
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(Scenarios, name.strip()):
+            raise argparse.ArgumentTypeError(f"unknown scenario: {name}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--mix", type=parse_mix, default="report=3,dashboard=2,upload=1", help="Scenario weights")
+    parser.add_argument("--distinct-ranges", type=int, default=20, help="Distinct date windows; fewer means more cache hits")
+    parser.add_argument("--max-days", type=int, default=90, help="Longest date window")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="Also write the summary as JSON")
+    parser.add_argument("--spawn", action="store_true", help="Start fake Adjust and uvicorn with the fake Google Ads client")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --spawn")
+    parser.add_argument("--adjust-port", type=int, default=8081)
+    parser.add_argument("--adjust-latency-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    server = spawn_stack(args) if args.spawn else None
+    try:
+        summary = asyncio.run(run(args, args.mix))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items()}, "summary": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
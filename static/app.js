@@ -3,6 +3,9 @@ let state = {
   accounts: [],
   campaigns: [],
   reportData: [],
+  reportQuery: null,
+  reportCount: 0,
+  reportLoadingPage: false,
   sortColumn: 'cost',
   sortDirection: 'desc',
   showAccount: false,
@@ -27,10 +30,15 @@ const resultsBody = document.getElementById('results-body');
 const resultsThead = document.getElementById('results-thead');
 const groupByAccountCheckbox = document.getElementById('group-by-account');
 const groupByCampaignCheckbox = document.getElementById('group-by-campaign');
+const tableContainer = document.getElementById('table-container');
+const pageInfo = document.getElementById('page-info');
+const loadMoreBtn = document.getElementById('load-more-btn');
+const REPORT_PAGE_SIZE = 200;
 
 // Dashboard DOM
 const dashPlatformSelect = document.getElementById('dash-platform');
 const dashAppSelect = document.getElementById('dash-app');
+const dashGranularitySelect = document.getElementById('dash-granularity');
 const dashAccountsToggle = document.getElementById('dash-accounts-toggle');
 const dashAccountsMenu = document.getElementById('dash-accounts-menu');
 const dashLoadBtn = document.getElementById('dash-load-btn');
@@ -55,11 +63,16 @@ const youtubeUrlsInput = document.getElementById('youtube-urls');
 const headlinesInput = document.getElementById('headlines-input');
 const descriptionsInput = document.getElementById('descriptions-input');
 const uploadBtn = document.getElementById('upload-btn');
+const uploadBatchModeCheckbox = document.getElementById('upload-batch-mode');
+const BATCH_POLL_MS = 5000;
+// Added to the server's BATCH_MAX_WAIT before the page stops waiting for a batch upload
+const BATCH_DEADLINE_SLACK_MS = 5 * 60 * 1000;
 const uploadResults = document.getElementById('upload-results');
 const uploadLog = document.getElementById('upload-log');
 
 // Common Elements
 const loadingOverlay = document.getElementById('loading-overlay');
+const loadingText = document.getElementById('loading-text');
 const errorMessage = document.getElementById('error-message');
 
 // Initialize
@@ -104,6 +117,10 @@ function setupEventListeners(){
   endDateInput.addEventListener('change', onDateChange);
   loadBtn.addEventListener('click', loadReport);
   downloadBtn.addEventListener('click', downloadCSV);
+  loadMoreBtn.addEventListener('click', loadNextReportPage);
+  tableContainer.addEventListener('scroll', ()=>{
+    if(tableContainer.scrollTop+tableContainer.clientHeight >= tableContainer.scrollHeight-100) loadNextReportPage();
+  });
   uploadBtn.addEventListener('click', createTestAdGroups);
   if (dashLoadBtn) dashLoadBtn.addEventListener('click', loadDashboard);
 }
@@ -140,23 +157,31 @@ function selectAll(containerId, select, handler){
 }
 function selectAllAccounts(select){selectAll('accounts-container',select,onAccountChange);}
 function onDateChange(){ if(getSelectedAccountIds().length>0) onAccountChange(); }
+// Only the latest campaigns request renders, so quick date changes don't race
+let _campaignsLoadId=0;
 async function onAccountChange(){
   const selectedIds=getSelectedAccountIds();
   if(!selectedIds.length){campaignsContainer.innerHTML='<div class="placeholder">Select accounts first</div>'; state.campaigns=[]; return;}
   const sd=startDateInput.value, ed=endDateInput.value;
   if(!sd||!ed){campaignsContainer.innerHTML='<div class="placeholder">Select date range first</div>'; return;}
+  // Campaigns the user unchecked stay unchecked when the list is reloaded
+  const unchecked=new Set(Array.from(campaignsContainer.querySelectorAll('input[type="checkbox"]:not(:checked)')).map(cb=>cb.value));
+  const loadId=++_campaignsLoadId;
   campaignsContainer.innerHTML='<div class="loading">Loading campaigns with spend...</div>';
   try{
     const resp=await fetch(`/api/campaigns?account_ids=${selectedIds.join(',')}&start_date=${sd}&end_date=${ed}`);
     const data=await resp.json();
+    if(loadId!==_campaignsLoadId) return;
     if(!resp.ok) throw new Error(data.detail||'Failed to load campaigns');
     state.campaigns=data.campaigns;
-    renderCampaigns(campaignsContainer);
+    renderCampaigns(campaignsContainer, unchecked);
+    showAccountErrors(data.errors, 'Campaigns');
   }catch(e){
+    if(loadId!==_campaignsLoadId) return;
     campaignsContainer.innerHTML=`<div class="placeholder">Error: ${e.message}</div>`;
   }
 }
-function renderCampaigns(container){
+function renderCampaigns(container, unchecked=new Set()){
   if(!state.campaigns.length){container.innerHTML='<div class="placeholder">No campaigns found</div>'; return;}
   container.innerHTML=`
     <div class="select-actions">
@@ -166,7 +191,7 @@ function renderCampaigns(container){
     <div class="checkbox-list">
       ${state.campaigns.map(c=>`
         <label class="checkbox-item">
-          <input type="checkbox" value="${c.id}" checked>
+          <input type="checkbox" value="${c.id}" ${unchecked.has(c.id)?'':'checked'}>
           <span title="${c.name}">${c.name}</span>
         </label>
       `).join('')}
@@ -189,18 +214,55 @@ async function loadReport(){
   if(adgroupType==='test' && !testDate){showError('Please enter test date (e.g. 181225)'); return;}
   hideError(); showLoading();
   try{
-    const resp=await fetch('/api/report',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({
-      account_ids:accountIds,campaign_ids:campaignIds,adgroup_type:adgroupType,test_date:testDate,start_date:sd,end_date:ed,group_by_account:groupByAccount,group_by_campaign:groupByCampaign
-    })});
-    const data=await resp.json();
-    if(!resp.ok) throw new Error(data.detail||'Failed to load report');
-    state.reportData=data.data;
+    state.reportQuery={
+      account_ids:accountIds,campaign_ids:campaignIds,adgroup_type:adgroupType,test_date:testDate,start_date:sd,end_date:ed,group_by_account:groupByAccount,group_by_campaign:groupByCampaign,response_format:'columnar'
+    };
+    // First page runs as a background job so progress can be shown; later pages hit the server cache
+    const data=await runJob('/api/jobs/report', reportPageBody(0, REPORT_PAGE_SIZE), p=>{
+      setLoadingText(`Accounts ${p.accounts_done||0}/${p.accounts_total||'?'} · ${formatNumber(p.rows_fetched||0)} rows fetched`);
+    });
+    state.reportData=decodeColumnar(data.data);
+    state.reportCount=data.count;
     state.showAccount=groupByAccount;
     state.showCampaign=groupByCampaign;
     renderResults(data);
+    showAccountErrors(data.errors, 'Report');
   }catch(e){showError('Failed to load report: '+e.message);}
   finally{hideLoading();}
 }
+function reportPageBody(offset, limit){
+  const body={...state.reportQuery, sort_by:state.sortColumn, sort_dir:state.sortDirection, offset};
+  if(limit!=null) body.limit=limit;
+  return body;
+}
+async function fetchReportPage(offset, limit){
+  const resp=await fetch('/api/report',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify(reportPageBody(offset, limit))});
+  const data=await resp.json();
+  if(!resp.ok) throw new Error(data.detail||'Failed to load report');
+  return data;
+}
+async function loadNextReportPage(){
+  if(!state.reportQuery || state.reportLoadingPage || state.reportData.length>=state.reportCount) return;
+  state.reportLoadingPage=true;
+  try{
+    const data=await fetchReportPage(state.reportData.length, REPORT_PAGE_SIZE);
+    const rows=decodeColumnar(data.data);
+    state.reportData=state.reportData.concat(rows);
+    appendTableRows(rows);
+  }catch(e){showError('Failed to load report: '+e.message);}
+  finally{state.reportLoadingPage=false;}
+}
+async function reloadSortedReport(){
+  if(!state.reportQuery) return;
+  state.reportLoadingPage=true;
+  try{
+    const data=await fetchReportPage(0, REPORT_PAGE_SIZE);
+    state.reportData=decodeColumnar(data.data);
+    state.reportCount=data.count;
+    renderTable();
+  }catch(e){showError('Failed to load report: '+e.message);}
+  finally{state.reportLoadingPage=false;}
+}
 function renderResults(data){
   document.getElementById('results-count').textContent=`${data.count} creatives`;
   document.getElementById('total-cost').textContent=formatCurrency(data.totals.cost);
@@ -208,7 +270,7 @@ function renderResults(data){
   document.getElementById('total-installs').textContent=formatNumber(data.totals.installs);
   resultsPanel.classList.remove('hidden');
   renderTableHeader();
-  sortAndRenderTable();
+  renderTable();
   updateSortIndicators();
 }
 function renderTableHeader(){
@@ -231,35 +293,35 @@ function renderTableHeader(){
         state.sortColumn = col;
         state.sortDirection = (col==='asset_name' || col==='campaign' || col==='account') ? 'asc' : 'desc';
       }
-      sortAndRenderTable();
       updateSortIndicators();
+      reloadSortedReport();
     });
   });
 }
-function sortAndRenderTable(){
-  const sorted=[...state.reportData].sort((a,b)=>{
-    let av=a[state.sortColumn], bv=b[state.sortColumn];
-    if(av===undefined || av===null) av='';
-    if(bv===undefined || bv===null) bv='';
-    if(typeof av==='string' && typeof bv==='string'){
-      av=av.toLowerCase();
-      bv=bv.toLowerCase();
-    }
-    if(av===bv) return 0;
-    const res = av > bv ? 1 : -1;
-    return state.sortDirection==='asc' ? res : -res;
-  });
-  resultsBody.innerHTML=sorted.map(r=>{
-    let row = `<td class="asset-name" title="${escapeHtml(r.asset_name)}">${escapeHtml(r.asset_name)}</td>`;
-    if(state.showAccount) row += `<td class="account-name" title="${escapeHtml(r.account||'')}">${escapeHtml(r.account||'')}</td>`;
-    if(state.showCampaign) row += `<td class="campaign-name" title="${escapeHtml(r.campaign||'')}">${escapeHtml(r.campaign||'')}</td>`;
-    row += `
-      <td class="numeric cost-cell">${formatCurrency(r.cost)}</td>
-      <td class="numeric impressions-cell">${formatNumber(r.impressions)}</td>
-      <td class="numeric installs-cell">${formatNumber(r.installs)}</td>
-    `;
-    return `<tr>${row}</tr>`;
-  }).join('');
+function renderReportRow(r){
+  let row = `<td class="asset-name" title="${escapeHtml(r.asset_name)}">${escapeHtml(r.asset_name)}</td>`;
+  if(state.showAccount) row += `<td class="account-name" title="${escapeHtml(r.account||'')}">${escapeHtml(r.account||'')}</td>`;
+  if(state.showCampaign) row += `<td class="campaign-name" title="${escapeHtml(r.campaign||'')}">${escapeHtml(r.campaign||'')}</td>`;
+  row += `
+    <td class="numeric cost-cell">${formatCurrency(r.cost)}</td>
+    <td class="numeric impressions-cell">${formatNumber(r.impressions)}</td>
+    <td class="numeric installs-cell">${formatNumber(r.installs)}</td>
+  `;
+  return `<tr>${row}</tr>`;
+}
+function renderTable(){
+  // Rows arrive already sorted by the server
+  resultsBody.innerHTML=state.reportData.map(renderReportRow).join('');
+  tableContainer.scrollTop=0;
+  updatePageInfo();
+}
+function appendTableRows(rows){
+  resultsBody.insertAdjacentHTML('beforeend', rows.map(renderReportRow).join(''));
+  updatePageInfo();
+}
+function updatePageInfo(){
+  pageInfo.textContent=`Showing ${formatNumber(state.reportData.length)} of ${formatNumber(state.reportCount)}`;
+  loadMoreBtn.classList.toggle('hidden', state.reportData.length>=state.reportCount);
 }
 function updateSortIndicators(){
   resultsThead.querySelectorAll('th.sortable').forEach(th=>{
@@ -269,13 +331,21 @@ function updateSortIndicators(){
     }
   });
 }
-function downloadCSV(){
-  if(!state.reportData.length) return;
+async function downloadCSV(){
+  if(!state.reportQuery || !state.reportData.length) return;
+  let rows=state.reportData;
+  if(rows.length<state.reportCount){
+    showLoading();
+    try{
+      rows=decodeColumnar((await fetchReportPage(0, null)).data);
+    }catch(e){showError('Failed to download report: '+e.message); return;}
+    finally{hideLoading();}
+  }
   let headers=['asset_name'];
   if(state.showAccount) headers.push('account');
   if(state.showCampaign) headers.push('campaign');
   headers.push('cost','impressions','installs');
-  const csv=[headers.join(','), ...state.reportData.map(r=>headers.map(h=>{
+  const csv=[headers.join(','), ...rows.map(r=>headers.map(h=>{
     let v=r[h]||''; if(typeof v==='string') v=`"${v.replace(/"/g,'""')}"`; return v;
   }).join(','))].join('\n');
   const blob=new Blob(['\ufeff'+csv],{type:'text/csv;charset=utf-8;'});
@@ -296,6 +366,7 @@ async function onUploadAccountChange() {
     const data = await response.json();
     if (!response.ok) throw new Error(data.detail || 'Failed to load campaigns');
     renderUploadCampaigns(data.campaigns);
+    showAccountErrors(data.errors, 'Campaigns');
   } catch (e) {
     uploadCampaignsContainer.innerHTML = `<div class="placeholder">Error: ${e.message}</div>`;
   }
@@ -343,21 +414,31 @@ async function createTestAdGroups() {
   if (!descriptions.length) return showError('Please enter at least one description');
 
   hideError(); showLoading();
+  const body = {
+    campaign_ids: campaignIds,
+    adgroup_name: adgroupName,
+    youtube_urls: youtubeUrls,
+    headlines: headlines,
+    descriptions: descriptions,
+    mode: uploadBatchModeCheckbox.checked ? 'batch' : 'sync'
+  };
   try {
-    const resp = await fetch('/api/upload', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ 
-        campaign_ids: campaignIds, 
-        adgroup_name: adgroupName, 
-        youtube_urls: youtubeUrls,
-        headlines: headlines,
-        descriptions: descriptions
-      })
-    });
-    const data = await resp.json();
-    if (!resp.ok) throw new Error(data.detail || 'Failed to create ad groups');
-    renderUploadResults(data.results);
+    if (body.mode === 'batch') {
+      const resp = await fetch('/api/upload', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+      });
+      const data = await resp.json();
+      if (!resp.ok) throw new Error(data.detail || 'Failed to create ad groups');
+      hideLoading();
+      await waitForUploadBatch(data.upload_id, data.max_wait);
+    } else {
+      const data = await runJob('/api/jobs/upload', body, p => {
+        setLoadingText(`Accounts ${p.accounts_done || 0}/${p.accounts_total || '?'} · ${p.campaigns_created || 0}/${p.campaigns_total || '?'} campaigns created`);
+      });
+      renderUploadResults(data.results);
+    }
   } catch (e) {
     showError('Failed to create ad groups: ' + e.message);
   } finally {
@@ -365,6 +446,30 @@ async function createTestAdGroups() {
   }
 }
 
+async function waitForUploadBatch(uploadId, maxWaitSeconds) {
+  uploadResults.classList.remove('hidden');
+  uploadLog.innerHTML = '<div class="upload-log-item"><div class="log-header">Batch jobs submitted, waiting for Google Ads to process them...</div></div>';
+  uploadBtn.disabled = true;
+  const deadline = Date.now() + (maxWaitSeconds || 7200) * 1000 + BATCH_DEADLINE_SLACK_MS;
+  try {
+    while (true) {
+      if (Date.now() > deadline) {
+        throw new Error('Batch upload did not finish in time; check the ad groups in Google Ads');
+      }
+      await new Promise(r => setTimeout(r, BATCH_POLL_MS));
+      const resp = await fetch(`/api/upload/batch/${uploadId}`);
+      const data = await resp.json();
+      if (!resp.ok) throw new Error(data.detail || 'Failed to get batch status');
+      if (data.status === 'done') {
+        renderUploadResults(data.results);
+        return;
+      }
+    }
+  } finally {
+    uploadBtn.disabled = false;
+  }
+}
+
 function renderUploadResults(results) {
   uploadResults.classList.remove('hidden');
   uploadLog.innerHTML = results.map(r => {
@@ -393,13 +498,70 @@ function renderUploadResults(results) {
   }).join('');
 }
 
+// ==================== JOBS ====================
+// Submit a background job and follow its progress over SSE; resolves with the job result.
+async function runJob(url, body, onProgress){
+  const resp=await fetch(url,{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify(body)});
+  const data=await resp.json();
+  if(!resp.ok) throw new Error(data.detail||'Failed to start job');
+  const jobId=data.job_id;
+  return new Promise((resolve, reject)=>{
+    const es=new EventSource(`/api/jobs/${jobId}/events`);
+    const finish=status=>{
+      es.close();
+      if(status.status==='done') resolve(status.result);
+      else reject(new Error(status.error||'Job failed'));
+    };
+    es.addEventListener('progress', e=>{ if(onProgress) onProgress(JSON.parse(e.data).progress||{}); });
+    es.addEventListener('done', e=>finish(JSON.parse(e.data)));
+    es.addEventListener('failed', e=>finish(JSON.parse(e.data)));
+    es.onerror=async ()=>{
+      // EventSource reconnects on its own; if it gave up, the result is still retrievable
+      if(es.readyState!==EventSource.CLOSED) return;
+      try{
+        const r=await fetch(`/api/jobs/${jobId}`); const s=await r.json();
+        if(!r.ok) throw new Error(s.detail||'Job lost');
+        if(s.status==='done'||s.status==='failed') finish(s); else reject(new Error('Lost connection to job '+jobId));
+      }catch(err){reject(err);}
+    };
+  });
+}
+
 // ==================== HELPERS ====================
+function decodeColumnar(table){
+  if(!table || table.format!=='columnar') return table||[];
+  const names=Object.keys(table.columns);
+  const rows=new Array(table.length);
+  for(let i=0;i<table.length;i++){
+    const r={};
+    for(const n of names){
+      const v=table.columns[n][i];
+      r[n]=table.dicts[n] ? table.dicts[n][v] : v;
+    }
+    rows[i]=r;
+  }
+  return rows;
+}
+function decodeColumnarChart(chart){
+  if(!chart || chart.format!=='columnar') return chart;
+  return {dates:chart.dates, series:chart.names.map((name,i)=>{
+    const s={name, dataPct:chart.dataPct[i], dataCost:chart.dataCost[i]};
+    if(chart.cvr) s.cvr=chart.cvr[i];
+    return s;
+  })};
+}
 function formatCurrency(v){return '$'+v.toLocaleString('en-US',{minimumFractionDigits:2,maximumFractionDigits:2});}
 function formatNumber(v){return v.toLocaleString('en-US');}
 function escapeHtml(t){const d=document.createElement('div'); d.textContent=t; return d.innerHTML;}
-function showLoading(){loadingOverlay.classList.remove('hidden'); loadBtn.disabled=true; uploadBtn.disabled=true;}
+function showLoading(){setLoadingText('Loading data...'); loadingOverlay.classList.remove('hidden'); loadBtn.disabled=true; uploadBtn.disabled=true;}
+function setLoadingText(t){loadingText.textContent=t;}
 function hideLoading(){loadingOverlay.classList.add('hidden'); loadBtn.disabled=false; uploadBtn.disabled=false;}
 function showError(m){errorMessage.textContent=m; errorMessage.classList.remove('hidden');}
+// Per-account Google Ads failures come back next to partial results
+function showAccountErrors(errors, what){
+  if(!errors || !errors.length) return;
+  showError(`${what} incomplete, failed accounts: `+errors.map(e=>`${e.account_id} (${e.error})`).join('; '));
+}
 function hideError(){errorMessage.classList.add('hidden');}
 
 // ==================== DASHBOARD TAB ====================
@@ -667,6 +829,8 @@ function buildStacked100Option(dates, series){
 // Store dashboard data for interactivity
 let _dashboardData = { google: null, applovin: null, mintegral: null };
 let _selectedSeries = { google: null, applovin: null, mintegral: null };
+// A newer load abandons the stream of the previous one
+let _dashboardLoadId = 0;
 
 async function loadDashboard(){
   // Get dates from flatpickr
@@ -678,6 +842,7 @@ async function loadDashboard(){
   
   const platform = dashPlatformSelect ? dashPlatformSelect.value : 'Android';
   const adjustAppToken = dashAppSelect ? dashAppSelect.value : '';
+  const granularity = dashGranularitySelect ? dashGranularitySelect.value : 'auto';
   const accountIds = getSelectedDashAccountIds();
 
   if(!sd || !ed) return showError('Please select date range');
@@ -694,8 +859,13 @@ async function loadDashboard(){
   setEmptyList(listApplovinEl);
   setEmptyList(listMintegralEl);
 
+  _dashboardData = { google: null, applovin: null, mintegral: null };
+  _selectedSeries = { google: null, applovin: null, mintegral: null };
+  const loadId = ++_dashboardLoadId;
+
   try{
-    const resp = await fetch('/api/dashboard', {
+    // Streamed as NDJSON: each chart is rendered as soon as the server has it
+    const resp = await fetch('/api/dashboard/stream', {
       method:'POST',
       headers:{
         'Content-Type':'application/json'
@@ -707,29 +877,32 @@ async function loadDashboard(){
         end_date: ed,
         platform: platform,
         adjust_app_token: adjustAppToken,
-        account_ids: accountIds
+        account_ids: accountIds,
+        granularity: granularity,
+        response_format: 'columnar'
       })
     });
-    const data = await resp.json();
-    if(!resp.ok) throw new Error(data.detail||'Failed to load dashboard');
-
-    _dashboardData = { google: data.google, applovin: data.applovin, mintegral: data.mintegral };
-    _selectedSeries = { google: null, applovin: null, mintegral: null };
-
-    // CVR Chart
-    if (data.cvr && data.cvr.dates) {
-      _chartCvr.setOption(buildCvrLineChart(data.cvr.dates, data.cvr), true);
-    } else {
-      setEmptyChart(_chartCvr, 'CVR', 'No data');
+    if(!resp.ok){
+      const data = await resp.json().catch(()=>({}));
+      throw new Error(data.detail||'Failed to load dashboard');
     }
+    // The cards show their own "Loading..." from here on
+    hideLoading();
 
-    // Google
-    renderDashboardCard('google', data.google, _chartGoogle, listGoogleEl);
-    // AppLovin
-    renderDashboardCard('applovin', data.applovin, _chartApplovin, listApplovinEl);
-    // Mintegral
-    renderDashboardCard('mintegral', data.mintegral, _chartMintegral, listMintegralEl);
-
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while(true){
+      const {done, value} = await reader.read();
+      if(loadId !== _dashboardLoadId){ reader.cancel(); return; }
+      buffer += decoder.decode(value || new Uint8Array(), {stream: !done});
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      for(const line of lines){
+        if(line.trim()) onDashboardEvent(JSON.parse(line));
+      }
+      if(done) break;
+    }
   }catch(e){
     showError('Failed to load dashboard: ' + e.message);
   }finally{
@@ -737,6 +910,31 @@ async function loadDashboard(){
   }
 }
 
+const _dashboardCards = {
+  google: () => [_chartGoogle, listGoogleEl],
+  applovin: () => [_chartApplovin, listApplovinEl],
+  mintegral: () => [_chartMintegral, listMintegralEl]
+};
+
+function onDashboardEvent(e){
+  if(e.event === 'error') throw new Error(e.data.detail);
+  if(e.event === 'cvr'){
+    // CVR Chart
+    if (e.data && e.data.dates) {
+      _chartCvr.setOption(buildCvrLineChart(e.data.dates, e.data), true);
+    } else {
+      setEmptyChart(_chartCvr, 'CVR', 'No data');
+    }
+    return;
+  }
+  if(!_dashboardCards[e.event]) return;
+  const data = decodeColumnarChart(e.data.chart);
+  _dashboardData[e.event] = data;
+  const [chart, listEl] = _dashboardCards[e.event]();
+  renderDashboardCard(e.event, data, chart, listEl);
+  if(e.event === 'google') showAccountErrors(e.data.errors, 'Google data');
+}
+
 function setEmptyList(listEl) {
   if (!listEl) return;
   listEl.innerHTML = '<div class="dashboard-list-empty">No data</div>';
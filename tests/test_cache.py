@@ -0,0 +1,32 @@
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return app.SqliteCache(str(tmp_path / "cache.sqlite3"), "test", ttl=60)
+    return app.TTLCache(ttl=60)
+
+
+def test_add_claims_a_key_once(store):
+    assert store.add("2024-01-01", 1)
+    assert not store.add("2024-01-01", 2)
+    assert store.get("2024-01-01") == 1
+
+
+def test_add_replaces_an_expired_entry(store):
+    store.set("2024-01-01", 1, ttl=0.01)
+    time.sleep(0.05)
+    assert store.add("2024-01-01", 2)
+    assert store.get("2024-01-01") == 2
+
+
+def test_sqlite_add_is_atomic_across_connections(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    workers = [app.SqliteCache(path, "prewarm_runs", ttl=60) for _ in range(4)]
+    assert [w.add("2024-01-01", i) for i, w in enumerate(workers)] == [True, False, False, False]
+    assert workers[3].get("2024-01-01") == 0
@@ -0,0 +1,82 @@
+from datetime import date
+
+import app
+
+TODAY = date(2024, 3, 20)
+
+
+def _index(days, rows, fetched_at=0.0, today=TODAY):
+    index = app.CampaignActivity()
+    index.update(days, rows, fetched_at, today=today)
+    return index
+
+
+def test_active_campaigns_in_range():
+    index = _index(app._days_between("2024-03-01", "2024-03-05"), [
+        ("2024-03-01", "1", "Alpha"), ("2024-03-04", "1", "Alpha"),
+        ("2024-03-03", "2", "Beta"), ("2024-03-05", "3", "Gamma"),
+    ])
+    assert sorted(index.active("2024-03-01", "2024-03-05")) == [("1", "Alpha"), ("2", "Beta"), ("3", "Gamma")]
+    assert index.active("2024-03-02", "2024-03-02") == []
+    assert sorted(index.active("2024-03-02", "2024-03-03")) == [("2", "Beta")]
+    assert index.active("2024-02-01", "2024-02-28") == []
+    assert index.days["1"] == ["2024-03-01", "2024-03-04"]
+
+
+def test_restated_day_replaces_what_was_known():
+    index = _index(["2024-03-04"], [("2024-03-04", "1", "Alpha"), ("2024-03-04", "2", "Beta")])
+    index.update(["2024-03-04"], [("2024-03-04", "2", "Beta renamed"), ("2024-03-04", "3", "Gamma")], 1.0, today=TODAY)
+    assert sorted(index.active("2024-03-04", "2024-03-04")) == [("2", "Beta renamed"), ("3", "Gamma")]
+    assert index.days["1"] == []
+    assert index.by_day["2024-03-04"] == {"2", "3"}
+
+
+def test_rows_outside_the_updated_days_are_ignored():
+    index = _index(["2024-03-04"], [("2024-03-04", "1", "Alpha"), ("2024-03-05", "2", "Beta")])
+    assert index.active("2024-03-01", "2024-03-31") == [("1", "Alpha")]
+    assert "2024-03-05" not in index.loaded
+
+
+def test_partly_loaded_range_only_reports_missing_days():
+    index = _index(app._days_between("2024-03-01", "2024-03-05"), [])
+    assert index.stale_days(app._days_between("2024-02-28", "2024-03-07"), now=1.0) == [
+        "2024-02-28", "2024-02-29", "2024-03-06", "2024-03-07"]
+
+
+def test_day_fetched_while_live_is_refetched_once_after_it_settles(monkeypatch):
+    monkeypatch.setattr(app, "CAMPAIGN_ACTIVITY_LIVE_DAYS", 3)
+    monkeypatch.setattr(app, "CAMPAIGN_ACTIVITY_REFRESH", 600)
+    # Fetched early on the day itself
+    index = _index(["2024-03-20"], [], fetched_at=0.0, today=TODAY)
+    assert index.stale_days(["2024-03-20"], now=100.0) == []
+    # Days later nobody touched it while live; the old fetch must not be final
+    assert index.stale_days(["2024-03-20"], now=10 * 86400.0) == ["2024-03-20"]
+    index.update(["2024-03-20"], [("2024-03-20", "1", "Late starter")], 10 * 86400.0, today=date(2024, 3, 30))
+    assert index.stale_days(["2024-03-20"], now=20 * 86400.0) == []
+    assert index.active("2024-03-20", "2024-03-20") == [("1", "Late starter")]
+
+
+def test_active_campaigns_fetches_only_missing_span(monkeypatch):
+    monkeypatch.setattr(app, "_campaign_activity", {})
+    spans = []
+
+    def fetch(client, account_id, start_date, end_date):
+        spans.append((start_date, end_date))
+        return [(d, "1", "Alpha") for d in app._days_between(start_date, end_date)]
+    monkeypatch.setattr(app, "fetch_campaign_activity", fetch)
+
+    assert app.active_campaigns(None, "42", "2020-01-01", "2020-01-10") == [("1", "Alpha")]
+    assert app.active_campaigns(None, "42", "2020-01-03", "2020-01-05") == [("1", "Alpha")]
+    app.active_campaigns(None, "42", "2020-01-08", "2020-01-15")
+    assert spans == [("2020-01-01", "2020-01-10"), ("2020-01-11", "2020-01-15")]
+
+
+def test_campaigns_endpoint_rejects_reversed_range():
+    from fastapi.testclient import TestClient
+    app.app.dependency_overrides[app.get_current_user] = lambda: {"email": "test@example.com"}
+    try:
+        response = TestClient(app.app).get("/api/campaigns", params={
+            "account_ids": "1", "start_date": "2024-03-05", "end_date": "2024-03-01"})
+    finally:
+        app.app.dependency_overrides.clear()
+    assert response.status_code == 400
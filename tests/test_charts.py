@@ -0,0 +1,44 @@
+import numpy as np
+
+import charts
+
+
+def test_interner_codes_normalized_names_and_normalizes_each_raw_name_once():
+    calls = []
+
+    def normalize(raw):
+        calls.append(raw)
+        return raw.rsplit(" ", 1)[0]
+    interner = charts.Interner(normalize)
+    codes = [interner.code(raw) for raw in ("Video 9x16", "Video 1x1", "Other 9x16", "Video 9x16", "Video 1x1")]
+    assert codes == [0, 0, 1, 0, 0]
+    assert interner.names == ["Video", "Other"]
+    assert calls == ["Video 9x16", "Video 1x1", "Other 9x16"]
+
+
+def test_chart_columns_map_days_into_buckets():
+    dates = ["2024-01-01", "2024-01-08"]
+    bucket_of = {"2024-01-02": "2024-01-01", "2024-01-09": "2024-01-08", "2024-01-15": "2024-01-15"}
+    columns = charts.ChartColumns(dates, charts.Interner(), bucket_of)
+    for day in ("2024-01-01", "2024-01-02", "2024-01-09", "2024-01-15", "2023-12-31"):
+        columns.add(day, "A", 1.0, 10, 1)
+    # Days outside the range, or in a bucket that is not charted, get -1
+    assert list(columns.date_idx) == [0, 0, 1, -1, -1]
+    assert len(columns) == 5
+
+
+def test_from_rows_coerces_values_like_pandas():
+    rows = [
+        {"creative": "A", "day": "2024-01-01", "cost": "1.5", "impressions": None, "installs": float("nan")},
+        {"creative": None, "day": "2024-01-01", "cost": "n/a", "impressions": "7", "installs": 2},
+    ]
+    columns = charts.ChartColumns.from_rows(["2024-01-01"], rows, "creative", "day", "cost")
+    assert columns.creatives.names == ["A", ""]
+    assert list(columns.cost) == [1.5, 0.0]
+    assert list(columns.impressions) == [0.0, 7.0] and list(columns.installs) == [0.0, 2.0]
+
+    date_idx, codes, cost, impressions, installs, name_rank = columns.stacked_arrays()
+    # Only the named row with a positive cost is charted
+    assert list(codes) == [0] and list(cost) == [1.5]
+    assert list(name_rank) == [1, 0]
+    np.testing.assert_array_equal(charts.cvr_by_day_from_arrays(1, *columns.cvr_arrays()), [round(2 / 7 * 100, 4)])
@@ -0,0 +1,33 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import app
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(app, "CPU_POOL_WORKERS", 1)
+    app.start_cpu_pool()
+    yield app._cpu_pool
+    app.stop_cpu_pool()
+
+
+def test_pool_workers_import_only_the_chart_module(pool):
+    modules = pool.submit(eval, "sorted(m for m in __import__('sys').modules if m in ('app', 'charts', 'fastapi', 'pandas'))")
+    assert modules.result(timeout=60) == ["charts"]
+
+
+def test_pool_and_inline_charts_agree(pool):
+    dates = ["2024-01-01", "2024-01-02"]
+    columns = app.ChartColumns(dates, app.Interner())
+    for day, creative, cost in (("2024-01-01", "A", 3.0), ("2024-01-02", "B", 1.0), ("2024-01-02", "A", 1.0)):
+        columns.add(day, creative, cost, 10, 1)
+    pooled = asyncio.run(app.stacked_100_on_pool(columns, 5, include_cvr=True))
+    inline = app._stacked_100_chart(dates, columns.creatives.names,
+                                    app.stacked_100_from_arrays(len(dates), *columns.stacked_arrays(), 5), True)
+    assert [s["name"] for s in pooled["series"]] == ["A", "B"]
+    for got, want in zip(pooled["series"], inline["series"]):
+        np.testing.assert_array_equal(got["dataPct"], want["dataPct"])
+    np.testing.assert_array_equal(asyncio.run(app.cvr_by_day_on_pool(columns)), [10.0, 10.0])
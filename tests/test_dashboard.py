@@ -0,0 +1,172 @@
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import app
+
+
+def test_resolve_granularity():
+    assert app._resolve_granularity("auto", "2024-01-01", "2024-03-02") == "day"
+    assert app._resolve_granularity("auto", "2024-01-01", "2024-03-03") == "week"
+    assert app._resolve_granularity("auto", "2024-01-01", "2024-12-31") == "month"
+    assert app._resolve_granularity("Month", "2024-01-01", "2024-01-02") == "month"
+    with pytest.raises(HTTPException):
+        app._resolve_granularity("year", "2024-01-01", "2024-01-02")
+
+
+def test_week_and_month_buckets():
+    weeks, week_of = app._make_date_buckets("2024-01-06", "2024-01-15", "week")
+    assert weeks == ["2024-01-01", "2024-01-08", "2024-01-15"]
+    assert week_of["2024-01-07"] == "2024-01-01" and week_of["2024-01-08"] == "2024-01-08"
+
+    months, month_of = app._make_date_buckets("2024-01-30", "2024-02-02", "month")
+    assert months == ["2024-01", "2024-02"]
+    assert month_of["2024-02-01"] == "2024-02"
+
+
+def test_bucketed_shares_are_float_and_per_bucket():
+    dates, bucket_of = app._make_date_buckets("2024-01-01", "2024-01-14", "week")
+    columns = app.ChartColumns(dates, app.Interner(), bucket_of)
+    columns.add("2024-01-01", "A", 1.0, 0, 0)
+    columns.add("2024-01-02", "A", 2.0, 0, 0)
+    columns.add("2024-01-03", "B", 1.0, 0, 0)
+    chart = app._stacked_100_chart(dates, columns.creatives.names,
+                                   app.stacked_100_from_arrays(len(dates), *columns.stacked_arrays(), 5), False)
+
+    a, b = chart["series"]
+    assert a["name"] == "A" and list(a["dataCost"]) == [3.0, 0.0] and list(a["dataPct"]) == [75.0, 0.0]
+    assert b["dataPct"].dtype == np.float64 and list(b["dataPct"]) == [25.0, 0.0]
+
+
+def _pandas_stacked_100(dates, rows, key_field, date_field, value_field, top_n, include_cvr=False):
+    """The pandas implementation stacked_100_from_arrays replaced, with ties at the top-N cut ordered by name"""
+    if not rows:
+        return {"dates": dates, "series": []}
+    df = pd.DataFrame(rows)
+    df[value_field] = pd.to_numeric(df[value_field], errors="coerce").fillna(0.0)
+    df[date_field] = df[date_field].astype(str)
+    df[key_field] = df[key_field].fillna("").astype(str)
+    df["impressions"] = pd.to_numeric(df["impressions"], errors="coerce").fillna(0)
+    df["installs"] = pd.to_numeric(df["installs"], errors="coerce").fillna(0)
+    df = df[(df[key_field] != "") & (df[value_field] > 0)]
+    if df.empty:
+        return {"dates": dates, "series": []}
+
+    # groupby sorts by name, so a stable sort keeps equal totals in name order
+    totals = df.groupby(key_field)[value_field].sum().sort_values(ascending=False, kind="stable").head(top_n)
+    top_keys = list(totals.index)
+    df_filtered = df[df[key_field].isin(top_keys)]
+    pivot = df_filtered.pivot_table(index=date_field, columns=key_field, values=value_field, aggfunc="sum", fill_value=0.0)
+    pivot = pivot.reindex(dates, fill_value=0.0).astype(float)
+    daily_total = pivot.sum(axis=1)
+    pct = pivot.div(daily_total.where(daily_total != 0), axis=0).fillna(0.0) * 100.0
+    agg = df_filtered.groupby(key_field).agg({"impressions": "sum", "installs": "sum"})
+
+    series = []
+    for k in top_keys:
+        item = {"name": k, "dataPct": pct[k].to_numpy(dtype=float), "dataCost": pivot[k].to_numpy(dtype=float)}
+        if include_cvr:
+            imp, inst = agg.loc[k, "impressions"], agg.loc[k, "installs"]
+            item["cvr"] = round(inst / imp * 100, 3) if imp > 0 else 0.0
+        series.append(item)
+    return {"dates": dates, "series": series}
+
+
+STACKED_ROWS = [
+    # C is seen before B and ties with it at 20, on the top-2 cut
+    {"creative": "C", "day": "2024-01-01", "cost": 20, "impressions": 400, "installs": 8},
+    {"creative": "A", "day": "2024-01-01", "cost": "10.5", "impressions": 1000, "installs": 20},
+    {"creative": "B", "day": "2024-01-02", "cost": 12, "impressions": None, "installs": 3},
+    {"creative": "B", "day": "2024-01-01", "cost": 8, "impressions": 200, "installs": 1},
+    {"creative": "A", "day": "2024-01-02", "cost": 15, "impressions": float("nan"), "installs": 2},
+    # Outside the range: counts towards the ranking and CVR only
+    {"creative": "A", "day": "2023-12-31", "cost": 4.5, "impressions": 500, "installs": 10},
+    {"creative": "D", "day": "2023-12-31", "cost": 100, "impressions": 0, "installs": 0},
+    # Dropped: zero, negative and unparseable costs, empty names
+    {"creative": "E", "day": "2024-01-01", "cost": 0, "impressions": 50, "installs": 1},
+    {"creative": "E", "day": "2024-01-02", "cost": float("nan"), "impressions": 50, "installs": 1},
+    {"creative": "F", "day": "2024-01-02", "cost": "n/a", "impressions": 50, "installs": 1},
+    {"creative": "G", "day": "2024-01-02", "cost": -3, "impressions": 50, "installs": 1},
+    {"creative": "", "day": "2024-01-01", "cost": 50, "impressions": 50, "installs": 1},
+    {"creative": None, "day": "2024-01-02", "cost": 50, "impressions": 50, "installs": 1},
+]
+
+
+@pytest.mark.parametrize("top_n", [0, 1, 2, 3, 10])
+@pytest.mark.parametrize("rows", [STACKED_ROWS, STACKED_ROWS[7:], []], ids=["mixed", "all-dropped", "empty"])
+def test_stacked_100_matches_pandas(rows, top_n):
+    # 2024-01-03 has no spend at all
+    dates = ["2024-01-01", "2024-01-02", "2024-01-03"]
+    expected = _pandas_stacked_100(dates, rows, "creative", "day", "cost", top_n, include_cvr=True)
+    chart = app._build_stacked_100(dates, rows, "creative", "day", "cost", top_n, include_cvr=True)
+
+    assert [s["name"] for s in chart["series"]] == [s["name"] for s in expected["series"]]
+    for got, want in zip(chart["series"], expected["series"]):
+        np.testing.assert_allclose(got["dataCost"], want["dataCost"])
+        np.testing.assert_allclose(got["dataPct"], want["dataPct"])
+        assert got["cvr"] == want["cvr"]
+
+
+def test_ties_at_the_cut_are_broken_by_name():
+    chart = app._build_stacked_100(["2024-01-01", "2024-01-02"], STACKED_ROWS, "creative", "day", "cost", 3)
+    assert [s["name"] for s in chart["series"]] == ["D", "A", "B"]
+
+
+@pytest.fixture
+def dashboard_client(monkeypatch):
+    monkeypatch.setenv("ADJUST_API_TOKEN", "token")
+    monkeypatch.setattr(app, "AUTH_BYPASS_EMAIL", "user@example.com")
+
+    def google(body, dates, bucket_of, platform_kw):
+        # Slower than Adjust, so its chart is streamed last
+        time.sleep(0.3)
+        columns = app.ChartColumns(dates, app.Interner(), bucket_of)
+        columns.add("2024-01-01", "Google video", 5.0, 100, 2)
+        return columns, []
+
+    def adjust(channel_id, **kwargs):
+        return [{"day": "2024-01-02", "creative_network": f"{channel_id} video", "campaign": "UA Android",
+                 "cost": 3.0, "impressions": 50, "installs": 1}], {"source": "test"}
+    monkeypatch.setattr(app, "_dashboard_google_columns", google)
+    monkeypatch.setattr(app, "_cached_adjust_creative_daily_cost", adjust)
+    return TestClient(app.app)
+
+
+DASHBOARD_BODY = {"adgroup_type": "main", "start_date": "2024-01-01", "end_date": "2024-01-02", "platform": "Android",
+                  "adjust_app_token": "app", "account_ids": ["1"]}
+
+
+def test_dashboard_stream_sends_charts_as_they_finish(dashboard_client):
+    response = dashboard_client.post("/api/dashboard/stream", json=DASHBOARD_BODY)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    events = [json.loads(line) for line in response.text.splitlines()]
+    names = [e["event"] for e in events]
+    assert names[0] == "start" and events[0]["data"] == {"granularity": "day"}
+    assert sorted(names[1:3]) == ["applovin", "mintegral"] and names[3:] == ["google", "cvr"]
+
+    by_name = {e["event"]: e["data"] for e in events}
+    whole = dashboard_client.post("/api/dashboard", json=DASHBOARD_BODY).json()
+    assert whole["granularity"] == "day"
+    for name in ("google", "applovin", "mintegral"):
+        assert by_name[name]["chart"] == whole[name]
+    assert by_name["cvr"] == whole["cvr"]
+    assert by_name["applovin"]["meta"] == whole["meta"]["applovin"]
+    assert [s["name"] for s in whole["google"]["series"]] == ["Google video"]
+
+
+def test_dashboard_stream_reports_late_failures_as_an_event(dashboard_client, monkeypatch):
+    def fail(*args):
+        raise ValueError("boom")
+    monkeypatch.setattr(app, "_dashboard_google_columns", fail)
+    response = dashboard_client.post("/api/dashboard/stream", json=DASHBOARD_BODY)
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert events[0]["event"] == "start"
+    assert events[-1] == {"event": "error", "data": {"detail": "boom"}}
+    # Validation errors still fail before the stream starts
+    assert dashboard_client.post("/api/dashboard/stream", json=dict(DASHBOARD_BODY, adjust_app_token="")).status_code == 400
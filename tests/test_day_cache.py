@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+
+import pytest
+
+import app
+
+
+def _day(offset: int) -> str:
+    return (date.today() - timedelta(days=offset)).isoformat()
+
+
+@pytest.fixture
+def adjust_fetches(monkeypatch):
+    monkeypatch.setattr(app, "_day_rows_cache", app.MeteredCache(app.TTLCache(ttl=3600, max_entries=1000), "day_rows"))
+    monkeypatch.setattr(app, "_adjust_cache", app.MeteredCache(app.TTLCache(ttl=3600), "adjust"))
+    monkeypatch.setattr(app, "ADJUST_MATURE_DAYS", 3)
+    fetches = []
+
+    def fetch(api_token, app_token, channel_id, start_date, end_date, platform):
+        fetches.append((start_date, end_date))
+        return [{"day": d, "cost": 1.0} for d in app._make_date_range(start_date, end_date)], {}
+    monkeypatch.setattr(app, "_fetch_adjust_creative_daily_cost", fetch)
+    return fetches
+
+
+def _cached(start_date, end_date):
+    return app._cached_adjust_creative_daily_cost("token", "app", "partner_7", start_date, end_date, "Android")
+
+
+def test_recent_adjust_days_stay_out_of_the_day_cache(adjust_fetches):
+    _cached(_day(10), _day(1))
+    source = ("adjust", "app", "partner_7", "Android")
+    assert app._day_rows_cache.get(source + (_day(4),)) is not None
+    for recent in (_day(3), _day(2), _day(1)):
+        assert app._day_rows_cache.get(source + (recent,)) is None
+
+
+def test_settled_days_come_from_the_day_cache(adjust_fetches):
+    _cached(_day(10), _day(1))
+    rows, debug = _cached(_day(8), _day(0))
+    assert debug == {"source": "day_cache", "cached_days": 5}
+    # Only the still-restating days and today are fetched again
+    assert adjust_fetches == [(_day(10), _day(1)), (_day(3), _day(0))]
+    assert [r["day"] for r in rows] == app._make_date_range(_day(8), _day(0))
+
+
+def test_prewarm_stores_only_settled_adjust_days(adjust_fetches, monkeypatch):
+    monkeypatch.setattr(app, "get_client", lambda: None)
+    monkeypatch.setattr(app, "fetch_accounts", lambda: [])
+    monkeypatch.setattr(app, "PREWARM_ADJUST_APPS", "app:Android")
+    monkeypatch.setattr(app, "PREWARM_ADJUST_CHANNELS", ("partner_7",))
+    app.prewarm(days=7)
+    assert adjust_fetches == [(_day(7), _day(4))]
+    source = ("adjust", "app", "partner_7", "Android")
+    assert app._day_rows_cache.get(source + (_day(4),)) is not None
+    assert app._day_rows_cache.get(source + (_day(3),)) is None
+
+
+@pytest.fixture
+def google_fetches(monkeypatch):
+    monkeypatch.setattr(app, "_day_rows_cache", app.MeteredCache(app.TTLCache(ttl=3600, max_entries=1000), "day_rows"))
+    monkeypatch.setattr(app, "GOOGLE_MATURE_DAYS", 3)
+    fetches = []
+
+    def fetch(client, account_id, start_date, end_date):
+        fetches.append((start_date, end_date))
+        return [{"day": d, "cost_micros": 1} for d in app._make_date_range(start_date, end_date)]
+    monkeypatch.setattr(app, "fetch_google_day_rows", fetch)
+    return fetches
+
+
+def test_prewarm_stores_only_settled_google_days(google_fetches, monkeypatch):
+    monkeypatch.setattr(app, "get_client", lambda: None)
+    monkeypatch.setattr(app, "fetch_accounts", lambda: [{"id": "123", "name": "Acc"}])
+    monkeypatch.setattr(app, "fetch_campaign_activity", lambda client, account_id, start, end: [])
+    monkeypatch.setattr(app, "_campaign_activity", {})
+    monkeypatch.setattr(app, "PREWARM_ADJUST_APPS", "")
+    app.prewarm(days=7)
+    assert google_fetches == [(_day(7), _day(4))]
+    assert app._day_rows_cache.get(("google", "123", _day(4))) is not None
+    assert app._day_rows_cache.get(("google", "123", _day(3))) is None
+
+
+def test_recent_google_days_are_fetched_live(google_fetches):
+    for offset in range(4, 9):
+        app._day_rows_cache.set(("google", "123", _day(offset)), [{"day": _day(offset), "cost_micros": 2}])
+    rows = app.google_rows_from_day_cache(None, "123", _day(8), _day(0))
+    assert google_fetches == [(_day(3), _day(0))]
+    assert [r["day"] for r in rows] == app._make_date_range(_day(8), _day(0))
+    assert [r["cost_micros"] for r in rows] == [2] * 5 + [1] * 4
+    # A settled day missing from the cache means a full fetch by the caller
+    assert app.google_rows_from_day_cache(None, "123", _day(9), _day(0)) is None
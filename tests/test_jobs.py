@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+import app
+
+
+class RecordingStore(app.TTLCache):
+    """Records which thread each write ran on"""
+
+    def __init__(self):
+        super().__init__(ttl=60)
+        self.writers = []
+
+    def set(self, key, value):
+        self.writers.append((value["status"], threading.get_ident()))
+        super().set(key, value)
+
+
+def test_job_store_writes_stay_off_the_event_loop(monkeypatch):
+    store = RecordingStore()
+    monkeypatch.setattr(app, "_jobs", store)
+
+    async def main():
+        async def run(progress):
+            return {"rows": list(range(1000))}
+        job = await app.submit_job("report", {"email": "a@example.com"}, run)
+        await asyncio.gather(*app._job_tasks)
+        return job, threading.get_ident()
+
+    job, loop_thread = asyncio.run(main())
+    assert job["status"] == "done"
+    assert store.get(job["job_id"])["result"] == {"rows": list(range(1000))}
+    assert [status for status, _ in store.writers] == ["queued", "running", "done"]
+    assert all(thread != loop_thread for _, thread in store.writers)
+
+
+def test_failed_job_records_the_error(monkeypatch):
+    monkeypatch.setattr(app, "_jobs", RecordingStore())
+
+    async def main():
+        async def run(progress):
+            raise app.HTTPException(status_code=400, detail="bad range")
+        job = await app.submit_job("report", {"email": "a@example.com"}, run)
+        await asyncio.gather(*app._job_tasks)
+        return job
+
+    job = asyncio.run(main())
+    assert (job["status"], job["error"], job["result"]) == ("failed", "bad range", None)
+
+
+def test_job_lookup_is_scoped_to_the_owner(monkeypatch):
+    store = RecordingStore()
+    monkeypatch.setattr(app, "_jobs", store)
+    store.set("j1", {"job_id": "j1", "owner": "a@example.com", "status": "done"})
+    assert asyncio.run(app._get_job("j1", {"email": "a@example.com"}))["job_id"] == "j1"
+    for job_id, email in (("j1", "b@example.com"), ("j2", "a@example.com")):
+        try:
+            asyncio.run(app._get_job(job_id, {"email": email}))
+        except app.HTTPException as e:
+            assert e.status_code == 404
+        else:
+            raise AssertionError("expected 404")
+
+
+def test_progress_is_published_at_most_every_interval(monkeypatch):
+    store = RecordingStore()
+    monkeypatch.setattr(app, "_jobs", store)
+    progress = app.JobProgress({"job_id": "j", "status": "running", "progress": {}})
+    for _ in range(100):
+        progress.add(rows_fetched=10)
+    assert progress.job["progress"] == {"rows_fetched": 1000}
+    assert len(store.writers) == 1
+    progress.update(status="done")
+    assert [status for status, _ in store.writers] == ["running", "done"]
+
+
+def test_report_job_endpoints(monkeypatch):
+    monkeypatch.setattr(app, "_jobs", app.MeteredCache(app.TTLCache(ttl=60), "jobs"))
+    monkeypatch.setattr(app, "AUTH_BYPASS_EMAIL", "a@example.com")
+
+    def build_report(request, progress):
+        progress.set(accounts_total=1)
+        progress.add(accounts_done=1)
+        return {"data": [{"asset_name": "Video"}], "total_count": 1}
+    monkeypatch.setattr(app, "build_report", build_report)
+
+    with TestClient(app.app) as client:
+        body = {"account_ids": ["1"], "campaign_ids": [], "adgroup_type": "main",
+                "start_date": "2024-01-01", "end_date": "2024-01-02"}
+        submitted = client.post("/api/jobs/report", json=body).json()
+        assert submitted["status"] == "queued"
+        events = client.get(f"/api/jobs/{submitted['job_id']}/events").text
+        assert events.startswith("event: ") and "event: done\ndata: " in events
+        status = client.get(f"/api/jobs/{submitted['job_id']}").json()
+        assert status["status"] == "done" and status["progress"] == {"accounts_total": 1, "accounts_done": 1}
+        assert status["result"]["total_count"] == 1 and "owner" not in status
+
+        monkeypatch.setattr(app, "AUTH_BYPASS_EMAIL", "b@example.com")
+        assert client.get(f"/api/jobs/{submitted['job_id']}").status_code == 404
+        upload = {"campaign_ids": ["1_2"], "adgroup_name": "ag", "youtube_urls": ["dQw4w9WgXcQ"],
+                  "headlines": ["h"], "descriptions": ["d"], "mode": "batch"}
+        assert client.post("/api/jobs/upload", json=upload).status_code == 400
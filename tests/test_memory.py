@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import app
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    """A monitor stuck at 500 MB RSS against a 400 MB budget"""
+    monkeypatch.setattr(app, "MEMORY_BUDGET_MB", 400.0)
+    monkeypatch.setattr(app, "current_rss_mb", lambda: 500.0)
+    monitor = app.MemoryMonitor(interval=1)
+    monkeypatch.setattr(app, "memory_monitor", monitor)
+    return monitor
+
+
+def test_admits_when_nothing_else_is_in_flight(monitor):
+    assert monitor.admit()
+    record = monitor.begin("POST", "/api/report")
+    assert not monitor.admit()
+    assert monitor.admit(own=1)
+    monitor.end(record, 200)
+    assert monitor.admit()
+
+
+def test_relieve_evicts_at_most_once_per_interval(monitor, monkeypatch):
+    evictions = []
+    cache = app.TTLCache(ttl=60, max_entries=100)
+    monkeypatch.setattr(cache, "evict", lambda fraction: evictions.append(fraction))
+    monkeypatch.setitem(app._cache_stores, "report", cache)
+    assert not monitor.relieve()
+    assert not monitor.relieve()
+    assert evictions == [0.5]
+
+
+def test_timing_a_phase_never_rejects(monitor):
+    token = app._request_timings.set(app.RequestTimings())
+    records = [monitor.begin("POST", "/api/upload"), monitor.begin("POST", "/api/report")]
+    try:
+        for phase in ("ratelimit", "mutate", "rows", "pandas"):
+            with app.timed(phase):
+                pass
+        with pytest.raises(HTTPException) as error:
+            monitor.check()
+        assert error.value.status_code == 503
+        assert monitor.rejected == 1
+    finally:
+        for record in records:
+            monitor.end(record, 200)
+        app._request_timings.reset(token)
+
+
+def test_dashboard_channel_over_budget_is_a_503_not_an_adjust_error(monitor, monkeypatch):
+    monkeypatch.setenv("ADJUST_API_TOKEN", "token")
+    monkeypatch.setattr(app, "_dashboard_google_columns", lambda *args: (app.ChartColumns([], app.Interner()), []))
+    monkeypatch.setattr(app, "_cached_adjust_creative_daily_cost", lambda **kwargs: ([], {}))
+    body = app.DashboardRequest(adgroup_type="main", start_date="2024-01-01", end_date="2024-01-02", platform="Android",
+                                adjust_app_token="app", account_ids=[])
+    # Another request is running besides this one
+    records = [monitor.begin("POST", "/api/dashboard"), monitor.begin("POST", "/api/report")]
+
+    async def collect():
+        _, parts = app.dashboard_parts(body)
+        return [name async for name, _ in parts]
+    try:
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(collect())
+        assert error.value.status_code == 503
+    finally:
+        for record in records:
+            monitor.end(record, 200)
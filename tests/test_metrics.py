@@ -0,0 +1,30 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "AUTH_BYPASS_EMAIL", "")
+    monkeypatch.setattr(app, "ADMIN_EMAILS", {"admin@example.com"})
+    return TestClient(app.app)
+
+
+def test_metrics_are_not_public_without_a_token(client, monkeypatch):
+    monkeypatch.delenv("METRICS_TOKEN", raising=False)
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"authorization": "Bearer "}).status_code == 401
+
+
+def test_metrics_token(client, monkeypatch):
+    monkeypatch.setenv("METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics", headers={"authorization": "Bearer s3cret"}).status_code == 200
+    assert client.get("/metrics", headers={"authorization": "Bearer wrong"}).status_code == 401
+
+
+@pytest.mark.parametrize("email, status", [("admin@example.com", 200), ("user@example.com", 403)])
+def test_metrics_for_signed_in_users(client, monkeypatch, email, status):
+    monkeypatch.delenv("METRICS_TOKEN", raising=False)
+    monkeypatch.setattr(app, "AUTH_BYPASS_EMAIL", email)
+    assert client.get("/metrics").status_code == status
@@ -0,0 +1,64 @@
+import grpc
+import pytest
+
+import app
+
+
+class Unavailable(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(app.time, "sleep", sleeps.append)
+    limiter = app.AdsRateLimiter(rate=1000, customer_rate=1000, max_retries=3, retry_budget=10, max_retry_delay=30)
+    limiter.sleeps = sleeps
+    return limiter
+
+
+def _failing(times: int):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= times:
+            raise Unavailable()
+        return "ok"
+    return fn, calls
+
+
+def test_transient_errors_are_retried(limiter):
+    fn, calls = _failing(2)
+    assert limiter.call("1", fn) == "ok"
+    assert len(calls) == 3 and len(limiter.sleeps) == 2
+    assert all(0 <= s <= 30 for s in limiter.sleeps)
+
+
+def test_server_delay_within_cap_is_honoured(limiter, monkeypatch):
+    monkeypatch.setattr(limiter, "_retry_decision", lambda ex, idempotent: (True, True, 20.0))
+    fn, calls = _failing(1)
+    assert limiter.call("1", fn) == "ok"
+    assert limiter.sleeps[0] >= 20.0
+
+
+def test_server_delay_above_cap_fails_fast(limiter, monkeypatch):
+    # A daily-quota error suggests hours; the call must not block the thread that long
+    monkeypatch.setattr(limiter, "_retry_decision", lambda ex, idempotent: (True, True, 3600.0))
+    fn, calls = _failing(1)
+    with pytest.raises(Unavailable):
+        limiter.call("1", fn)
+    assert len(calls) == 1 and limiter.sleeps == []
+
+
+def test_non_idempotent_calls_retry_only_unapplied_errors(limiter):
+    class Deadline(grpc.RpcError):
+        def code(self):
+            return grpc.StatusCode.DEADLINE_EXCEEDED
+
+    def mutate():
+        raise Deadline()
+    with pytest.raises(Deadline):
+        limiter.call("1", mutate, idempotent=False)
+    assert limiter.sleeps == []
@@ -0,0 +1,54 @@
+import gzip
+
+import pytest
+
+import app
+from loadtest import fake_ads
+
+QUERY = """
+    SELECT segments.date, asset.name, campaign.id, metrics.cost_micros
+    FROM ad_group_ad_asset_view
+    WHERE segments.date BETWEEN '2024-01-01' AND '2024-01-02'
+"""
+FIELDS = ("segments.date", "asset.name", "campaign.id", "metrics.cost_micros")
+
+
+def _values(rows):
+    return [tuple(app._field_value(r, f) for f in FIELDS) for r in rows]
+
+
+@pytest.fixture
+def recorder(tmp_path, monkeypatch):
+    monkeypatch.setattr(fake_ads, "LATENCY_MS", 0)
+    return app.ApiRecorder(str(tmp_path))
+
+
+def test_replay_serves_recorded_searches(recorder, tmp_path):
+    client = app.RecordingAdsClient(fake_ads.make_client(), recorder)
+    account = fake_ads.ACCOUNT_IDS[0]
+    recorded = list(client.get_service("GoogleAdsService").search(customer_id=account, query=QUERY))
+
+    replay = app.ApiReplay(str(tmp_path))
+    # Whitespace in the query does not matter
+    replayed = app.ReplayAdsClient(replay).get_service("GoogleAdsService").search(account, " ".join(QUERY.split()))
+    assert _values(replayed) == _values(recorded) and recorded
+    with pytest.raises(LookupError):
+        replay.search("999", QUERY)
+    with pytest.raises(RuntimeError):
+        app.ReplayAdsClient(replay).get_service("GoogleAdsService").mutate(customer_id=account)
+
+
+def test_repeated_adjust_requests_are_served_in_turn_without_secrets(recorder, tmp_path, monkeypatch):
+    monkeypatch.setenv("ADJUST_API_TOKEN", "s3cret-token")
+    url = "https://automate.adjust.com/reports-service/pivot_report?app_token__in=app"
+    for body in (b'{"rows": [1]}', b'{"rows": [2], "token": "s3cret-token"}', b"\xff\xfe"):
+        recorder.record_adjust(url, "GET", None, {"status": 200, "content_type": "application/json", "body": body}, "s3cret-token")
+
+    with gzip.open(tmp_path / "adjust.jsonl.gz", "rt", encoding="utf-8") as f:
+        assert "s3cret-token" not in f.read()
+
+    replay = app.ApiReplay(str(tmp_path))
+    bodies = [replay.adjust_response(url, "GET", None)["body"] for _ in range(4)]
+    assert bodies == [b'{"rows": [1]}', b'{"rows": [2], "token": "***"}', b"\xff\xfe", b'{"rows": [1]}']
+    with pytest.raises(RuntimeError):
+        replay.adjust_response(url, "POST", {"x": 1})
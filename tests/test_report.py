@@ -0,0 +1,87 @@
+import random
+
+import grpc
+import pytest
+from fastapi import HTTPException
+
+import app
+
+
+def _rows():
+    rng = random.Random(28)
+    names = ["alpha", "Beta", "beta", "gamma", "", None]
+    return [{"asset_name": rng.choice(names), "cost": rng.choice([0, 1.5, 2, 2, None, 10]),
+             "impressions": rng.randrange(5), "installs": rng.randrange(3), "n": i} for i in range(60)]
+
+
+def _full_sort(rows, sort_by, sort_dir):
+    if sort_by in app.REPORT_TEXT_COLUMNS:
+        key = lambda r: (r.get(sort_by) or '').lower()
+    else:
+        key = lambda r: r.get(sort_by) or 0
+    return sorted(rows, key=key, reverse=sort_dir != "asc")
+
+
+@pytest.mark.parametrize("sort_by", ["asset_name", "cost", "impressions"])
+@pytest.mark.parametrize("sort_dir", ["asc", "desc"])
+def test_page_matches_a_full_sort(sort_by, sort_dir):
+    rows = _rows()
+    ordered = _full_sort(rows, sort_by, sort_dir)
+    for offset in (0, 1, 7, 59, 60, 80):
+        for limit in (None, 0, 1, 10, 53, 100):
+            page = app._select_report_page(rows, sort_by, sort_dir, offset, limit)
+            end = None if limit is None else offset + limit
+            # Ties keep their input order, as in a stable sort
+            assert [r["n"] for r in page] == [r["n"] for r in ordered[offset:end]], (offset, limit)
+
+
+def test_negative_offset_starts_at_the_top():
+    rows = _rows()
+    assert app._select_report_page(rows, "cost", "desc", -5, 3) == _full_sort(rows, "cost", "desc")[:3]
+
+
+def test_unknown_sort_column():
+    with pytest.raises(HTTPException) as e:
+        app._select_report_page(_rows(), "campaign_id; DROP", "asc", 0, 10)
+    assert e.value.status_code == 400
+
+
+def test_report_shards():
+    assert app._report_shards("2024-01-01", "2024-01-10", 4) == [
+        ("2024-01-01", "2024-01-04"), ("2024-01-05", "2024-01-08"), ("2024-01-09", "2024-01-10")]
+    assert app._report_shards("2024-01-01", "2024-01-10", 0) == [("2024-01-01", "2024-01-10")]
+    assert app._report_shards("2024-01-01", "2024-01-10", 10) == [("2024-01-01", "2024-01-10")]
+
+
+class Unavailable(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self):
+        return "backend down"
+
+
+def test_sharded_report_sums_shards_and_labels_failed_ones(monkeypatch):
+    monkeypatch.setattr(app, "get_client", lambda: None)
+    monkeypatch.setattr(app, "fetch_accounts", lambda: [{"id": "1", "name": "Acc 1"}, {"id": "2", "name": "Acc 2"}])
+    monkeypatch.setattr(app, "_jobs", app.TTLCache(ttl=60))
+    fetched = []
+
+    def fetch(client, request, account_id, account_name, start_date, end_date, adgroup_filter):
+        fetched.append((account_id, start_date, end_date))
+        if account_id == "2" and start_date == "2024-01-05":
+            raise Unavailable()
+        return [{"asset_name": "Video", "account": account_name, "campaign": "UAC", "cost": 1.5, "impressions": 10, "installs": 1}]
+    monkeypatch.setattr(app, "_fetch_report_rows", fetch)
+
+    request = app.ReportRequest(account_ids=["1", "2"], campaign_ids=[], adgroup_type="main",
+                                start_date="2024-01-01", end_date="2024-01-10", shard_days=4)
+    job = {"job_id": "j", "progress": {}}
+    rows, totals, errors = app._aggregate_report(request, app.JobProgress(job))
+
+    assert len(fetched) == 6
+    assert rows == [{"asset_name": "Video", "account": "", "campaign": "UAC", "cost": 7.5, "impressions": 50, "installs": 5}]
+    assert totals == {"cost": 7.5, "impressions": 50, "installs": 5}
+    assert [e["account_id"] for e in errors] == ["2"]
+    assert errors[0]["error"].startswith("2024-01-05..2024-01-08: ")
+    assert job["progress"] == {"accounts_total": 2, "accounts_done": 2, "rows_fetched": 5}
@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app
+
+
+def test_columnar_chart_of_stacked_100():
+    # A day without spend has a zero daily total, which used to turn the shares into object arrays
+    dates = ["2024-01-01", "2024-01-02", "2024-01-03"]
+    rows = [
+        {"day": "2024-01-01", "name": "A", "cost": 3.333},
+        {"day": "2024-01-01", "name": "B", "cost": 1.0},
+        {"day": "2024-01-02", "name": "A", "cost": 2.0},
+    ]
+    chart = app._columnar_chart(app._build_stacked_100(dates, rows, "name", "day", "cost", top_n=5))
+
+    assert chart["names"] == ["A", "B"]
+    assert [list(v) for v in chart["dataPct"]] == [[76.92, 100.0, 0.0], [23.08, 0.0, 0.0]]
+    assert [list(v) for v in chart["dataCost"]] == [[3.33, 2.0, 0.0], [1.0, 0.0, 0.0]]
+    assert all(v.dtype == np.float64 for v in chart["dataPct"] + chart["dataCost"])
+    json.loads(app.dumps_json(chart))
+
+
+def test_columnar_chart_without_series():
+    chart = app._columnar_chart(app._build_stacked_100(["2024-01-01"], [], "name", "day", "cost", top_n=5))
+    assert chart["names"] == [] and chart["dataPct"] == []
+
+
+def test_choose_encoding():
+    available = ("br", "gzip")
+    assert app.choose_encoding("gzip, deflate, br", available) == "br"
+    assert app.choose_encoding("br;q=0, gzip", available) == "gzip"
+    assert app.choose_encoding("br;q=0.5, gzip;q=0.8", available) == "gzip"
+    assert app.choose_encoding("gzip;q=0", available) is None
+    assert app.choose_encoding("*;q=0.1, br;q=0", available) == "gzip"
+    assert app.choose_encoding("identity", available) is None
+    assert app.choose_encoding("brotli-ish, xgzip", available) is None
+    assert app.choose_encoding("", available) is None
+
+
+def _compressed_client():
+    inner = FastAPI()
+
+    @inner.get("/big")
+    def big():
+        return {"data": "x" * 5000}
+
+    inner.add_middleware(app.CompressionMiddleware)
+    return TestClient(inner)
+
+
+def test_compression_middleware_honours_q_zero():
+    client = _compressed_client()
+    assert client.get("/big", headers={"accept-encoding": "br;q=0, gzip"}).headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in client.get("/big", headers={"accept-encoding": "gzip;q=0"}).headers
@@ -0,0 +1,40 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    (dist / "app.abc123.js").write_text("plain")
+    (dist / "app.abc123.js.gz").write_bytes(gzip.compress(b"from gz"))
+    (dist / "app.abc123.js.br").write_bytes(brotli.compress(b"from br"))
+    (tmp_path / "page.html").write_text("<html></html>")
+    monkeypatch.setattr(app, "STATIC_DIST", str(dist))
+    inner = FastAPI()
+    inner.mount("/static", app.AssetStaticFiles(directory=str(tmp_path)))
+    return TestClient(inner)
+
+
+def test_precompressed_variant_follows_accept_encoding(client):
+    cases = (("gzip, br", "br", "from br"), ("br;q=0, gzip", "gzip", "from gz"),
+             ("gzip;q=0, br;q=0", None, "plain"), ("identity", None, "plain"))
+    for accept, encoding, body in cases:
+        response = client.get("/static/dist/app.abc123.js", headers={"accept-encoding": accept})
+        assert response.headers.get("content-encoding") == encoding, accept
+        assert response.text == body
+        assert response.headers["content-type"].startswith("text/javascript")
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["cache-control"] == app.IMMUTABLE_CACHE_CONTROL
+
+
+def test_unhashed_files_are_revalidated(client):
+    response = client.get("/static/page.html")
+    assert response.headers["cache-control"] == "no-cache"
+    assert client.get("/static/page.html", headers={"if-none-match": response.headers["etag"]}).status_code == 304
@@ -0,0 +1,39 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+import app
+
+
+def _client():
+    inner = FastAPI()
+
+    @inner.post("/api/report")
+    async def report():
+        with app.timed("gaql"):
+            pass
+        return {}
+
+    @inner.post("/api/dashboard/stream")
+    async def stream():
+        async def events():
+            with app.timed("pandas"):
+                yield b"{}\n"
+        return StreamingResponse(events(), media_type="application/x-ndjson")
+
+    return TestClient(app.ServerTimingMiddleware(inner))
+
+
+def test_server_timing_header_lists_phases():
+    response = _client().post("/api/report")
+    assert "gaql;dur=" in response.headers["Server-Timing"]
+
+
+def test_streamed_responses_only_get_the_slow_log(monkeypatch, capsys):
+    monkeypatch.setattr(app, "SLOW_REQUEST_MS", 0)
+    response = _client().post("/api/dashboard/stream")
+    assert response.status_code == 200 and "Server-Timing" not in response.headers
+    logged = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert logged["path"] == "/api/dashboard/stream" and "pandas" in logged["phases_ms"]
@@ -0,0 +1,224 @@
+import asyncio
+import re
+import time
+from types import SimpleNamespace
+
+import grpc
+import pytest
+from fastapi import HTTPException
+
+import app
+from loadtest import fake_ads
+
+
+class Rejected(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.INVALID_ARGUMENT
+
+    def details(self):
+        return "rejected"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(fake_ads, "LATENCY_MS", 0)
+    monkeypatch.setattr(app, "_video_asset_index", app.MeteredCache(app.TTLCache(ttl=60), "video_assets"))
+    return fake_ads.make_client()
+
+
+def _plan(campaigns: int) -> dict:
+    return app.compile_upload_plan([f"123_{i}" for i in range(campaigns)], "241019", ["dQw4w9WgXcQ"], ["Play"], ["Now"])[0]
+
+
+def test_compile_upload_plan_groups_by_account():
+    plans = app.compile_upload_plan(["1_10", "2_20", "1_11", "1_10", "bad"], "ag", ["v1", "v2", "v1"], ["h"], ["d"])
+    assert [(p["customer_id"], p["campaign_ids"]) for p in plans] == [("1", ["10", "11"]), ("2", ["20"])]
+    assert plans[0]["video_ids"] == ["v1", "v2"]
+
+
+def test_every_campaign_gets_an_ad_group(client, monkeypatch):
+    monkeypatch.setattr(app, "MAX_MUTATE_OPERATIONS", 2)
+    results = app.execute_upload_plan(client, _plan(3))
+    assert [r["success"] for r in results] == [True, True, True]
+    assert all(r["adgroup_resource"].startswith("customers/123/adGroups/") for r in results)
+
+
+def test_failed_chunk_fails_only_its_own_and_later_campaigns(client, monkeypatch):
+    monkeypatch.setattr(app, "MAX_MUTATE_OPERATIONS", 2)
+    service = fake_ads.FakeGoogleAdsService
+    calls = []
+    original = service.mutate
+
+    def mutate(self, request=None, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise Rejected()
+        return original(self, request=request, **kwargs)
+    monkeypatch.setattr(service, "mutate", mutate)
+
+    results = app.execute_upload_plan(client, _plan(3))
+    assert [r["success"] for r in results] == [True, False, False]
+    assert results[0]["adgroup_resource"]
+    assert all("rejected" in r["error"] for r in results[1:])
+    # Nothing is attempted after the failed chunk
+    assert len(calls) == 2
+
+
+def test_no_ad_groups_without_video_assets(client, monkeypatch):
+    mutates = []
+    monkeypatch.setattr(fake_ads.FakeGoogleAdsService, "mutate", lambda self, request=None, **kwargs: mutates.append(request))
+    # The asset create returns no result for the video
+    response = client.get_type("MutateAssetsResponse")
+    monkeypatch.setattr(fake_ads.FakeAssetService, "mutate_assets", lambda self, request=None, **kwargs: response)
+    results = app.execute_upload_plan(client, _plan(2))
+    assert [r["success"] for r in results] == [False, False]
+    assert results[0]["error"] == "No video assets could be resolved or created: Video dQw4w9WgXcQ: not created"
+    assert "Total video assets: 0" in results[0]["logs"]
+    assert mutates == []
+
+
+def _batch_record(owner="a@example.com", polled_at=None):
+    plan = _plan(2)
+    record = {"upload_id": "u1", "owner": owner, "status": "running", "plans": [plan], "results_by_plan": [None],
+              "polled_at": time.time() if polled_at is None else polled_at}
+    app._batch_uploads.set("u1", record)
+    return plan, record
+
+
+def test_batch_poll_retries_transient_errors(client, monkeypatch):
+    monkeypatch.setattr(app, "BATCH_POLL_INTERVAL", 0)
+    plan, record = _batch_record()
+    polls = []
+
+    def done(client, customer_id, batch_job):
+        polls.append(1)
+        if len(polls) < 3:
+            raise Rejected()
+        return True
+    monkeypatch.setattr(app, "_batch_job_done", done)
+    monkeypatch.setattr(app, "collect_upload_batch_results", lambda client, sub: [{"success": True}])
+
+    asyncio.run(app._poll_upload_batch(client, record, [{"plan": plan, "batch_job": "customers/123/batchJobs/1"}]))
+    assert len(polls) == 3
+    assert record["status"] == "done"
+    assert record["results_by_plan"] == [[{"success": True}]]
+
+
+def test_batch_poll_fails_at_the_deadline(client, monkeypatch):
+    monkeypatch.setattr(app, "BATCH_POLL_INTERVAL", 0)
+    monkeypatch.setattr(app, "BATCH_MAX_WAIT", 0.05)
+    plan, record = _batch_record()
+
+    def done(client, customer_id, batch_job):
+        raise Rejected()
+    monkeypatch.setattr(app, "_batch_job_done", done)
+
+    asyncio.run(app._poll_upload_batch(client, record, [{"plan": plan, "batch_job": "customers/123/batchJobs/1"}]))
+    results = record["results_by_plan"][0]
+    assert [r["success"] for r in results] == [False, False]
+    assert "did not finish" in results[0]["error"]
+
+
+def test_batch_upload_is_only_visible_to_its_owner(client):
+    _batch_record(owner="a@example.com")
+    status = asyncio.run(app.get_upload_batch("u1", {"email": "a@example.com"}))
+    assert status["status"] == "running"
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(app.get_upload_batch("u1", {"email": "b@example.com"}))
+    assert e.value.status_code == 404
+
+
+def test_batch_upload_without_a_poller_is_failed_on_read(client):
+    _batch_record(polled_at=time.time() - app.BATCH_POLLER_TIMEOUT - 1)
+    status = asyncio.run(app.get_upload_batch("u1", {"email": "a@example.com"}))
+    assert status["status"] == "done"
+    assert [r["success"] for r in status["results"]] == [False, False]
+    assert "Lost track of the batch job" in status["results"][0]["error"]
+    assert app._batch_uploads.get("u1")["status"] == "done"
+
+
+def test_batch_results_go_through_the_limiter(monkeypatch):
+    calls = []
+    monkeypatch.setattr(app.ads_limiter, "call", lambda customer_id, fn, **kwargs: calls.append(("limiter", customer_id)) or fn())
+    original = app._timed_ads_call
+    monkeypatch.setattr(app, "_timed_ads_call", lambda customer_id, method, fn: calls.append((method, customer_id)) or original(customer_id, method, fn))
+    service = SimpleNamespace(list_batch_job_results=lambda resource_name: iter([resource_name]))
+    client = SimpleNamespace(get_service=lambda name: service)
+    assert app.ads_batch_job_results(client, "123", "customers/123/batchJobs/1") == ["customers/123/batchJobs/1"]
+    assert calls == [("limiter", "123"), ("list_batch_job_results", "123")]
+
+
+def test_account_plans_run_concurrently_within_the_limit_and_keep_plan_order():
+    running, peak = [], []
+
+    def run(client, plan):
+        running.append(plan["customer_id"])
+        peak.append(len(running))
+        time.sleep(0.05 if plan["customer_id"] == "1" else 0.01)
+        running.remove(plan["customer_id"])
+        if plan["customer_id"] == "3":
+            raise RuntimeError("account 3 failed")
+        return plan["customer_id"]
+
+    plans = [{"customer_id": str(i)} for i in range(1, 6)]
+    finished = []
+    outputs = asyncio.run(app._run_per_account(run, None, plans, concurrency=2,
+                                               on_done=lambda plan, out: finished.append(plan["customer_id"])))
+    assert outputs[:2] == ["1", "2"] and isinstance(outputs[2], RuntimeError) and outputs[3:] == ["4", "5"]
+    assert max(peak) == 2
+    # Account 1 is slow, so others finish first
+    assert finished[-1] == "1" and sorted(finished) == ["1", "2", "3", "4", "5"]
+
+
+def test_failed_account_plan_fails_only_its_campaigns(monkeypatch):
+    def run(client, plan):
+        if plan["customer_id"] == "2":
+            raise RuntimeError("quota")
+        return [{"account_id": plan["customer_id"], "campaign_id": c, "success": True} for c in plan["campaign_ids"]]
+    monkeypatch.setattr(app, "execute_upload_plan", run)
+    plans = [{"customer_id": "1", "campaign_ids": ["10", "11"]}, {"customer_id": "2", "campaign_ids": ["20"]}]
+    results = asyncio.run(app.run_upload_plans(None, plans))
+    assert [(r["campaign_id"], r["success"]) for r in results] == [("10", True), ("11", True), ("20", False)]
+    assert results[2]["error"] == "quota"
+
+
+def test_existing_video_assets_are_looked_up_once_and_cached(client, monkeypatch):
+    existing = {"aaaaaaaaaaa": "customers/123/assets/1"}
+    lookups, created = [], []
+
+    def search(client, customer_id, query):
+        ids = re.findall(r"'(\w{11})'", query)
+        lookups.append(ids)
+        return [SimpleNamespace(asset=SimpleNamespace(resource_name=existing[v], youtube_video_asset=SimpleNamespace(youtube_video_id=v)))
+                for v in ids if v in existing]
+    monkeypatch.setattr(app, "ads_search", search)
+    original = fake_ads.FakeAssetService.mutate_assets
+
+    def mutate_assets(self, request=None, **kwargs):
+        created.append([op.create.youtube_video_asset.youtube_video_id for op in request.operations])
+        return original(self, request=request, **kwargs)
+    monkeypatch.setattr(fake_ads.FakeAssetService, "mutate_assets", mutate_assets)
+
+    logs = []
+    first = app._resolve_video_assets(client, "123", ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"], logs)
+    assert lookups == [["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]]
+    assert created == [["bbbbbbbbbbb", "ccccccccccc"]]
+    assert first["aaaaaaaaaaa"] == "customers/123/assets/1" and len(first) == 3
+    assert "Found existing asset for aaaaaaaaaaa" in logs
+
+    logs = []
+    second = app._resolve_video_assets(client, "123", ["ccccccccccc", "aaaaaaaaaaa", "ddddddddddd"], logs)
+    # Only the new video is looked up and created; the others come from the per-account index
+    assert lookups[1:] == [["ddddddddddd"]] and created[1:] == [["ddddddddddd"]]
+    assert second["ccccccccccc"] == first["ccccccccccc"]
+    assert "Found cached asset for ccccccccccc" in logs
+
+
+def test_failed_asset_lookup_falls_back_to_creating(client, monkeypatch):
+    def search(client, customer_id, query):
+        raise Rejected()
+    monkeypatch.setattr(app, "ads_search", search)
+    logs = []
+    assets = app._resolve_video_assets(client, "123", ["aaaaaaaaaaa"], logs)
+    assert list(assets) == ["aaaaaaaaaaa"]
+    assert logs[0].startswith("Could not look up existing assets: ") and "Created video asset: aaaaaaaaaaa" in logs
@@ -0,0 +1,97 @@
+import csv
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import google_ads_youtube_assets as yt
+
+
+class FakeAdsClient:
+    """Answers every YouTube asset query with one row per asset, recording the queried periods"""
+
+    def __init__(self, fail_windows=()):
+        self.queries = []
+        self.fail_windows = set(fail_windows)
+
+    def get_service(self, name):
+        return self
+
+    def search(self, customer_id, query):
+        period = tuple(query.split("BETWEEN '")[1].split("'")[::2][:2])
+        self.queries.append((customer_id, period))
+        if (customer_id, period) in self.fail_windows:
+            raise RuntimeError("backend unavailable")
+        return [SimpleNamespace(
+            asset=SimpleNamespace(id=7, name="", youtube_video_asset=SimpleNamespace(youtube_video_id="dQw4w9WgXcQ")),
+            campaign=SimpleNamespace(name="Campaign"),
+            ad_group=SimpleNamespace(name="Ad group"),
+            metrics=SimpleNamespace(cost_micros=1_500_000, impressions=100, conversions=3.0),
+        )]
+
+
+CUSTOMERS = [{"id": "111", "name": "A"}, {"id": "222", "name": "B"}]
+
+
+def _args(tmp_path, *extra):
+    return yt.parse_args(["--bulk", "--start-date", "2024-01-01", "--end-date", "2024-01-10",
+                          "--window-days", "4", "--output-dir", str(tmp_path), *extra])
+
+
+def test_date_windows_cover_the_period_without_gaps():
+    assert yt.date_windows("2024-01-01", "2024-01-10", 4) == [
+        ("2024-01-01", "2024-01-04"), ("2024-01-05", "2024-01-08"), ("2024-01-09", "2024-01-10")]
+    assert yt.date_windows("2024-02-28", "2024-03-01", 30) == [("2024-02-28", "2024-03-01")]
+    assert yt.date_windows("2024-01-01", "2024-01-01", 1) == [("2024-01-01", "2024-01-01")]
+
+
+def test_bulk_export_writes_partitions_and_resumes_only_failed_ones(tmp_path):
+    client = FakeAdsClient(fail_windows={("222", ("2024-01-05", "2024-01-08"))})
+    assert yt.bulk_export(client, CUSTOMERS, _args(tmp_path)) == 1
+    assert len(client.queries) == 6
+
+    with open(tmp_path / "account=111" / "2024-01-09_2024-01-10.csv", encoding="utf-8-sig") as f:
+        rows = list(csv.DictReader(f))
+    assert rows == [{
+        "account_id": "111", "account_name": "A", "window_start": "2024-01-09", "window_end": "2024-01-10",
+        "asset_id": "7", "asset_name": "dQw4w9WgXcQ", "youtube_video_id": "dQw4w9WgXcQ",
+        "campaign": "Campaign", "ad_group": "Ad group", "cost": "1.5", "impressions": "100", "installs": "3.0",
+    }]
+    manifest = json.loads((tmp_path / yt.MANIFEST_NAME).read_text())
+    assert len(manifest["partitions"]) == 5
+    assert "222/2024-01-05_2024-01-08" not in manifest["partitions"]
+
+    # The rerun fetches only the failed partition, and one whose file went missing
+    os.remove(tmp_path / "account=111" / "2024-01-01_2024-01-04.csv")
+    client = FakeAdsClient()
+    assert yt.bulk_export(client, CUSTOMERS, _args(tmp_path)) == 0
+    assert sorted(client.queries) == [("111", ("2024-01-01", "2024-01-04")), ("222", ("2024-01-05", "2024-01-08"))]
+    assert len(json.loads((tmp_path / yt.MANIFEST_NAME).read_text())["partitions"]) == 6
+
+
+def test_manifest_with_different_settings_is_refused_unless_restarting(tmp_path):
+    yt.bulk_export(FakeAdsClient(), CUSTOMERS, _args(tmp_path))
+
+    client = FakeAdsClient()
+    with pytest.raises(SystemExit, match="manifest.json was written with different settings"):
+        yt.bulk_export(client, CUSTOMERS, _args(tmp_path, "--campaign-filter", "Brand"))
+    assert client.queries == []
+
+    assert yt.bulk_export(client, CUSTOMERS, _args(tmp_path, "--campaign-filter", "Brand", "--restart")) == 0
+    assert len(client.queries) == 6
+    assert json.loads((tmp_path / yt.MANIFEST_NAME).read_text())["params"]["campaign_filter"] == "Brand"
+
+
+def test_interrupted_partition_write_keeps_the_previous_file(tmp_path):
+    path = str(tmp_path / "account=111" / "2024-01-01_2024-01-04.csv")
+    row = dict.fromkeys(yt.BULK_FIELDS, "x")
+    yt.write_partition(path, [row], "csv")
+    with open(path, encoding="utf-8-sig") as f:
+        before = f.read()
+
+    # An unexpected column makes the CSV writer fail after the header is written
+    with pytest.raises(ValueError):
+        yt.write_partition(path, [row, {**row, "extra": 1}], "csv")
+    with open(path, encoding="utf-8-sig") as f:
+        assert f.read() == before